@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from bank_normalizer.frame import TransactionFrame
+from bank_normalizer.models import Transaction
+
+BASE = datetime(2020, 1, 1)
+
+
+def _columns(count: int) -> Dict[str, List[object]]:
+    return {
+        "id": [f"{index:016x}" for index in range(count)],
+        "date": [BASE + timedelta(days=index % 1500) for index in range(count)],
+        "description": [f"EFTPOS WOOLWORTHS {index % 400:04d} SYDNEY" for index in range(count)],
+        "amount": [-(index % 9000) / 100 for index in range(count)],
+        "bank": ["ANZ"] * count,
+        "merchant": ["WOOLWORTHS"] * count,
+        "debit": [(index % 9000) / 100 for index in range(count)],
+        "balance": [1000.0 + index for index in range(count)],
+        "page": [index // 40 + 1 for index in range(count)],
+    }
+
+
+def _generic(columns: Dict[str, List[object]]) -> object:
+    names = list(columns)
+    return [Transaction(**dict(zip(names, values))) for values in zip(*columns.values())]
+
+
+def _trusted(columns: Dict[str, List[object]]) -> object:
+    names = list(columns)
+    return [Transaction.from_trusted(**dict(zip(names, values))) for values in zip(*columns.values())]
+
+
+def _bulk(columns: Dict[str, List[object]]) -> object:
+    return Transaction.build_many(columns)
+
+
+def _frame(columns: Dict[str, List[object]]) -> object:
+    frame = TransactionFrame()
+    for values in zip(columns["date"], columns["description"], columns["amount"], columns["debit"], columns["balance"], columns["page"]):
+        day, description, amount, debit, balance, page = values
+        frame.append(
+            day.toordinal(),
+            description,
+            round(amount * 100),
+            debit=round(debit * 100),
+            balance=round(balance * 100),
+            merchant="WOOLWORTHS",
+            bank="ANZ",
+            page=page,
+        )
+    return frame
+
+
+def _measure(name: str, build: Callable[[Dict[str, List[object]]], object], columns: Dict[str, List[object]]) -> None:
+    count = len(columns["id"])
+    start = time.perf_counter()
+    build(columns)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = build(columns)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:<10} {elapsed * 1e6 / count:8.2f} us/row {current / count:8.1f} B/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark transaction construction time and memory")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    columns = _columns(args.rows)
+    print(f"{args.rows} rows (memory excludes the shared input columns)")
+    _measure("generic", _generic, columns)
+    _measure("trusted", _trusted, columns)
+    _measure("bulk", _bulk, columns)
+    _measure("frame", _frame, columns)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Bank statement normalization toolkit."""
 
 from .api import normalize_pdfs
+from .engine import Normalizer
 
-__all__ = ["normalize_pdfs"]
+__all__ = ["Normalizer", "normalize_pdfs"]
@@ -8,10 +8,13 @@ from typing import Iterable
 from .api import normalize_pdfs
 from .export import export_csv, export_xlsx
 from .export.lender_profiles import load_lender_profiles
+from .extract import StatementCache
+from .extract.cache import DEFAULT_CACHE_DIR
 
 
 def handle_extract(args: argparse.Namespace) -> None:
-    bundles = normalize_pdfs(args.paths)
+    cache = None if args.no_cache else StatementCache(args.cache_dir or DEFAULT_CACHE_DIR)
+    bundles = normalize_pdfs(args.paths, cache=cache)
     out_path = Path(args.out)
     out_path.mkdir(parents=True, exist_ok=True)
     for idx, bundle in enumerate(bundles):
@@ -21,7 +24,7 @@ def handle_extract(args: argparse.Namespace) -> None:
         print(f"Wrote {csv_path}")
         if args.xlsx:
             xlsx_path = out_path / f"{stem}.xlsx"
-            export_xlsx(bundle.transactions, xlsx_path)
+            export_xlsx(bundle.transactions, xlsx_path, summary=bundle.summary)
             print(f"Wrote {xlsx_path}")
         if args.json:
             json_path = out_path / f"{stem}.json"
@@ -70,6 +73,8 @@ def build_parser() -> argparse.ArgumentParser:
     extract.add_argument("--profile", default=None)
     extract.add_argument("--json", action="store_true")
     extract.add_argument("--xlsx", action="store_true")
+    extract.add_argument("--cache-dir", default=None, help="Extraction cache directory (defaults to BANKNORM_CACHE_DIR)")
+    extract.add_argument("--no-cache", action="store_true", help="Always re-extract statements")
     extract.set_defaults(func=handle_extract)
 
     banks = subparsers.add_parser("banks", help="Bank profile utilities")
@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from . import _load_yaml
+
+DATA = _load_yaml("merchants.yaml")
+MERCHANTS = DATA.get("merchants", [])
@@ -9,11 +9,14 @@ import streamlit as st
 
 from ..api import normalize_pdfs
 from ..export import export_csv, export_xlsx
+from ..extract import StatementCache
 from ..service.licensing import verify_license
 
 st.set_page_config(page_title="Bank Normalizer", layout="wide")
 st.title("BankBolt Bank Normalizer")
 
+statement_cache = StatementCache()
+
 with st.sidebar:
     st.header("License")
     license_token = st.text_input("License Token", value=os.environ.get("LICENSE_TOKEN", ""))
@@ -39,7 +42,7 @@ if uploaded_files:
         st.warning("Provide a valid license or enable LICENSE_BYPASS=1")
     else:
         paths = _save_uploads(uploaded_files)
-        bundles = normalize_pdfs(paths)
+        bundles = normalize_pdfs(paths, cache=statement_cache)
         for bundle in bundles:
             st.subheader(f"{bundle.meta.bank} ({bundle.meta.period_start} → {bundle.meta.period_end})")
             df = pd.DataFrame([
@@ -0,0 +1,334 @@
+"""Long-lived normalization engine with hot-reloadable configuration."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import yaml
+
+from .export.summary import build_summary, summarize_series
+from .extract import iter_pdf_pages, iter_statement_rows, parse_statement_rows, read_pdf
+from .extract.account import infer_account
+from .extract.cache import (
+    CachedRecord,
+    CachedStatement,
+    CacheWriter,
+    StatementCache,
+    file_digest,
+)
+from .extract.dates import DateParser, infer_period
+from .extract.parse_table import ParsedRow
+from .extract.pdf_reader import PDFPage, PDFStatement
+from .frame import TransactionFrame
+from .models import ResultBundle, StatementMeta
+from .normalize import Categorizer, normalize_frame
+from .normalize.banks import BankDetector, BankProfile
+from .normalize.dedup import DEDUP_DB, DedupIndex
+from .normalize.merchants import MerchantIndex
+from .normalize.recurring import detect_recurring
+from .normalize.recurring_state import RECURRING_DB, RecurringStore
+
+CONFIG_DIR = Path(__file__).resolve().parent / "config"
+CONFIG_FILES = ("banks.yaml", "categories.yaml", "merchants.yaml")
+# Seconds between checks of the config files for changes.
+RELOAD_INTERVAL = 2.0
+
+_Signature = Tuple[Tuple[int, int], ...]
+
+
+def _load_yaml(path: Path) -> dict:
+    with path.open("r", encoding="utf-8") as fh:
+        return yaml.safe_load(fh) or {}
+
+
+class _PageTally:
+    """Count pages as they stream past without retaining them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def track(self, pages: Iterable[PDFPage]) -> Iterator[PDFPage]:
+        for page in pages:
+            self.count += 1
+            yield page
+
+    def rows(self, records: Iterable[CachedRecord]) -> Iterator[ParsedRow]:
+        for record in records:
+            if isinstance(record, PDFPage):
+                self.count += 1
+            else:
+                yield record
+
+
+@dataclass
+class _OpenStatement:
+    profile: Optional[BankProfile]
+    rows: Iterator[ParsedRow]
+    tally: _PageTally
+    lead_text: str = ""
+
+
+def _stream_statement(
+    path: Path,
+    detector: BankDetector,
+    workers: Optional[int],
+    writer: Optional[CacheWriter],
+    digest: Optional[str] = None,
+) -> _OpenStatement:
+    """Detect the bank from the first page and return a lazy row iterator.
+
+    Pages are read and parsed on demand as the returned rows are consumed, so
+    only one page is resident at a time.
+    """
+
+    pages = iter_pdf_pages(path, workers=workers, digest=digest)
+    if writer is not None:
+        pages = writer.track_pages(pages)
+    first = next(pages, None)
+    lead = PDFStatement(path=path, pages=[first] if first is not None else [])
+    profile = detector.select(lead)
+    tally = _PageTally()
+    remaining: Iterable[PDFPage] = pages
+    if first is not None:
+        remaining = chain([first], pages)
+    rows: Iterator[ParsedRow] = iter_statement_rows(tally.track(remaining))
+    if writer is not None:
+        rows = writer.track_rows(rows)
+    return _OpenStatement(profile, rows, tally, lead.combined_text)
+
+
+def _read_statement(
+    path: Path,
+    detector: BankDetector,
+    workers: Optional[int],
+    writer: Optional[CacheWriter],
+    digest: Optional[str] = None,
+) -> _OpenStatement:
+    statement = read_pdf(path, workers=workers, digest=digest)
+    profile = detector.select(statement)
+    tally = _PageTally()
+    tally.count = len(statement.pages)
+    rows = parse_statement_rows(statement)
+    if writer is not None:
+        for page in statement.pages:
+            writer.add_page(page)
+        for row in rows:
+            writer.add_row(row)
+        writer.commit()
+    lead_text = statement.pages[0].text if statement.pages else ""
+    return _OpenStatement(profile, iter(rows), tally, lead_text)
+
+
+def _replay_statement(path: Path, entry: CachedStatement, detector: BankDetector) -> _OpenStatement:
+    """Serve pages and rows from the extraction cache without touching the PDF."""
+
+    records = iter(entry)
+    first = next(records, None)
+    lead = PDFStatement(path=path, pages=[first] if isinstance(first, PDFPage) else [])
+    profile = detector.select(lead)
+    tally = _PageTally()
+    tally.count = len(lead.pages)
+    return _OpenStatement(profile, tally.rows(records), tally, lead.combined_text)
+
+
+def _open_statement(
+    path: Path,
+    detector: BankDetector,
+    *,
+    stream: bool,
+    workers: Optional[int],
+    cache: Optional[StatementCache],
+    digest: Optional[str] = None,
+) -> _OpenStatement:
+    writer: Optional[CacheWriter] = None
+    if cache is not None:
+        digest = digest or file_digest(path)
+        entry = cache.get(digest)
+        if entry is not None:
+            return _replay_statement(path, entry, detector)
+        writer = cache.writer(digest)
+    reader = _stream_statement if stream else _read_statement
+    return reader(path, detector, workers, writer, digest)
+
+
+@dataclass(frozen=True)
+class EngineState:
+    """Compiled configuration shared by every call until the next reload."""
+
+    detector: BankDetector
+    categorizer: Categorizer
+    merchants: MerchantIndex
+    signature: _Signature
+
+
+class Normalizer:
+    """Reusable normalizer that compiles configuration once.
+
+    Bank profiles, the detection index, categories and the merchant index are
+    built on construction and rebuilt only when a config file's mtime or size
+    changes. A rebuild produces a new :class:`EngineState` that replaces the old
+    one in a single assignment, so concurrent :meth:`normalize` calls each
+    see one consistent configuration and an instance can be shared freely
+    across threads.
+    """
+
+    def __init__(
+        self,
+        config_dir: Path | str = CONFIG_DIR,
+        *,
+        cache: Optional[StatementCache] = None,
+        dedup: Optional[DedupIndex] = None,
+        recurring: Optional[RecurringStore] = None,
+        reload_interval: float = RELOAD_INTERVAL,
+    ) -> None:
+        self.config_dir = Path(config_dir)
+        self.cache = cache
+        if dedup is None and DEDUP_DB:
+            dedup = DedupIndex(DEDUP_DB)
+        self.dedup = dedup
+        if recurring is None and RECURRING_DB:
+            recurring = RecurringStore(RECURRING_DB)
+        self.recurring = recurring
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._state = self._build()
+        self._checked_at = time.monotonic()
+
+    def _signature(self) -> _Signature:
+        signature = []
+        for name in CONFIG_FILES:
+            try:
+                stat = (self.config_dir / name).stat()
+            except FileNotFoundError:
+                signature.append((0, 0))
+            else:
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _build(self) -> EngineState:
+        signature = self._signature()
+        banks = _load_yaml(self.config_dir / "banks.yaml")
+        merchants_path = self.config_dir / "merchants.yaml"
+        merchants = _load_yaml(merchants_path) if merchants_path.exists() else {}
+        return EngineState(
+            detector=BankDetector.from_config(banks.get("banks", [])),
+            categorizer=Categorizer(self.config_dir / "categories.yaml"),
+            merchants=MerchantIndex(merchants.get("merchants", [])),
+            signature=signature,
+        )
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild the engine state if config changed; return ``True`` on reload."""
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if not force and self._signature() == self._state.signature:
+                return False
+            self._state = self._build()
+            return True
+
+    @property
+    def state(self) -> EngineState:
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+        return self._state
+
+    def normalize(
+        self,
+        paths: Iterable[Path | str],
+        *,
+        stream: bool = True,
+        workers: Optional[int] = None,
+        cache: Optional[StatementCache] = None,
+        dedup: Optional[DedupIndex] = None,
+        account: Optional[str] = None,
+        digests: Optional[Mapping[Path, str]] = None,
+    ) -> List[ResultBundle]:
+        """Normalize statements into result bundles.
+
+        When a statement cache is given here or on the engine, statements
+        already seen (by content hash) are replayed from it instead of being
+        extracted and parsed again. ``digests`` supplies SHA-256 hashes
+        already known for some paths (for example computed while an upload
+        was spooled) so those files are not read an extra time to hash them.
+
+        Transactions repeated across statements, such as overlapping periods
+        or the same statement uploaded twice, are kept only in the first
+        bundle and reported in the later bundles' warnings. Without a dedup
+        index here or on the engine, overlaps are detected within this batch.
+
+        With an ``account`` and a recurring store on the engine, each bundle's
+        transactions also update that account's persisted recurring series,
+        and the summary's ``recurring_updates`` lists the series started,
+        extended or broken by the statement.
+        """
+
+        state = self.state
+        cache = cache if cache is not None else self.cache
+        dedup = dedup or self.dedup or DedupIndex()
+        detector = state.detector
+        categorizer = state.categorizer
+        bundles: List[ResultBundle] = []
+        for source in paths:
+            path = Path(source)
+            digest = digests.get(path) if digests else None
+            if digest is None and cache is not None:
+                digest = file_digest(path)
+            opened = _open_statement(path, detector, stream=stream, workers=workers, cache=cache, digest=digest)
+            profile = opened.profile
+            bank_name = profile.name if profile else "Unknown"
+            statement_account = infer_account(opened.lead_text)
+            if profile:
+                dates = DateParser(period=infer_period(opened.lead_text))
+                frame = normalize_frame(
+                    opened.rows, profile, bank_name, dates=dates, merchants=state.merchants, account=statement_account
+                )
+            else:
+                frame = TransactionFrame()
+                deque(opened.rows, maxlen=0)  # drain so the page count covers the whole file
+            warnings = ["No transactions detected"] if not frame else []
+            period_start = date.fromordinal(min(frame.ordinals)) if frame else None
+            period_end = date.fromordinal(max(frame.ordinals)) if frame else None
+            # Without an account number, only a re-upload of the same file is
+            # known to hold the same account's transactions.
+            scope = None if statement_account else (digest or file_digest(path))
+            frame, overlaps = dedup.deduplicate(frame, path.name, scope)
+            warnings.extend(overlaps)
+            frame.set_categories(categorizer.categorize_many(frame.descriptions))
+            recurring = detect_recurring(frame)
+            summary = build_summary(frame, recurring)
+            if account is not None and self.recurring is not None:
+                update = self.recurring.update(account, frame)
+                summary["recurring_updates"] = {
+                    "new": summarize_series(update.new),
+                    "extended": summarize_series(update.extended),
+                    "broken": summarize_series(update.broken),
+                }
+            meta = StatementMeta(
+                bank=bank_name,
+                account_last4=statement_account[-4:] if statement_account else None,
+                currency="AUD",
+                period_start=period_start,
+                period_end=period_end,
+                pages=opened.tally.count,
+                warnings=warnings,
+            )
+            bundles.append(
+                ResultBundle(
+                    meta=meta,
+                    transactions=frame,
+                    liabilities=summary.get("liabilities", {}),
+                    summary=summary,
+                )
+            )
+        return bundles
+
+
+__all__ = ["EngineState", "Normalizer"]
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import csv
+import gzip
+import io
+import os
+from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Dict, Iterable, Iterator, List, Optional
 
+from ..frame import TransactionFrame, format_cents
 from ..models import Transaction
 
 DEFAULT_COLUMNS = [
@@ -20,28 +26,136 @@ DEFAULT_COLUMNS = [
 ]
 
 
-def export_csv(transactions: Iterable[Transaction], path: Path) -> Path:
-    rows = [
-        [
-            txn.date.strftime("%Y-%m-%d"),
-            txn.description,
-            txn.merchant or "",
-            txn.category or "",
-            f"{txn.amount:.2f}",
-            f"{txn.debit:.2f}" if txn.debit is not None else "",
-            f"{txn.credit:.2f}" if txn.credit is not None else "",
-            f"{txn.balance:.2f}" if txn.balance is not None else "",
-            txn.bank,
-            txn.account or "",
+# Rows formatted per batch and bytes buffered before each write.
+EXPORT_BATCH = int(os.environ.get("BANKNORM_EXPORT_BATCH", "2048"))
+CHUNK_BYTES = 1 << 20
+
+
+def _money(cents: Optional[int]) -> str:
+    return format_cents(cents) if cents is not None else ""
+
+
+def _money_float(value: Optional[float]) -> str:
+    return f"{value:.2f}" if value is not None else ""
+
+
+class _DayFormatter:
+    """``YYYY-MM-DD`` strings memoized per day; statements reuse few dates."""
+
+    def __init__(self) -> None:
+        self._days: Dict[int, str] = {}
+
+    def __call__(self, ordinal: int) -> str:
+        day = self._days.get(ordinal)
+        if day is None:
+            if len(self._days) >= 65536:
+                self._days.clear()
+            day = self._days[ordinal] = date.fromordinal(ordinal).isoformat()
+        return day
+
+
+def _frame_batches(frame: TransactionFrame, size: int) -> Iterator[List[List[str]]]:
+    day = _DayFormatter()
+    for start in range(0, len(frame), size):
+        stop = min(start + size, len(frame))
+        span = range(start, stop)
+        yield [
+            list(values)
+            for values in zip(
+                map(day, frame.ordinals[start:stop]),
+                frame.descriptions[start:stop],
+                (frame.merchants[index] or "" for index in span),
+                (frame.categories[index] or "" for index in span),
+                map(format_cents, frame.amounts[start:stop]),
+                (_money(frame.debits[index]) for index in span),
+                (_money(frame.credits[index]) for index in span),
+                (_money(frame.balances[index]) for index in span),
+                (frame.banks[index] or "" for index in span),
+                (frame.accounts[index] or "" for index in span),
+            )
+        ]
+
+
+def _transaction_batches(transactions: Iterable[Transaction], size: int) -> Iterator[List[List[str]]]:
+    day = _DayFormatter()
+    iterator = iter(transactions)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield [
+            [
+                day(txn.date.toordinal()),
+                txn.description,
+                txn.merchant or "",
+                txn.category or "",
+                f"{txn.amount:.2f}",
+                _money_float(txn.debit),
+                _money_float(txn.credit),
+                _money_float(txn.balance),
+                txn.bank,
+                txn.account or "",
+            ]
+            for txn in batch
         ]
-        for txn in transactions
-    ]
+
+
+def iter_row_batches(transactions: Iterable[Transaction], size: int = EXPORT_BATCH) -> Iterator[List[List[str]]]:
+    """Yield formatted rows in :data:`DEFAULT_COLUMNS` order, ``size`` at a time.
+
+    A :class:`TransactionFrame` is formatted straight from its columns; any
+    other iterable is consumed lazily, so only one batch is held at once.
+    """
+
+    if isinstance(transactions, TransactionFrame):
+        return _frame_batches(transactions, size)
+    return _transaction_batches(transactions, size)
+
+
+def format_rows(transactions: Iterable[Transaction]) -> Iterator[List[str]]:
+    for batch in iter_row_batches(transactions):
+        yield from batch
+
+
+def _open_text(path: Path, mode: str, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, f"{mode}t", encoding="utf-8", newline="")  # type: ignore[return-value]
+    return path.open(mode, encoding="utf-8", newline="")
+
+
+def export_csv(
+    transactions: Iterable[Transaction],
+    path: Path,
+    *,
+    append: bool = False,
+    compress: Optional[bool] = None,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> Path:
+    """Stream transactions to CSV with memory bounded by one batch and one chunk.
+
+    ``compress`` defaults to gzip when ``path`` ends in ``.gz``. With
+    ``append`` rows are added to an existing file and the header is written
+    only if the file is new or empty; appending to a gzip file adds a new
+    gzip member, which readers treat as one stream.
+    """
+
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as fh:
-        writer = csv.writer(fh)
+    if compress is None:
+        compress = path.suffix == ".gz"
+    write_header = not (append and path.exists() and path.stat().st_size > 0)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if write_header:
         writer.writerow(DEFAULT_COLUMNS)
-        writer.writerows(rows)
+    with _open_text(path, "a" if append else "w", compress) as fh:
+        for batch in iter_row_batches(transactions):
+            writer.writerows(batch)
+            if buffer.tell() >= chunk_bytes:
+                fh.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        fh.write(buffer.getvalue())
     return path
 
 
-__all__ = ["export_csv", "DEFAULT_COLUMNS"]
+__all__ = ["export_csv", "format_rows", "iter_row_batches", "DEFAULT_COLUMNS"]
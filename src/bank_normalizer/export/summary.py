@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from typing import Dict, Iterable
-
+from datetime import date
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from ..frame import TransactionFrame, to_cents
 from ..models import Transaction
+from ..normalize.matching import KeywordAutomaton
 from ..normalize.recurring import RecurringSeries
 
 LIABILITY_KEYWORDS = {
@@ -16,60 +30,206 @@ LIABILITY_KEYWORDS = {
 FEE_KEYWORDS = ["FEE", "OVERDRAWN", "NSF"]
 
 
-def _matches_keywords(description: str, keywords: Iterable[str]) -> bool:
-    upper = description.upper()
-    return any(keyword in upper for keyword in keywords)
+class SummaryRow:
+    """One transaction as seen by accumulators; reused across the pass."""
+
+    __slots__ = ("ordinal", "cents", "upper", "category", "matches")
+
+    def __init__(self) -> None:
+        self.ordinal = 0
+        self.cents = 0
+        self.upper = ""
+        self.category: Optional[str] = None
+        self.matches: Set[str] = set()
+
+
+class Accumulator(Protocol):
+    """A summary metric fed every transaction during the single pass.
+
+    ``keywords`` maps labels to description keywords; a row's ``matches``
+    holds the labels whose keywords occur in its upper-cased description.
+    """
+
+    name: str
+    keywords: Mapping[str, Sequence[str]]
+
+    def add(self, row: SummaryRow) -> None:
+        ...
+
+    def result(self) -> object:
+        ...
+
+
+class LiabilityTotals:
+    name = "liabilities"
+    keywords: Mapping[str, Sequence[str]]
+
+    def __init__(self) -> None:
+        self._labels = [(key, f"liability:{key}", key.upper()) for key in LIABILITY_KEYWORDS]
+        self.keywords = {label: LIABILITY_KEYWORDS[key] for key, label, _category in self._labels}
+        self._totals: Dict[str, int] = {key: 0 for key in LIABILITY_KEYWORDS}
+
+    def add(self, row: SummaryRow) -> None:
+        if row.cents >= 0:
+            return
+        category = row.category.upper() if row.category else None
+        for key, label, key_category in self._labels:
+            if label in row.matches or category == key_category:
+                self._totals[key] -= row.cents
+
+    def result(self) -> Dict[str, float]:
+        return {key: cents / 100 for key, cents in self._totals.items()}
+
+
+class FeeFlags:
+    name = "fees"
+    keywords: Mapping[str, Sequence[str]]
+
+    def __init__(self) -> None:
+        self.keywords = {"fee": FEE_KEYWORDS, "nsf": ["NSF", "OVERDRAWN"]}
+        self._counts: Counter[str] = Counter()
+
+    def add(self, row: SummaryRow) -> None:
+        if "fee" in row.matches:
+            self._counts["fees"] += 1
+        if "nsf" in row.matches:
+            self._counts["nsf"] += 1
+
+    def result(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+
+class MonthlyTotals:
+    name = "totals"
+    keywords: Mapping[str, Sequence[str]] = {}
+
+    def __init__(self) -> None:
+        self._months: Dict[int, str] = {}
+        self._totals: Dict[str, int] = defaultdict(int)
+
+    def add(self, row: SummaryRow) -> None:
+        month = self._months.get(row.ordinal)
+        if month is None:
+            month = self._months[row.ordinal] = date.fromordinal(row.ordinal).strftime("%Y-%m")
+        self._totals[month] += row.cents
+
+    def result(self) -> Dict[str, float]:
+        return {month: cents / 100 for month, cents in self._totals.items()}
+
+
+def default_accumulators() -> List[Accumulator]:
+    return [MonthlyTotals(), LiabilityTotals(), FeeFlags()]
+
+
+_Record = Tuple[int, int, str, Optional[str]]
+
+
+def _records(transactions: Iterable[Transaction]) -> Iterator[_Record]:
+    if isinstance(transactions, TransactionFrame):
+        return zip(transactions.ordinals, transactions.amounts, transactions.descriptions, transactions.categories)
+    return (
+        (txn.date.toordinal(), to_cents(txn.amount), txn.description, txn.category)  # type: ignore[misc]
+        for txn in transactions
+    )
+
+
+class SummaryAggregator:
+    """Compute every summary metric in one streaming pass.
+
+    Each description is upper-cased once and scanned once for the keywords of
+    all accumulators together; the accumulators then read the shared row.
+    Adding a metric means adding an accumulator, not another pass.
+    """
+
+    def __init__(self, accumulators: Optional[Sequence[Accumulator]] = None) -> None:
+        self.accumulators = list(accumulators) if accumulators is not None else default_accumulators()
+        self._automaton: KeywordAutomaton[str] = KeywordAutomaton(
+            (keyword.upper(), label)
+            for accumulator in self.accumulators
+            for label, keywords in accumulator.keywords.items()
+            for keyword in keywords
+        )
+        self.count = 0
+
+    def consume(self, transactions: Iterable[Transaction]) -> "SummaryAggregator":
+        row = SummaryRow()
+        automaton = self._automaton
+        adders = [accumulator.add for accumulator in self.accumulators]
+        for ordinal, cents, description, category in _records(transactions):
+            row.ordinal = ordinal
+            row.cents = cents
+            row.upper = upper = description.upper()
+            row.category = category
+            row.matches = automaton.findall(upper) if automaton else set()
+            for add in adders:
+                add(row)
+            self.count += 1
+        return self
+
+    def results(self) -> Dict[str, object]:
+        return {accumulator.name: accumulator.result() for accumulator in self.accumulators}
 
 
 def compute_liabilities(transactions: Iterable[Transaction]) -> Dict[str, float]:
-    totals: Dict[str, float] = {key: 0.0 for key in LIABILITY_KEYWORDS}
-    for txn in transactions:
-        if txn.amount >= 0:
-            continue
-        for key, keywords in LIABILITY_KEYWORDS.items():
-            if _matches_keywords(txn.description, keywords) or (txn.category and txn.category.upper() == key.upper()):
-                totals[key] += abs(txn.amount)
-    return totals
+    totals = LiabilityTotals()
+    SummaryAggregator([totals]).consume(transactions)
+    return totals.result()
 
 
 def compute_fee_flags(transactions: Iterable[Transaction]) -> Dict[str, int]:
-    counts = Counter()
-    for txn in transactions:
-        if _matches_keywords(txn.description, FEE_KEYWORDS):
-            counts["fees"] += 1
-        if "NSF" in txn.description.upper() or "OVERDRAWN" in txn.description.upper():
-            counts["nsf"] += 1
-    return counts
+    flags = FeeFlags()
+    SummaryAggregator([flags]).consume(transactions)
+    return flags.result()
 
 
 def monthly_totals(transactions: Iterable[Transaction]) -> Dict[str, float]:
-    totals: Dict[str, float] = defaultdict(float)
-    for txn in transactions:
-        month = txn.date.strftime("%Y-%m")
-        totals[month] += txn.amount
-    return dict(totals)
+    totals = MonthlyTotals()
+    SummaryAggregator([totals]).consume(transactions)
+    return totals.result()
 
 
-def build_summary(transactions: Iterable[Transaction], recurring: Dict[str, RecurringSeries]) -> Dict[str, object]:
-    txns = list(transactions)
-    if not txns:
-        return {"totals": {}, "liabilities": {}, "recurring": {}, "fees": {}}
-    liabilities = compute_liabilities(txns)
-    fees = compute_fee_flags(txns)
-    recurring_summary = {
+def summarize_series(recurring: Mapping[str, RecurringSeries]) -> Dict[str, Dict[str, object]]:
+    return {
         key: {
             "average_amount": series.average_amount,
             "occurrences": series.occurrences,
             "interval_days": series.average_interval_days,
+            "cadence": series.cadence,
         }
         for key, series in recurring.items()
     }
+
+
+def build_summary(
+    transactions: Iterable[Transaction],
+    recurring: Dict[str, RecurringSeries],
+    accumulators: Optional[Sequence[Accumulator]] = None,
+) -> Dict[str, object]:
+    """Summarize transactions in one pass; ``accumulators`` replaces the defaults."""
+
+    aggregator = SummaryAggregator(accumulators).consume(transactions)
+    if not aggregator.count:
+        return {"totals": {}, "liabilities": {}, "recurring": {}, "fees": {}}
+    recurring_summary = summarize_series(recurring)
+    results = aggregator.results()
     return {
-        "totals": monthly_totals(txns),
-        "liabilities": liabilities,
+        "totals": results.pop("totals", {}),
+        "liabilities": results.pop("liabilities", {}),
         "recurring": recurring_summary,
-        "fees": dict(fees),
+        "fees": results.pop("fees", {}),
+        **results,
     }
 
 
-__all__ = ["build_summary", "compute_liabilities"]
+__all__ = [
+    "Accumulator",
+    "FeeFlags",
+    "LiabilityTotals",
+    "MonthlyTotals",
+    "SummaryAggregator",
+    "SummaryRow",
+    "build_summary",
+    "compute_liabilities",
+    "default_accumulators",
+    "summarize_series",
+]
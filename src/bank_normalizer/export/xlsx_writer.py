@@ -1,82 +1,265 @@
 from __future__ import annotations
 
 import zipfile
+from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
+from ..frame import TransactionFrame, format_cents, to_cents
 from ..models import Transaction
-from .csv_writer import DEFAULT_COLUMNS
-
-WORKBOOK_XML = """<?xml version='1.0' encoding='UTF-8' standalone='yes'?>
-<workbook xmlns='http://schemas.openxmlformats.org/spreadsheetml/2006/main'>
-  <sheets>
-    <sheet name='Transactions' sheetId='1' r:id='rId1'/>
-  </sheets>
-</workbook>
-"""
+from .csv_writer import CHUNK_BYTES, DEFAULT_COLUMNS, EXPORT_BATCH
 
-WORKSHEET_TEMPLATE = """<?xml version='1.0' encoding='UTF-8' standalone='yes'?>
-<worksheet xmlns='http://schemas.openxmlformats.org/spreadsheetml/2006/main'>
-  <sheetData>
-    {rows}
-  </sheetData>
-</worksheet>
-"""
+NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_DECL = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
 
-CONTENT_TYPES = """<?xml version='1.0' encoding='UTF-8' standalone='yes'?>
-<Types xmlns='http://schemas.openxmlformats.org/package/2006/content-types'>
-  <Default Extension='rels' ContentType='application/vnd.openxmlformats-package.relationships+xml'/>
-  <Default Extension='xml' ContentType='application/xml'/>
-  <Override PartName='/xl/worksheets/sheet1.xml' ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'/>
-  <Override PartName='/xl/workbook.xml' ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml'/>
-</Types>
-"""
+# Day 0 of Excel's 1900 date system, as used for date serial numbers.
+EXCEL_EPOCH = date(1899, 12, 30).toordinal()
 
-RELS = """<?xml version='1.0' encoding='UTF-8' standalone='yes'?>
-<Relationships xmlns='http://schemas.openxmlformats.org/package/2006/relationships'>
-  <Relationship Id='rId1' Type='http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet' Target='worksheets/sheet1.xml'/>
-</Relationships>
+# Cell styles: 0 default, 1 date, 2 two-decimal number.
+STYLE_DATE = 1
+STYLE_MONEY = 2
+
+STYLES_XML = f"""{XML_DECL}<styleSheet xmlns='{NS}'>
+  <numFmts count='1'><numFmt numFmtId='164' formatCode='yyyy-mm-dd'/></numFmts>
+  <fonts count='1'><font><sz val='11'/><name val='Calibri'/></font></fonts>
+  <fills count='2'><fill><patternFill patternType='none'/></fill><fill><patternFill patternType='gray125'/></fill></fills>
+  <borders count='1'><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+  <cellStyleXfs count='1'><xf numFmtId='0' fontId='0' fillId='0' borderId='0'/></cellStyleXfs>
+  <cellXfs count='3'>
+    <xf numFmtId='0' fontId='0' fillId='0' borderId='0' xfId='0'/>
+    <xf numFmtId='164' fontId='0' fillId='0' borderId='0' xfId='0' applyNumberFormat='1'/>
+    <xf numFmtId='4' fontId='0' fillId='0' borderId='0' xfId='0' applyNumberFormat='1'/>
+  </cellXfs>
+</styleSheet>
 """
 
-ROOT_RELS = """<?xml version='1.0' encoding='UTF-8' standalone='yes'?>
-<Relationships xmlns='http://schemas.openxmlformats.org/package/2006/relationships'>
-  <Relationship Id='rId1' Type='http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument' Target='xl/workbook.xml'/>
+ROOT_RELS = f"""{XML_DECL}<Relationships xmlns='http://schemas.openxmlformats.org/package/2006/relationships'>
+  <Relationship Id='rId1' Type='{REL_NS}/officeDocument' Target='xl/workbook.xml'/>
 </Relationships>
 """
 
+SHEET_HEAD = f"{XML_DECL}<worksheet xmlns='{NS}'><sheetData>"
+SHEET_TAIL = "</sheetData></worksheet>\n"
+
+# Value kinds per DEFAULT_COLUMNS entry: inline text, shared text, date, money.
+COLUMN_KINDS = ("date", "inline", "inline", "shared", "money", "money", "money", "money", "shared", "inline")
+
+_Row = Tuple[Any, ...]
+
 
 def _format_cell(value: str) -> str:
-    return value.replace("&", "&amp;").replace("<", "&lt;")
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
-def export_xlsx(transactions: Iterable[Transaction], path: Path) -> Path:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    rows_xml = []
-    header_cells = "".join(f"<c t='inlineStr'><is><t>{_format_cell(col)}</t></is></c>" for col in DEFAULT_COLUMNS)
-    rows_xml.append(f"<row r='1'>{header_cells}</row>")
-    for idx, txn in enumerate(transactions, start=2):
-        values = [
-            txn.date.strftime("%Y-%m-%d"),
-            txn.description,
-            txn.merchant or "",
-            txn.category or "",
-            f"{txn.amount:.2f}",
-            f"{txn.debit:.2f}" if txn.debit is not None else "",
-            f"{txn.credit:.2f}" if txn.credit is not None else "",
-            f"{txn.balance:.2f}" if txn.balance is not None else "",
-            txn.bank,
-            txn.account or "",
+class SharedStrings:
+    """Shared-strings table for values repeated on most rows (bank, category)."""
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self.count = 0
+
+    def __call__(self, value: str) -> int:
+        self.count += 1
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self._index)
+        return index
+
+    def xml(self) -> str:
+        items = "".join(f"<si><t xml:space='preserve'>{_format_cell(value)}</t></si>" for value in self._index)
+        return f"{XML_DECL}<sst xmlns='{NS}' count='{self.count}' uniqueCount='{len(self._index)}'>{items}</sst>\n"
+
+
+def _frame_rows(frame: TransactionFrame, size: int) -> Iterator[List[_Row]]:
+    for start in range(0, len(frame), size):
+        stop = min(start + size, len(frame))
+        span = range(start, stop)
+        yield list(
+            zip(
+                frame.ordinals[start:stop],
+                frame.descriptions[start:stop],
+                (frame.merchants[index] for index in span),
+                (frame.categories[index] for index in span),
+                frame.amounts[start:stop],
+                (frame.debits[index] for index in span),
+                (frame.credits[index] for index in span),
+                (frame.balances[index] for index in span),
+                (frame.banks[index] for index in span),
+                (frame.accounts[index] for index in span),
+            )
+        )
+
+
+def _transaction_rows(transactions: Iterable[Transaction], size: int) -> Iterator[List[_Row]]:
+    iterator = iter(transactions)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield [
+            (
+                txn.date.toordinal(),
+                txn.description,
+                txn.merchant,
+                txn.category,
+                to_cents(txn.amount),
+                to_cents(txn.debit),
+                to_cents(txn.credit),
+                to_cents(txn.balance),
+                txn.bank,
+                txn.account,
+            )
+            for txn in batch
         ]
-        cells = "".join(f"<c t='inlineStr'><is><t>{_format_cell(val)}</t></is></c>" for val in values)
-        rows_xml.append(f"<row r='{idx}'>{cells}</row>")
-    worksheet_xml = WORKSHEET_TEMPLATE.format(rows="".join(rows_xml))
+
+
+def _row_batches(transactions: Iterable[Transaction], size: int = EXPORT_BATCH) -> Iterator[List[_Row]]:
+    if isinstance(transactions, TransactionFrame):
+        return _frame_rows(transactions, size)
+    return _transaction_rows(transactions, size)
+
+
+def _cell(kind: str, value: Any, shared: SharedStrings) -> str:
+    if value is None or value == "":
+        return "<c/>"
+    if kind == "money":
+        return f"<c s='{STYLE_MONEY}'><v>{format_cents(value)}</v></c>"
+    if kind == "date":
+        return f"<c s='{STYLE_DATE}'><v>{value - EXCEL_EPOCH}</v></c>"
+    if kind == "shared":
+        return f"<c t='s'><v>{shared(value)}</v></c>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    return _text(str(value))
+
+
+def _text(value: str) -> str:
+    return f"<c t='inlineStr'><is><t xml:space='preserve'>{_format_cell(value)}</t></is></c>"
+
+
+def _header(columns: Iterable[str]) -> str:
+    return "".join(map(_text, columns))
+
+
+def _write_sheet(handle: IO[bytes], rows: Iterator[str], chunk_bytes: int = CHUNK_BYTES) -> None:
+    """Write ``<row>`` fragments into a zip entry in roughly ``chunk_bytes`` pieces."""
+
+    handle.write(SHEET_HEAD.encode("utf-8"))
+    parts: List[str] = []
+    size = 0
+    for number, cells in enumerate(rows, start=1):
+        part = f"<row r='{number}'>{cells}</row>"
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_bytes:
+            handle.write("".join(parts).encode("utf-8"))
+            parts, size = [], 0
+    parts.append(SHEET_TAIL)
+    handle.write("".join(parts).encode("utf-8"))
+
+
+def _transaction_sheet(transactions: Iterable[Transaction], shared: SharedStrings) -> Iterator[str]:
+    yield _header(DEFAULT_COLUMNS)
+    for batch in _row_batches(transactions):
+        for values in batch:
+            yield "".join(_cell(kind, value, shared) for kind, value in zip(COLUMN_KINDS, values))
+
+
+def _summary_rows(summary: Mapping[str, Any]) -> Iterator[Tuple[str, str, Any]]:
+    for section, values in summary.items():
+        if not isinstance(values, Mapping):
+            yield section, "", values
+            continue
+        for key, value in values.items():
+            if isinstance(value, Mapping):
+                for field, item in value.items():
+                    yield section, f"{key}.{field}", item
+            else:
+                yield section, str(key), value
+
+
+def _summary_sheet(summary: Mapping[str, Any], shared: SharedStrings) -> Iterator[str]:
+    yield _header(("section", "key", "value"))
+    for section, key, value in _summary_rows(summary):
+        if isinstance(value, (list, tuple)):
+            value = ", ".join(map(str, value))
+        yield _cell("shared", section, shared) + _cell("inline", key, shared) + _cell("inline", value, shared)
+
+
+def _workbook_parts(sheets: List[str]) -> Dict[str, str]:
+    sheet_entries = "".join(
+        f"<sheet name='{_format_cell(name)}' sheetId='{number}' r:id='rId{number}'/>"
+        for number, name in enumerate(sheets, start=1)
+    )
+    rel_entries = "".join(
+        f"<Relationship Id='rId{number}' Type='{REL_NS}/worksheet' Target='worksheets/sheet{number}.xml'/>"
+        for number in range(1, len(sheets) + 1)
+    )
+    extra = len(sheets)
+    rel_entries += (
+        f"<Relationship Id='rId{extra + 1}' Type='{REL_NS}/styles' Target='styles.xml'/>"
+        f"<Relationship Id='rId{extra + 2}' Type='{REL_NS}/sharedStrings' Target='sharedStrings.xml'/>"
+    )
+    sheet_types = "".join(
+        f"<Override PartName='/xl/worksheets/sheet{number}.xml' "
+        "ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'/>"
+        for number in range(1, len(sheets) + 1)
+    )
+    return {
+        "[Content_Types].xml": (
+            f"{XML_DECL}<Types xmlns='http://schemas.openxmlformats.org/package/2006/content-types'>"
+            "<Default Extension='rels' ContentType='application/vnd.openxmlformats-package.relationships+xml'/>"
+            "<Default Extension='xml' ContentType='application/xml'/>"
+            "<Override PartName='/xl/workbook.xml' "
+            "ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml'/>"
+            "<Override PartName='/xl/styles.xml' "
+            "ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml'/>"
+            "<Override PartName='/xl/sharedStrings.xml' "
+            "ContentType='application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml'/>"
+            f"{sheet_types}</Types>\n"
+        ),
+        "_rels/.rels": ROOT_RELS,
+        "xl/_rels/workbook.xml.rels": (
+            f"{XML_DECL}<Relationships xmlns='http://schemas.openxmlformats.org/package/2006/relationships'>"
+            f"{rel_entries}</Relationships>\n"
+        ),
+        "xl/workbook.xml": (
+            f"{XML_DECL}<workbook xmlns='{NS}' xmlns:r='{REL_NS}'><sheets>{sheet_entries}</sheets></workbook>\n"
+        ),
+        "xl/styles.xml": STYLES_XML,
+    }
+
+
+def export_xlsx(
+    transactions: Iterable[Transaction],
+    path: Path,
+    *,
+    summary: Optional[Mapping[str, Any]] = None,
+) -> Path:
+    """Stream transactions into an XLSX workbook.
+
+    Rows are written into the worksheet entry batch by batch, so memory does
+    not grow with the row count; only the shared-strings table (distinct
+    banks and categories) is kept. Dates and amounts are numeric cells with
+    date and two-decimal styles. ``summary`` adds a "Summary" sheet listing
+    each section's values.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    shared = SharedStrings()
+    sheets = ["Transactions"] + (["Summary"] if summary is not None else [])
     with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr("[Content_Types].xml", CONTENT_TYPES)
-        zf.writestr("_rels/.rels", ROOT_RELS)
-        zf.writestr("xl/_rels/workbook.xml.rels", RELS)
-        zf.writestr("xl/workbook.xml", WORKBOOK_XML)
-        zf.writestr("xl/worksheets/sheet1.xml", worksheet_xml)
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as handle:
+            _write_sheet(handle, _transaction_sheet(transactions, shared))
+        if summary is not None:
+            with zf.open("xl/worksheets/sheet2.xml", "w") as handle:
+                _write_sheet(handle, _summary_sheet(summary, shared))
+        for name, xml in _workbook_parts(sheets).items():
+            zf.writestr(name, xml)
+        zf.writestr("xl/sharedStrings.xml", shared.xml())
     return path
 
 
-__all__ = ["export_xlsx"]
+__all__ = ["SharedStrings", "export_xlsx"]
@@ -1,7 +1,19 @@
 """PDF extraction helpers."""
 
 from .pdf_reader import PDFStatement
-from .pdf_reader import read_pdf
-from .parse_table import ParsedRow, parse_statement_rows
+from .pdf_reader import iter_pdf_pages, read_pdf
+from .parse_table import ParsedRow, iter_statement_rows, parse_statement_rows
+from .cache import StatementCache, file_digest
+from .account import infer_account
 
-__all__ = ["read_pdf", "parse_statement_rows", "PDFStatement", "ParsedRow"]
+__all__ = [
+    "read_pdf",
+    "iter_pdf_pages",
+    "parse_statement_rows",
+    "iter_statement_rows",
+    "PDFStatement",
+    "ParsedRow",
+    "StatementCache",
+    "file_digest",
+    "infer_account",
+]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+ACCOUNT_RE = re.compile(
+    r"(?i)\b(?:account|acct|a/c)(?:\s+(?:number|no\.?|num))?\s*[:#]?\s*(\d[\d -]{4,}\d)"
+)
+MIN_ACCOUNT_DIGITS = 6
+
+
+def infer_account(text: str) -> Optional[str]:
+    """Find an ``Account Number: 123-456 7890`` style account number; digits only."""
+
+    found = ACCOUNT_RE.search(text)
+    if found is None:
+        return None
+    digits = re.sub(r"\D", "", found.group(1))
+    return digits if len(digits) >= MIN_ACCOUNT_DIGITS else None
+
+
+__all__ = ["ACCOUNT_RE", "infer_account"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from .parse_table import ParsedRow
+from .pdf_reader import PDFPage
+
+# Bump whenever extraction or row parsing changes so stale entries are ignored.
+EXTRACTOR_VERSION = "4"
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("BANKNORM_CACHE_DIR", Path(tempfile.gettempdir()) / "banknorm_cache"))
+DEFAULT_MAX_BYTES = int(os.environ.get("BANKNORM_CACHE_MB", "256")) * 1024 * 1024
+
+CachedRecord = Union[PDFPage, ParsedRow]
+
+
+def file_digest(path: Path | str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CacheWriter:
+    """Append pages and rows to a cache entry as they are produced.
+
+    Records are written to a temporary file that only replaces the entry on
+    :meth:`commit`, so readers never observe a partially written statement.
+    Rows are stored as value lists against the last header written, which keeps
+    entries compact for long statements.
+    """
+
+    def __init__(self, cache: "StatementCache", target: Path) -> None:
+        self._cache = cache
+        self._target = target
+        self._tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        self._fh: IO[str] = gzip.open(self._tmp, "wt", encoding="utf-8")
+        self._header: Optional[Tuple[str, ...]] = None
+        self._closed = False
+
+    def _write(self, record: dict) -> None:
+        self._fh.write(json.dumps(record, separators=(",", ":")))
+        self._fh.write("\n")
+
+    def add_page(self, page: PDFPage) -> None:
+        self._write({"p": page.number, "t": page.text})
+
+    def add_row(self, row: ParsedRow) -> None:
+        keys = tuple(row.raw)
+        if self._header is None or keys != self._header[: len(keys)]:
+            self._header = row.header if keys == row.header[: len(keys)] else keys
+            self._write({"h": list(self._header)})
+        self._write({"r": row.page, "v": list(row.raw.values())})
+
+    def track_pages(self, pages: Iterable[PDFPage]) -> Iterator[PDFPage]:
+        for page in pages:
+            self.add_page(page)
+            yield page
+
+    def track_rows(self, rows: Iterable[ParsedRow]) -> Iterator[ParsedRow]:
+        """Record rows as they pass and commit once the iterator is exhausted."""
+
+        try:
+            for row in rows:
+                self.add_row(row)
+                yield row
+        except BaseException:
+            self.abort()
+            raise
+        self.commit()
+
+    def commit(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._fh.close()
+        os.replace(self._tmp, self._target)
+        self._cache.evict()
+
+    def abort(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __del__(self) -> None:  # pragma: no cover - defensive cleanup
+        with contextlib.suppress(OSError):
+            self.abort()
+
+
+class CachedStatement:
+    """Replay a cache entry as the page and row stream it was written from."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __iter__(self) -> Iterator[CachedRecord]:
+        header: Tuple[str, ...] = ()
+        with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                record: dict[str, Any] = json.loads(line)
+                if "p" in record:
+                    yield PDFPage(number=record["p"], text=record["t"])
+                elif "h" in record:
+                    header = tuple(record["h"])
+                else:
+                    yield ParsedRow(page=record["r"], raw=dict(zip(header, record["v"])), header=header)
+
+
+class StatementCache:
+    """Content-addressed on-disk cache of extracted pages and parsed rows.
+
+    Entries are keyed by the file's SHA-256 plus :data:`EXTRACTOR_VERSION`, so a
+    re-submitted statement is recognised regardless of its file name. The
+    directory is kept under ``max_bytes`` by evicting least recently used
+    entries; a cache hit refreshes the entry's modification time. The
+    directory is only created when the first entry is written, so building a
+    cache has no side effects.
+    """
+
+    SUFFIX = ".jsonl.gz"
+
+    def __init__(self, directory: Path | str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.directory / f"{digest}-v{EXTRACTOR_VERSION}{self.SUFFIX}"
+
+    def get(self, digest: str) -> Optional[CachedStatement]:
+        path = self._entry_path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return CachedStatement(path)
+
+    def writer(self, digest: str) -> CacheWriter:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return CacheWriter(self, self._entry_path(digest))
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob(f"*{self.SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+
+__all__ = ["StatementCache", "CachedStatement", "CacheWriter", "file_digest", "EXTRACTOR_VERSION"]
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_dateparser_parse: Optional[Callable[..., Optional[datetime]]]
+try:  # pragma: no cover - optional dependency
+    from dateparser import parse as _dateparser_parse
+except ImportError:  # pragma: no cover
+    _dateparser_parse = None
+
+MONTH_NAMES = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+MONTHS = {name: index for index, name in enumerate(MONTH_NAMES, start=1)}
+
+# Values sampled before the dominant format is pinned.
+SAMPLE_SIZE = 8
+# Slack around the statement period when placing year-less dates.
+PERIOD_SLACK = timedelta(days=7)
+
+_DATE_TOKEN = r"\d{1,2}[/\-. ](?:\d{1,2}|[A-Za-z]{3,9})(?:[/\-., ]+\d{2,4})?"  # noqa: S105 - a regex, not a secret
+PERIOD_RE = re.compile(
+    rf"(?i)(?:period|from)\D{{0,20}}?({_DATE_TOKEN})\s*(?:to|-|–)\s*({_DATE_TOKEN})"
+)
+
+
+@dataclass(frozen=True)
+class DateFormat:
+    """A day-first date layout matched with a compiled regex.
+
+    Groups are always ``(day, month, year)``; ``year`` is absent for year-less
+    layouts and ``month`` may be a month name.
+    """
+
+    name: str
+    pattern: re.Pattern[str]
+    year_first: bool = False
+
+    def match(self, value: str) -> Optional[Tuple[int, int, Optional[int]]]:
+        found = self.pattern.fullmatch(value)
+        if found is None:
+            return None
+        groups = found.groups()
+        if self.year_first:
+            groups = (groups[2], groups[1], groups[0])
+        day_text, month_text, year_text = (groups + (None,))[:3]
+        if month_text.isdigit():
+            month = int(month_text)
+        else:
+            month = MONTHS.get(month_text[:3].upper(), 0)
+        year: Optional[int] = None
+        if year_text is not None:
+            year = int(year_text)
+            if year < 100:
+                year += 2000 if year < 70 else 1900
+        return int(day_text), month, year
+
+
+FORMATS: Tuple[DateFormat, ...] = (
+    DateFormat("dd/mm/yyyy", re.compile(r"(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{4})")),
+    DateFormat("dd/mm/yy", re.compile(r"(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{2})")),
+    DateFormat("yyyy-mm-dd", re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), year_first=True),
+    DateFormat("dd mon yyyy", re.compile(r"(\d{1,2})[ /\-]([A-Za-z]{3,9})[ /\-,]+(\d{4}|\d{2})")),
+    DateFormat("dd mon", re.compile(r"(\d{1,2})[ /\-]([A-Za-z]{3,9})")),
+    DateFormat("dd/mm", re.compile(r"(\d{1,2})[/\-.](\d{1,2})")),
+)
+
+
+class DateParser:
+    """Statement-scoped date parser.
+
+    The first :data:`SAMPLE_SIZE` values decide the statement's dominant
+    format, which is then tried first for every later value. Year-less dates
+    such as ``05-Jan`` take their year from the statement period when known,
+    otherwise from the last fully dated value seen. Parsed strings are
+    memoized for the lifetime of the parser.
+    """
+
+    def __init__(self, period: Optional[Tuple[date, date]] = None) -> None:
+        self.period = period
+        self.pinned: Optional[DateFormat] = None
+        self._hits: Counter[DateFormat] = Counter()
+        self._memo: Dict[str, Optional[datetime]] = {}
+        self._reference: Optional[date] = None
+
+    def _candidates(self) -> Iterable[DateFormat]:
+        if self.pinned is not None:
+            yield self.pinned
+        for fmt in FORMATS:
+            if fmt is not self.pinned:
+                yield fmt
+
+    def _resolve_year(self, day: int, month: int) -> int:
+        if self.period is not None:
+            start, end = self.period
+            years = range(start.year, end.year + 1)
+            for year in years:
+                try:
+                    candidate = date(year, month, day)
+                except ValueError:
+                    continue
+                if start - PERIOD_SLACK <= candidate <= end + PERIOD_SLACK:
+                    return year
+            return end.year
+        reference = self._reference or date.today()
+        if month - reference.month > 6:
+            return reference.year - 1
+        if reference.month - month > 6:
+            return reference.year + 1
+        return reference.year
+
+    def _parse_uncached(self, value: str) -> Tuple[Optional[datetime], bool]:
+        for fmt in self._candidates():
+            parts = fmt.match(value)
+            if parts is None:
+                continue
+            day, month, year = parts
+            inferred = year is None
+            if year is None:
+                year = self._resolve_year(day, month)
+            try:
+                parsed = datetime(year, month, day)
+            except ValueError:
+                continue
+            if self.pinned is None:
+                self._hits[fmt] += 1
+                if sum(self._hits.values()) >= SAMPLE_SIZE:
+                    self.pin()
+            self._reference = parsed.date()
+            return parsed, inferred and self.period is None
+        if _dateparser_parse is not None:
+            return _dateparser_parse(value, settings={"DATE_ORDER": "DMY", "PREFER_DAY_OF_MONTH": "first"}), False
+        return None, False
+
+    def pin(self) -> Optional[DateFormat]:
+        """Pin the most frequently matched format so far."""
+
+        if self._hits:
+            best = max(self._hits.values())
+            self.pinned = next(fmt for fmt in FORMATS if self._hits[fmt] == best)
+        return self.pinned
+
+    def parse(self, value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        key = value.strip()
+        if key in self._memo:
+            return self._memo[key]
+        parsed, context_dependent = self._parse_uncached(key)
+        # Year-less values resolved against the running reference depend on
+        # their position in the statement, so they are not memoized.
+        if not context_dependent:
+            self._memo[key] = parsed
+        return parsed
+
+    def parse_dates(self, values: Sequence[Optional[str]]) -> List[Optional[datetime]]:
+        """Parse a batch, pinning the format from its leading values first."""
+
+        if self.pinned is None:
+            for value in values[:SAMPLE_SIZE]:
+                self.parse(value)
+            self.pin()
+        return [self.parse(value) for value in values]
+
+
+def infer_period(text: str) -> Optional[Tuple[date, date]]:
+    """Find a ``period 01/01/2023 to 31/01/2023`` style range in statement text."""
+
+    found = PERIOD_RE.search(text)
+    if found is None:
+        return None
+    parser = DateParser()
+    end = parser.parse(found.group(2))
+    start = parser.parse(found.group(1))
+    if start is None or end is None or start > end:
+        return None
+    return start.date(), end.date()
+
+
+_PARSED: Dict[str, Optional[datetime]] = {}
+PARSED_CACHE_SIZE = 4096
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    """Parse a single date without statement context.
+
+    Only values that carry their own year are memoized; year-less ones are
+    resolved against today's date and would go stale in a long-running
+    process.
+    """
+
+    key = value.strip() if value else ""
+    if not key:
+        return None
+    if key in _PARSED:
+        return _PARSED[key]
+    parsed, context_dependent = DateParser()._parse_uncached(key)
+    if not context_dependent:
+        if len(_PARSED) >= PARSED_CACHE_SIZE:
+            _PARSED.clear()
+        _PARSED[key] = parsed
+    return parsed
+
+
+def parse_dates(values: Sequence[Optional[str]], period: Optional[Tuple[date, date]] = None) -> List[Optional[datetime]]:
+    return DateParser(period=period).parse_dates(values)
+
+
+__all__ = ["DateFormat", "DateParser", "FORMATS", "infer_period", "parse_date", "parse_dates"]
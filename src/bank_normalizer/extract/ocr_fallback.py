@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Deque, Iterable, Iterator, Optional, Tuple
 
 try:  # pragma: no cover - optional dependency
     import pytesseract
@@ -10,10 +15,185 @@ except Exception:  # pragma: no cover
     pytesseract = None
     convert_from_path = None
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .pdf_reader import PDFPage
 
-def ocr_pdf(path: Path | str) -> Iterable[str]:  # pragma: no cover - optional
-    if pytesseract is None or convert_from_path is None:
+OCR_DPI = int(os.environ.get("BANKNORM_OCR_DPI", "300"))
+OCR_WORKERS = int(os.environ.get("BANKNORM_OCR_WORKERS", "0")) or (os.cpu_count() or 1)
+OCR_CACHE_DIR = Path(os.environ.get("BANKNORM_OCR_CACHE_DIR", Path(tempfile.gettempdir()) / "banknorm_ocr"))
+OCR_CACHE_MAX_BYTES = int(os.environ.get("BANKNORM_OCR_CACHE_MB", "64")) * 1024 * 1024
+# Pages held back while waiting on OCR before the reader blocks.
+OCR_WINDOW = 16
+
+
+def ocr_available() -> bool:
+    return pytesseract is not None and convert_from_path is not None
+
+
+def ocr_pdf(path: Path | str, dpi: int = OCR_DPI) -> Iterable[str]:  # pragma: no cover - optional
+    if not ocr_available():
         raise RuntimeError("OCR dependencies not installed")
-    images = convert_from_path(str(path))
+    images = convert_from_path(str(path), dpi=dpi)
     for image in images:
         yield pytesseract.image_to_string(image)
+
+
+def render_page(path: str, number: int, dpi: int = OCR_DPI) -> Any:  # pragma: no cover - optional
+    """Rasterise one page, or return ``None`` if it produced no image."""
+
+    if not ocr_available():
+        raise RuntimeError("OCR dependencies not installed")
+    images = convert_from_path(path, dpi=dpi, first_page=number, last_page=number)
+    return images[0] if images else None
+
+
+def ocr_image(image: Any) -> str:  # pragma: no cover - optional
+    return pytesseract.image_to_string(image)
+
+
+def ocr_page(path: str, number: int, dpi: int = OCR_DPI) -> str:
+    """Rasterise and OCR a single page."""
+
+    image = render_page(path, number, dpi)
+    return ocr_image(image) if image is not None else ""
+
+
+def _write(target: Path, text: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def _ocr_cached(path: str, number: int, dpi: int, cache_dir: Optional[str], alias: Optional[str]) -> str:
+    """OCR one page, reusing text cached under the page image's hash.
+
+    ``alias`` records which image the page of a known file rendered to, so
+    the next read of that file can skip rasterising.
+    """
+
+    image = render_page(path, number, dpi)
+    if image is None:
+        return ""
+    if cache_dir is None:
+        return ocr_image(image)
+    key = hashlib.sha256(image.tobytes()).hexdigest()
+    cached = Path(cache_dir) / f"{key}.txt"
+    try:
+        text = cached.read_text(encoding="utf-8")
+        os.utime(cached)
+    except FileNotFoundError:
+        text = ocr_image(image)
+        _write(cached, text)
+    if alias is not None:
+        _write(Path(alias), key)
+    return text
+
+
+def _page_alias(cache_dir: Optional[Path], digest: Optional[str], number: int, dpi: int) -> Optional[Path]:
+    if cache_dir is None or digest is None:
+        return None
+    return Path(cache_dir) / "pages" / f"{digest}-{number}-{dpi}"
+
+
+def _lookup_alias(alias: Optional[Path]) -> Optional[str]:
+    if alias is None:
+        return None
+    try:
+        cached = alias.parent.parent / f"{alias.read_text(encoding='utf-8')}.txt"
+        text = cached.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    os.utime(cached)
+    return text
+
+
+def evict_ocr_cache(cache_dir: Path, max_bytes: int = OCR_CACHE_MAX_BYTES) -> None:
+    """Delete least recently used cache files until ``cache_dir`` fits ``max_bytes``."""
+
+    entries = []
+    total = 0
+    for path in cache_dir.rglob("*"):
+        if path.name.startswith("."):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if not path.is_file():
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    if total <= max_bytes:
+        return
+    entries.sort()
+    for _mtime, size, path in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _executor(workers: int) -> Executor:
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _resolve(page: "PDFPage", future: Optional[Future]) -> "PDFPage":
+    if future is not None:
+        page.text = future.result()
+    return page
+
+
+def ocr_blank_pages(
+    path: Path | str,
+    pages: Iterable["PDFPage"],
+    *,
+    digest: Optional[str] = None,
+    dpi: int = OCR_DPI,
+    workers: int = OCR_WORKERS,
+    cache_dir: Optional[Path] = OCR_CACHE_DIR,
+    cache_bytes: int = OCR_CACHE_MAX_BYTES,
+) -> Iterator["PDFPage"]:
+    """Fill in pages that came back without text, preserving page order.
+
+    Only blank pages are sent to the OCR pool, which is started lazily, so
+    digital statements never pay for it and mixed documents only pay for
+    their scanned pages. OCR text is cached by page-image hash, so the same
+    scan in another file is not OCRed again; when the caller knows the
+    file's ``digest`` a re-read skips rasterising as well. The cache is kept
+    under ``cache_bytes``, least recently used first. Pages with text pass
+    straight through unless they are queued behind a page still being OCRed.
+    """
+
+    pool: Optional[Executor] = None
+    pending: Deque[Tuple["PDFPage", Optional[Future]]] = deque()
+    cache = str(cache_dir) if cache_dir is not None else None
+    try:
+        for page in pages:
+            future: Optional[Future] = None
+            if not page.text.strip():
+                alias = _page_alias(cache_dir, digest, page.number, dpi)
+                text = _lookup_alias(alias)
+                if text is not None:
+                    page.text = text
+                else:
+                    if pool is None:
+                        pool = _executor(workers)
+                    target = str(alias) if alias is not None else None
+                    future = pool.submit(_ocr_cached, str(path), page.number, dpi, cache, target)
+            pending.append((page, future))
+            while pending:
+                head = pending[0][1]
+                if head is not None and not head.done() and len(pending) <= OCR_WINDOW:
+                    break
+                yield _resolve(*pending.popleft())
+        while pending:
+            yield _resolve(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+            if cache_dir is not None:
+                evict_ocr_cache(Path(cache_dir), cache_bytes)
+
+
+__all__ = ["ocr_available", "ocr_pdf", "ocr_page", "ocr_blank_pages", "evict_ocr_cache"]
@@ -1,23 +1,30 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .pdf_reader import PDFStatement, iter_lines
+from .dates import parse_date, parse_dates
+from .pdf_reader import PDFPage, PDFStatement
 
 DATE_RE = re.compile(r"\b(\d{1,2}[/-][A-Za-z]{3}|\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b")
 AMOUNT_RE = re.compile(r"[-+]?\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?|[-+]?\d+\.\d{2}|\(\$?\d+(?:,\d{3})*(?:\.\d{2})?\)")
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedRow:
     page: int
     raw: Dict[str, str]
+    # Column names of the layout the row was read under, shared by its rows.
+    header: Tuple[str, ...] = ()
 
 
 HEADER_TOKENS = {"date", "description", "debit", "withdrawal", "credit", "deposit", "amount", "balance"}
+# Header names of the column that wrapped description lines continue.
+DESCRIPTION_TOKENS = ("description", "details", "narrative", "particulars")
+
+
+COLUMN_RE = re.compile(r"\S+(?: \S+)*")
 
 
 def _split_columns(line: str) -> List[str]:
@@ -25,6 +32,66 @@ def _split_columns(line: str) -> List[str]:
     return parts
 
 
+@dataclass
+class HeaderLayout:
+    """Header tokens with the character span each one occupies.
+
+    Each column boundary must fall inside the gap between neighbouring header
+    tokens, so data lines printed under the same layout can be sliced at fixed
+    offsets. Blank cells then come back as empty strings instead of shifting
+    every following value one column to the left.
+    """
+
+    tokens: List[str]
+    spans: List[Tuple[int, int]]
+    gaps: List[Tuple[int, int]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.gaps = [(left[1], right[0]) for left, right in zip(self.spans, self.spans[1:])]
+
+    @property
+    def description_column(self) -> str:
+        lowered = [token.lower() for token in self.tokens]
+        for name in DESCRIPTION_TOKENS:
+            if name in lowered:
+                return self.tokens[lowered.index(name)]
+        return "Description"
+
+    @classmethod
+    def from_line(cls, line: str) -> "HeaderLayout":
+        matches = list(COLUMN_RE.finditer(line))
+        return cls(tokens=[match.group() for match in matches], spans=[match.span() for match in matches])
+
+    def slice(self, line: str) -> Optional[List[str]]:
+        """Return one value per header token, or ``None`` if the line does not fit.
+
+        A boundary is placed at the last double space inside each header gap;
+        a line without one in some gap has a value straddling two columns. A
+        line is also rejected when a boundary cuts through a token or a cell
+        still holds a run of spaces, since its values were not printed under
+        this header's columns and the whitespace split reads it correctly.
+        """
+
+        length = len(line)
+        bounds = [0]
+        for lo, hi in self.gaps:
+            if length <= hi:
+                bounds.append(length)
+                continue
+            split = line.rfind("  ", lo - 1, hi + 1)
+            if split < 0:
+                return None
+            bounds.append(split + 1)
+        bounds.append(length)
+        for bound in bounds[1:-1]:
+            if 0 < bound < length and not line[bound - 1].isspace() and not line[bound].isspace():
+                return None
+        cells = [line[start:stop].strip() for start, stop in zip(bounds, bounds[1:])]
+        if any("  " in cell for cell in cells):
+            return None
+        return cells
+
+
 def find_header(lines: Iterable[str]) -> Optional[int]:
     for idx, line in enumerate(lines):
         lowered = {token.strip().lower() for token in re.split(r"\s+", line)}
@@ -33,40 +100,76 @@ def find_header(lines: Iterable[str]) -> Optional[int]:
     return None
 
 
-def parse_statement_rows(statement: PDFStatement) -> List[ParsedRow]:
-    rows: List[ParsedRow] = []
-    page_lines: Dict[int, List[str]] = {}
-    for page_num, line in iter_lines(statement):
-        page_lines.setdefault(page_num, []).append(line)
+def _page_lines(page: PDFPage) -> List[str]:
+    # Leading whitespace is kept because fixed-width slicing works on offsets.
+    return [line.rstrip() for line in page.text.splitlines() if line.strip()]
+
+
+def _parse_line(
+    line: str,
+    layout: HeaderLayout,
+    header: Tuple[str, ...],
+    pending: Optional[ParsedRow],
+    page: int,
+    fixed_width: bool,
+) -> Optional[ParsedRow]:
+    """Return the row ``line`` starts, or ``None`` for any other line.
+
+    A line without a date, balance or total continues the description of
+    ``pending``; lines with fewer than two values are skipped.
+    """
 
-    for page_num, lines in page_lines.items():
+    lowered = line.lower()
+    if not DATE_RE.search(line) and "balance" not in lowered and "total" not in lowered:
+        if pending is not None:
+            continued = layout.description_column
+            pending.raw[continued] = f"{pending.raw.get(continued, '')} {line.strip()}".strip()
+        return None
+    columns = layout.slice(line) if fixed_width else None
+    if columns is None:
+        columns = _split_columns(line)
+    if sum(1 for value in columns if value) < 2:
+        return None
+    return ParsedRow(page=page, raw=dict(zip(header, columns)), header=header)
+
+
+def iter_statement_rows(pages: Iterable[PDFPage], fixed_width: bool = True) -> Iterator[ParsedRow]:
+    """Yield parsed rows page by page.
+
+    The most recent header is carried across pages so continuation pages
+    without a repeated header still parse. A row is held back until the next
+    row starts, because wrapped description lines extend the previous row.
+    With ``fixed_width`` data lines are sliced at the header's column offsets
+    and only lines that do not fit the layout use the whitespace split.
+    """
+
+    layout: Optional[HeaderLayout] = None
+    header: Tuple[str, ...] = ()
+    pending: Optional[ParsedRow] = None
+    for page in pages:
+        lines = _page_lines(page)
         header_idx = find_header(lines)
-        if header_idx is None:
+        if header_idx is not None:
+            layout = HeaderLayout.from_line(lines[header_idx])
+            header = tuple(layout.tokens)
+            body = lines[header_idx + 1 :]
+        elif layout is not None:
+            body = lines
+        else:
             continue
-        header_tokens = _split_columns(lines[header_idx])
-        for line in lines[header_idx + 1 :]:
-            if not DATE_RE.search(line) and not any(token.lower() in line.lower() for token in ("balance", "total")):
-                if rows:
-                    rows[-1].raw["Description"] = f"{rows[-1].raw.get('Description', '')} {line.strip()}".strip()
+        for line in body:
+            row = _parse_line(line, layout, header, pending, page.number, fixed_width)
+            if row is None:
                 continue
-            columns = _split_columns(line)
-            if len(columns) < 2:
-                continue
-            raw_map: Dict[str, str] = {}
-            for idx, token in enumerate(header_tokens):
-                if idx < len(columns):
-                    raw_map[token] = columns[idx]
-            rows.append(ParsedRow(page=page_num, raw=raw_map))
-    return rows
-
-
-def parse_date(value: str) -> Optional[datetime]:
-    try:
-        from dateparser import parse as parse_dateparser
-    except ImportError:  # pragma: no cover - optional dependency
-        return None
-    dt = parse_dateparser(value, settings={"DATE_ORDER": "DMY", "PREFER_DAY_OF_MONTH": "first"})
-    return dt
+            if pending is not None:
+                yield pending
+            pending = row
+    if pending is not None:
+        yield pending
+
+
+def parse_statement_rows(statement: PDFStatement) -> List[ParsedRow]:
+    return list(iter_statement_rows(statement.pages))
 
 
-__all__ = ["ParsedRow", "parse_statement_rows", "parse_date"]
+__all__ = ["ParsedRow", "HeaderLayout", "iter_statement_rows", "parse_statement_rows", "parse_date", "parse_dates"]
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
+import logging
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from time import perf_counter
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple
 
-@dataclass
+from .ocr_fallback import ocr_available, ocr_blank_pages
+
+logger = logging.getLogger(__name__)
+
+PAGE_BREAK = "\f"
+PARALLEL_MIN_PAGES = int(os.environ.get("BANKNORM_PARALLEL_MIN_PAGES", "24"))
+PAGES_PER_TASK = int(os.environ.get("BANKNORM_PAGES_PER_TASK", "8"))
+
+
+def _default_workers() -> int:
+    configured = int(os.environ.get("BANKNORM_PDF_WORKERS", "0"))
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+@dataclass(slots=True)
 class PDFPage:
     number: int
     text: str
+    elapsed: float = 0.0
 
 
 @dataclass
@@ -19,8 +39,139 @@ class PDFStatement:
     def combined_text(self) -> str:
         return "\n".join(page.text for page in self.pages)
 
+    @property
+    def extraction_seconds(self) -> float:
+        return sum(page.elapsed for page in self.pages)
+
+
+def _iter_text_pages(path: Path) -> Iterator[PDFPage]:
+    """Yield pages from a text export, splitting on form feeds like ``pdftotext``."""
+
+    number = 1
+    buffer: List[str] = []
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            while PAGE_BREAK in line:
+                head, line = line.split(PAGE_BREAK, 1)
+                buffer.append(head)
+                yield PDFPage(number=number, text="".join(buffer))
+                number += 1
+                buffer = []
+            buffer.append(line)
+    text = "".join(buffer)
+    if text.strip() or number == 1:
+        yield PDFPage(number=number, text=text)
+
+
+def _extract_text(page: Any) -> str:  # pragma: no cover - requires pdfplumber
+    if page.rotation and page.rotation % 360 != 0:
+        page = page.rotate(360 - page.rotation)
+    return page.extract_text(x_tolerance=2, y_tolerance=2) or ""
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[Tuple[int, str, float]]:  # pragma: no cover - requires pdfplumber
+    """Extract ``pages[start:stop]`` in a worker process."""
+
+    import pdfplumber  # type: ignore
+
+    extracted: List[Tuple[int, str, float]] = []
+    with pdfplumber.open(path) as pdf:
+        for index in range(start, stop):
+            page = pdf.pages[index]
+            began = perf_counter()
+            text = _extract_text(page)
+            extracted.append((page.page_number, text, perf_counter() - began))
+            page.flush_cache()
+    return extracted
+
+
+def _executor(workers: int) -> Executor:
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _iter_parallel(path: Path, page_count: int, workers: int) -> Iterator[PDFPage]:
+    """Fan page ranges out to a process pool and yield pages in document order.
+
+    At most ``workers * 2`` ranges are in flight so memory stays bounded when
+    the consumer is slower than extraction.
+    """
 
-def read_pdf(path: Path | str) -> PDFStatement:
+    ranges = [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+    pending: Deque[Future] = deque()
+    with _executor(workers) as pool:
+        for start, stop in ranges:
+            pending.append(pool.submit(_extract_page_range, str(path), start, stop))
+            if len(pending) < workers * 2:
+                continue
+            yield from _drain(pending.popleft())
+        while pending:
+            yield from _drain(pending.popleft())
+
+
+def _drain(future: Future) -> Iterator[PDFPage]:
+    for number, text, elapsed in future.result():
+        logger.debug("extracted page %d in %.3fs", number, elapsed)
+        yield PDFPage(number=number, text=text, elapsed=elapsed)
+
+
+def _page_count(pdf_path: Path) -> int:  # pragma: no cover - requires pdfplumber
+    import pdfplumber  # type: ignore
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def _iter_serial(pdf_path: Path) -> Iterator[PDFPage]:  # pragma: no cover - requires pdfplumber
+    import pdfplumber  # type: ignore
+
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            began = perf_counter()
+            text = _extract_text(page)
+            elapsed = perf_counter() - began
+            page.flush_cache()
+            logger.debug("extracted page %d in %.3fs", page.page_number, elapsed)
+            yield PDFPage(number=page.page_number, text=text, elapsed=elapsed)
+
+
+def _iter_pdfplumber_pages(pdf_path: Path, workers: int) -> Iterator[PDFPage]:
+    page_count = _page_count(pdf_path)
+    if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+        logger.debug("extracting %d pages from %s on %d workers", page_count, pdf_path, workers)
+        return _iter_parallel(pdf_path, page_count, workers)
+    return _iter_serial(pdf_path)
+
+
+def iter_pdf_pages(
+    path: Path | str, workers: Optional[int] = None, ocr: bool = True, digest: Optional[str] = None
+) -> Iterator[PDFPage]:
+    """Yield statement pages one at a time.
+
+    Only the page currently being processed is held in memory, so callers that
+    consume the iterator incrementally use flat memory regardless of page count.
+    Documents with at least ``PARALLEL_MIN_PAGES`` pages are extracted on a
+    process pool of ``workers`` processes (``BANKNORM_PDF_WORKERS`` or the CPU
+    count by default); ``workers=1`` forces serial extraction. When ``ocr`` is
+    set and the OCR extras are installed, pages that come back without text
+    are OCRed individually; the file's SHA-256 ``digest``, when the caller
+    already has it, lets re-reads reuse cached OCR text without rasterising.
+    """
+
+    pdf_path = Path(path)
+    try:  # pragma: no cover - optional dependency
+        import pdfplumber  # type: ignore  # noqa: F401
+    except Exception:
+        yield from _iter_text_pages(pdf_path)
+        return
+    pages = _iter_pdfplumber_pages(pdf_path, workers or _default_workers())  # pragma: no cover
+    if ocr and ocr_available():  # pragma: no cover
+        pages = ocr_blank_pages(pdf_path, pages, digest=digest)
+    yield from pages  # pragma: no cover
+
+
+def read_pdf(
+    path: Path | str, workers: Optional[int] = None, ocr: bool = True, digest: Optional[str] = None
+) -> PDFStatement:
     """Read a statement file and return text per page.
 
     The implementation favours plain-text inputs to keep the test environment
@@ -29,20 +180,7 @@ def read_pdf(path: Path | str) -> PDFStatement:
     """
 
     pdf_path = Path(path)
-    pages: List[PDFPage] = []
-    try:  # pragma: no cover - optional dependency
-        import pdfplumber  # type: ignore
-    except Exception:
-        text = pdf_path.read_text(encoding="utf-8")
-        pages.append(PDFPage(number=1, text=text))
-    else:  # pragma: no cover - dependency not available in tests
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                if page.rotation and page.rotation % 360 != 0:
-                    page = page.rotate(360 - page.rotation)
-                text = page.extract_text(x_tolerance=2, y_tolerance=2) or ""
-                pages.append(PDFPage(number=page.page_number, text=text))
-    return PDFStatement(path=pdf_path, pages=pages)
+    return PDFStatement(path=pdf_path, pages=list(iter_pdf_pages(pdf_path, workers=workers, ocr=ocr, digest=digest)))
 
 
 def iter_lines(statement: PDFStatement) -> Iterable[tuple[int, str]]:
@@ -53,4 +191,4 @@ def iter_lines(statement: PDFStatement) -> Iterable[tuple[int, str]]:
                 yield page.number, cleaned
 
 
-__all__ = ["read_pdf", "PDFStatement", "iter_lines"]
+__all__ = ["read_pdf", "iter_pdf_pages", "PDFStatement", "PDFPage", "iter_lines"]
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from array import array
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+from .models import Transaction
+
+# Keep each row's raw source columns on frames built by the pipeline; set
+# BANKNORM_KEEP_RAW=0 to drop them when the source rows are not needed.
+KEEP_RAW = os.environ.get("BANKNORM_KEEP_RAW", "1") != "0"
+
+
+def to_cents(value: Optional[float]) -> Optional[int]:
+    return None if value is None else int(round(value * 100))
+
+
+def format_cents(cents: int) -> str:
+    """Render cents as a fixed two-decimal string without going through float."""
+
+    whole, frac = divmod(abs(cents), 100)
+    return f"{'-' if cents < 0 else ''}{whole}.{frac:02d}"
+
+
+class DictionaryColumn:
+    """String column storing each distinct value once plus a code per row."""
+
+    def __init__(self, values: Iterable[Optional[str]] = ()) -> None:
+        self.values: List[Optional[str]] = [None]
+        self._lookup: Dict[Optional[str], int] = {None: 0}
+        self.codes = array("i")
+        for value in values:
+            self.append(value)
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._lookup[value] = code
+        return code
+
+    def append(self, value: Optional[str]) -> None:
+        self.codes.append(self.encode(value))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[self.codes[index]]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+
+class CentsColumn:
+    """Nullable int64 cents column: values plus a presence mask."""
+
+    def __init__(self) -> None:
+        self.values = array("q")
+        self.mask = bytearray()
+
+    def append(self, cents: Optional[int]) -> None:
+        self.values.append(cents or 0)
+        self.mask.append(cents is not None)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Optional[int]:
+        return self.values[index] if self.mask[index] else None
+
+    def __iter__(self) -> Iterator[Optional[int]]:
+        return (value if present else None for value, present in zip(self.values, self.mask))
+
+
+class RawColumn:
+    """Raw source rows as a value tuple per row against a shared header.
+
+    Statements repeat one or two headers for every row, so each distinct key
+    tuple is stored once and rows only hold their values; the dict is rebuilt
+    on access.
+    """
+
+    def __init__(self) -> None:
+        self.headers: List[Tuple[str, ...]] = []
+        self._lookup: Dict[Tuple[str, ...], int] = {}
+        self.codes = array("i")
+        self.values: List[Tuple[Any, ...]] = []
+
+    def append(self, raw: Optional[Dict[str, Any]]) -> None:
+        raw = raw or {}
+        keys = tuple(raw)
+        code = self._lookup.get(keys)
+        if code is None:
+            code = self._lookup[keys] = len(self.headers)
+            self.headers.append(keys)
+        self.codes.append(code)
+        self.values.append(tuple(raw.values()))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return dict(zip(self.headers[self.codes[index]], self.values[index]))
+
+
+class TransactionFrame(Sequence):
+    """Columnar store of normalized transactions.
+
+    Dates are day ordinals, money columns are int64 cents and the merchant,
+    category, account and bank columns are dictionary-encoded, so a row costs
+    a few dozen bytes plus its description. The frame is a read-only sequence
+    of :class:`Transaction`; those objects are only built when indexed or
+    iterated, while the pipeline stages read the columns directly. Raw source
+    rows are kept in a :class:`RawColumn` unless ``keep_raw`` is false.
+    """
+
+    def __init__(self, keep_raw: bool = True) -> None:
+        self.ordinals = array("i")
+        self.descriptions: List[str] = []
+        self.amounts = array("q")
+        self.debits = CentsColumn()
+        self.credits = CentsColumn()
+        self.balances = CentsColumn()
+        self.pages = array("i")
+        self.merchants = DictionaryColumn()
+        self.categories = DictionaryColumn()
+        self.accounts = DictionaryColumn()
+        self.banks = DictionaryColumn()
+        self.keep_raw = keep_raw
+        self._raw = RawColumn()
+        self._ids: Optional[List[str]] = None
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionFrame":
+        if isinstance(transactions, TransactionFrame):
+            return transactions
+        frame = cls(keep_raw=True)
+        for txn in transactions:
+            frame.append(
+                txn.date.toordinal(),
+                txn.description,
+                to_cents(txn.amount),  # type: ignore[arg-type]
+                debit=to_cents(txn.debit),
+                credit=to_cents(txn.credit),
+                balance=to_cents(txn.balance),
+                merchant=txn.merchant,
+                category=txn.category,
+                account=txn.account,
+                bank=txn.bank,
+                page=txn.page,
+                raw=txn.raw,
+                id=txn.id,
+            )
+        return frame
+
+    def append(
+        self,
+        ordinal: int,
+        description: str,
+        amount: int,
+        *,
+        debit: Optional[int] = None,
+        credit: Optional[int] = None,
+        balance: Optional[int] = None,
+        merchant: Optional[str] = None,
+        category: Optional[str] = None,
+        account: Optional[str] = None,
+        bank: str = "",
+        page: Optional[int] = None,
+        raw: Optional[Dict[str, Any]] = None,
+        id: Optional[str] = None,
+    ) -> None:
+        if id is not None and self._ids is None:
+            self._ids = [self.id(index) for index in range(len(self))]
+        self.ordinals.append(ordinal)
+        self.descriptions.append(description)
+        self.amounts.append(amount)
+        self.debits.append(debit)
+        self.credits.append(credit)
+        self.balances.append(balance)
+        self.pages.append(page or 0)
+        self.merchants.append(merchant)
+        self.categories.append(category)
+        self.accounts.append(account)
+        self.banks.append(bank)
+        if self.keep_raw:
+            self._raw.append(raw)
+        if self._ids is not None:
+            self._ids.append(id if id is not None else self.id(len(self) - 1))
+
+    def take(self, indices: Iterable[int]) -> "TransactionFrame":
+        """Return a new frame holding the given rows; row IDs are preserved."""
+
+        frame = TransactionFrame(keep_raw=self.keep_raw)
+        for index in indices:
+            frame.append(
+                self.ordinals[index],
+                self.descriptions[index],
+                self.amounts[index],
+                debit=self.debits[index],
+                credit=self.credits[index],
+                balance=self.balances[index],
+                merchant=self.merchants[index],
+                category=self.categories[index],
+                account=self.accounts[index],
+                bank=self.banks[index] or "",
+                page=self.pages[index],
+                raw=self._raw[index] if self.keep_raw else None,
+                id=self.id(index),
+            )
+        return frame
+
+    def set_categories(self, categories: Iterable[Optional[str]]) -> None:
+        self.categories = DictionaryColumn(categories)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def id(self, index: int) -> str:
+        if self._ids is not None:
+            return self._ids[index]
+        source = (
+            f"{self.banks[index]}-{self.pages[index] or None}-{index}-{self.descriptions[index]}"
+            f"-{self.amounts[index] / 100}-{self.date(index).isoformat()}"
+        )
+        return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+    def date(self, index: int) -> datetime:
+        return datetime.fromordinal(self.ordinals[index])
+
+    def transaction(self, index: int) -> Transaction:
+        debit, credit, balance = self.debits[index], self.credits[index], self.balances[index]
+        return Transaction.from_trusted(
+            id=self.id(index),
+            date=self.date(index),
+            description=self.descriptions[index],
+            merchant=self.merchants[index],
+            debit=debit / 100 if debit is not None else None,
+            credit=credit / 100 if credit is not None else None,
+            amount=self.amounts[index] / 100,
+            balance=balance / 100 if balance is not None else None,
+            category=self.categories[index],
+            account=self.accounts[index],
+            bank=self.banks[index] or "",
+            page=self.pages[index] or None,
+            raw=self._raw[index] if self.keep_raw else {},
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Transaction]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Transaction, List[Transaction]]:
+        if isinstance(index, slice):
+            return [self.transaction(position) for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return self.transaction(index)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return (self.transaction(index) for index in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"TransactionFrame(rows={len(self)})"
+
+
+__all__ = ["TransactionFrame", "DictionaryColumn", "CentsColumn", "RawColumn", "format_cents", "to_cents"]
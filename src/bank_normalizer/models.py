@@ -1,9 +1,39 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .frame import TransactionFrame
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _construct(model: Type[M], values: Dict[str, Any]) -> M:
+    """Build ``model`` from already-validated values without field resolution."""
+
+    construct = getattr(model, "model_construct", None)
+    if construct is not None:  # pragma: no cover - pydantic proper
+        return construct(**values)
+    instance = object.__new__(model)
+    # Per-attribute assignment in field order keeps CPython's compact shared-key
+    # instance layout, which a bulk ``__dict__.update`` would give up.
+    for name, value in values.items():
+        setattr(instance, name, value)
+    return instance
 
 
 class Transaction(BaseModel):
@@ -25,6 +55,56 @@ class Transaction(BaseModel):
 
     model_config = dict(frozen=True)
 
+    @classmethod
+    def from_trusted(
+        cls,
+        id: str,
+        date: datetime,
+        description: str,
+        amount: float,
+        bank: str,
+        merchant: Optional[str] = None,
+        debit: Optional[float] = None,
+        credit: Optional[float] = None,
+        balance: Optional[float] = None,
+        category: Optional[str] = None,
+        account: Optional[str] = None,
+        page: Optional[int] = None,
+        raw: Optional[Dict[str, Any]] = None,
+    ) -> "Transaction":
+        """Construct from values the pipeline has already validated.
+
+        Skips the generic per-field resolution of ``__init__``; callers are
+        responsible for passing correctly typed values.
+        """
+
+        return _construct(
+            cls,
+            {
+                "id": id,
+                "date": date,
+                "description": description,
+                "merchant": merchant,
+                "debit": debit,
+                "credit": credit,
+                "amount": amount,
+                "balance": balance,
+                "category": category,
+                "account": account,
+                "bank": bank,
+                "page": page,
+                "raw": raw if raw is not None else {},
+            },
+        )
+
+    @classmethod
+    def build_many(cls, columns: Mapping[str, Iterable[Any]]) -> List["Transaction"]:
+        """Build one trusted transaction per row of equally long field columns."""
+
+        names = list(columns)
+        build = cls.from_trusted
+        return [build(**dict(zip(names, values))) for values in zip(*columns.values())]
+
 
 class StatementMeta(BaseModel):
     """Metadata for a processed statement."""
@@ -39,22 +119,49 @@ class StatementMeta(BaseModel):
 
 
 class ResultBundle(BaseModel):
-    """Bundle returned from normalization."""
+    """Bundle returned from normalization.
+
+    Transactions are held as a :class:`~bank_normalizer.frame.TransactionFrame`
+    in a private attribute, so validation never copies or converts them;
+    :attr:`transactions` builds :class:`Transaction` objects only as they are
+    accessed, and :meth:`model_dump` includes them like a declared field.
+    """
 
     meta: StatementMeta
-    transactions: List[Transaction]
     liabilities: Dict[str, Any]
     summary: Dict[str, Any]
 
+    _frame: "TransactionFrame" = PrivateAttr()
+
+    def __init__(self, *, transactions: Iterable[Transaction] = (), **data: Any) -> None:
+        from .frame import TransactionFrame
+
+        super().__init__(**data)
+        self._frame = TransactionFrame.from_transactions(transactions)
+
+    @property
+    def transactions(self) -> Sequence[Transaction]:
+        return self._frame
+
+    @property
+    def frame(self) -> "TransactionFrame":
+        return self._frame
+
+    def model_dump(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        data = super().model_dump(*args, **kwargs)
+        data["transactions"] = [txn.model_dump(*args, **kwargs) for txn in self._frame]
+        return data
+
     def to_json(self) -> str:
+        data = self.model_dump(mode="json")
         try:
             import orjson
         except Exception:  # pragma: no cover - optional dependency
             import json
 
-            return json.dumps(self.model_dump(mode="json"), default=str)
+            return json.dumps(data, default=str)
         else:
-            return orjson.dumps(self.model_dump(mode="json"), option=orjson.OPT_INDENT_2).decode()
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
 
 
 __all__ = ["Transaction", "StatementMeta", "ResultBundle"]
@@ -1,7 +1,9 @@
 """Normalization pipeline."""
 
-from .rules_engine import NormalizedRow, normalize_rows
+from .rules_engine import NormalizedRow, normalize_frame, normalize_rows
 from .recurring import detect_recurring
+from .recurring_state import RecurringStore
 from .categorizer import Categorizer
+from .dedup import DedupIndex
 
-__all__ = ["normalize_rows", "NormalizedRow", "detect_recurring", "Categorizer"]
+__all__ = ["normalize_frame", "normalize_rows", "NormalizedRow", "detect_recurring", "Categorizer", "DedupIndex", "RecurringStore"]
@@ -1,9 +1,16 @@
 """Bank profile registry."""
 
+import os
+from collections.abc import Mapping
+from dataclasses import is_dataclass, replace
 from importlib import import_module
-from typing import Dict, Iterable, List, Optional, Protocol
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
 
 from ...extract.pdf_reader import PDFStatement
+from ..matching import KeywordAutomaton
+
+# Characters from the start of the statement scanned for bank markers.
+DETECT_CHARS = int(os.environ.get("BANKNORM_DETECT_KB", "8")) * 1024
 
 
 class BankProfile(Protocol):
@@ -25,6 +32,15 @@ def load_bank_profiles(config: Iterable[Dict[str, object]]) -> List[BankProfile]
         module_name = entry["module"]  # type: ignore[index]
         module = import_module(str(module_name))
         profile = getattr(module, "PROFILE")
+        columns = entry.get("columns")
+        extra: Dict[str, str] = {}
+        if isinstance(columns, Mapping):
+            extra = {str(header): str(field) for header, field in columns.items()}
+        elif columns:
+            raise ValueError(f"columns for bank module {module_name} must be a mapping of header to field")
+        if extra and is_dataclass(profile) and hasattr(profile, "mapping"):
+            # Extra header names from config extend the module's column map.
+            profile = replace(profile, mapping={**profile.column_map(), **extra})
         profiles.append(profile)
     return profiles
 
@@ -40,4 +56,53 @@ def select_bank_profile(statement: PDFStatement, profiles: Iterable[BankProfile]
     return best_profile
 
 
-__all__ = ["BankProfile", "load_bank_profiles", "select_bank_profile"]
+class BankDetector:
+    """Score every bank profile in one pass over the start of a statement.
+
+    Detection patterns come from each ``banks.yaml`` entry (falling back to the
+    profile's own keywords) and are compiled into a single automaton. A
+    profile scores the share of its patterns found, as
+    :meth:`SimpleBankProfile.detect` does, but only the first
+    :data:`DETECT_CHARS` characters are scanned, once for all profiles. The
+    whole window is always scanned, so ties go to the first profile in
+    config order, as in :func:`select_bank_profile`.
+    """
+
+    def __init__(self, profiles: Sequence[BankProfile], patterns: Sequence[Sequence[str]]) -> None:
+        self.profiles = list(profiles)
+        self._sizes = [max(len(entry), 1) for entry in patterns]
+        self._automaton: KeywordAutomaton[Tuple[int, int]] = KeywordAutomaton(
+            (pattern.upper(), (index, position))
+            for index, entry in enumerate(patterns)
+            for position, pattern in enumerate(entry)
+        )
+
+    @classmethod
+    def from_config(cls, config: Iterable[Dict[str, object]]) -> "BankDetector":
+        entries = list(config)
+        profiles = load_bank_profiles(entries)
+        patterns = []
+        for entry, profile in zip(entries, profiles):
+            configured = entry.get("patterns") if isinstance(entry, Mapping) else None
+            found: Sequence[object] = configured if isinstance(configured, (list, tuple)) else ()
+            patterns.append([str(pattern) for pattern in found or getattr(profile, "keywords", ())])
+        return cls(profiles, patterns)
+
+    def scores(self, text: str) -> List[float]:
+        found: List[Set[int]] = [set() for _ in self.profiles]
+        for _end, (index, position) in self._automaton.iter_matches(text[:DETECT_CHARS].upper()):
+            found[index].add(position)
+        return [len(hits) / size for hits, size in zip(found, self._sizes)]
+
+    def select(self, statement: PDFStatement) -> Optional[BankProfile]:
+        text = statement.pages[0].text if statement.pages else ""
+        best_score = 0.0
+        best_profile: Optional[BankProfile] = None
+        for profile, score in zip(self.profiles, self.scores(text)):
+            if score > best_score:
+                best_score = score
+                best_profile = profile
+        return best_profile
+
+
+__all__ = ["BankDetector", "BankProfile", "load_bank_profiles", "select_bank_profile"]
@@ -1,27 +1,172 @@
 from __future__ import annotations
 
+import os
 import re
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
 
 import yaml
 
+from .matching import KeywordAutomaton
+from .memo import CacheStats, LRUCache, normalize_description
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+# Backreferences and named groups that would point at the wrong group, or
+# collide, once a rule is wrapped into the shared alternation.
+_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?P[<=]")
+
+CACHE_SIZE = int(os.environ.get("BANKNORM_CATEGORY_CACHE", "65536"))
+# Seconds between checks of the config file for changes.
+RELOAD_INTERVAL = 2.0
+
+_Signature = Tuple[int, int]
+
+
+def _is_literal(entry: str) -> bool:
+    return not _REGEX_META.intersection(entry)
+
+
+def _signature(path: Path) -> _Signature:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+@dataclass(frozen=True)
+class _Rules:
+    categories: List[str]
+    literals: KeywordAutomaton[int]
+    regex: Optional[re.Pattern[str]]
+    cache: LRUCache[str, Optional[str]]
+    # (rank, pattern) for rules that must be matched on their own, by rank.
+    separate: Tuple[Tuple[int, re.Pattern[str]], ...] = ()
+
+    def match(self, key: str) -> Optional[str]:
+        best: Optional[int] = None
+        for _end, rank in self.literals.iter_matches(key):
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        if self.regex is not None and best != 0:
+            for match in self.regex.finditer(key):
+                rank = int(match.lastgroup[1:])  # type: ignore[index]
+                if best is None or rank < best:
+                    best = rank
+        for rank, pattern in self.separate:
+            if best is not None and rank >= best:
+                break
+            if pattern.search(key):
+                best = rank
+                break
+        return self.categories[best] if best is not None else None
+
 
 class Categorizer:
-    def __init__(self, path: Path) -> None:
-        with path.open("r", encoding="utf-8") as fh:
+    """Assign the first matching category from ``categories.yaml``.
+
+    All rules are compiled into two matchers that each scan a description
+    once: literal keywords share an Aho-Corasick automaton and real regexes
+    share one alternation with a named group per category. Categories keep
+    their file order as precedence, so the lowest-ranked hit from either
+    matcher wins. Regexes with backreferences or named groups cannot share
+    the alternation and are tried one by one, only while they could still
+    beat the best hit so far.
+
+    Results are memoized per normalized description in an LRU cache shared by
+    every categorizer built from the same version of the file, so repeated
+    descriptions are resolved once per process. The file is re-checked every
+    :data:`RELOAD_INTERVAL` seconds; when it changes the rules are recompiled
+    against a fresh cache, and categorizers still on the old rules keep
+    writing to the old one, so results from different rule sets never mix.
+    """
+
+    _shared: ClassVar[Dict[Path, Tuple[_Signature, LRUCache[str, Optional[str]]]]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path, cache_size: int = CACHE_SIZE) -> None:
+        self.path = Path(path).resolve()
+        self._cache_size = cache_size
+        self._reload_lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        signature = _signature(self.path)
+        with self.path.open("r", encoding="utf-8") as fh:
             data = yaml.safe_load(fh) or {}
-        self.patterns: Dict[str, list[re.Pattern[str]]] = {}
-        for category, entries in (data.get("categories") or {}).items():
-            compiled = [re.compile(entry, re.IGNORECASE) for entry in entries]
-            self.patterns[category] = compiled
+        categories: List[str] = []
+        literals: List[tuple[str, int]] = []
+        regex_groups: List[str] = []
+        separate: List[Tuple[int, re.Pattern[str]]] = []
+        for rank, (category, entries) in enumerate((data.get("categories") or {}).items()):
+            categories.append(category)
+            expressions = []
+            for entry in entries:
+                if _is_literal(entry):
+                    literals.append((entry.upper(), rank))
+                elif _GROUP_REFERENCE_RE.search(entry):
+                    separate.append((rank, re.compile(entry, re.IGNORECASE)))
+                else:
+                    expressions.append(f"(?:{entry})")
+            if expressions:
+                regex_groups.append(f"(?P<c{rank}>{'|'.join(expressions)})")
+        regex: Optional[re.Pattern[str]] = None
+        if regex_groups:
+            # The lookahead reports the best-ranked rule starting at every
+            # position, not just the leftmost non-overlapping match.
+            regex = re.compile(f"(?=(?:{'|'.join(regex_groups)}))", re.IGNORECASE)
+        self.categories = categories
+        # Swapped as one object so concurrent lookups never mix old and new
+        # rules, or cache entries computed under them.
+        self._rules = _Rules(
+            categories, KeywordAutomaton(literals), regex, self._shared_cache(signature), tuple(separate)
+        )
+        self._signature = signature
+        self._checked_at = time.monotonic()
+
+    @property
+    def cache(self) -> LRUCache[str, Optional[str]]:
+        return self._rules.cache
+
+    def _shared_cache(self, signature: _Signature) -> LRUCache[str, Optional[str]]:
+        with self._shared_lock:
+            entry = self._shared.get(self.path)
+            if entry is None or entry[0] != signature or entry[1].maxsize != self._cache_size:
+                entry = (signature, LRUCache(self._cache_size))
+                self._shared[self.path] = entry
+            return entry[1]
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload rules if the config file changed; return ``True`` on reload."""
+
+        now = time.monotonic()
+        if not force and now - self._checked_at < RELOAD_INTERVAL:
+            return False
+        with self._reload_lock:
+            self._checked_at = now
+            try:
+                changed = _signature(self.path) != self._signature
+            except FileNotFoundError:
+                return False
+            if changed:
+                self._load()
+            return changed
 
     def categorize(self, description: str) -> Optional[str]:
-        for category, patterns in self.patterns.items():
-            for pattern in patterns:
-                if pattern.search(description):
-                    return category
-        return None
+        self.refresh()
+        rules = self._rules
+        return rules.cache.get_or_compute(normalize_description(description), rules.match)
+
+    def categorize_many(self, descriptions: Iterable[str]) -> List[Optional[str]]:
+        self.refresh()
+        rules = self._rules
+        cache, lookup = rules.cache, rules.match
+        return [cache.get_or_compute(normalize_description(description), lookup) for description in descriptions]
+
+    def cache_stats(self) -> CacheStats:
+        return self.cache.stats()
 
 
 __all__ = ["Categorizer"]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+from .memo import LRUCache
+
+FIELDS = ("date", "description", "debit", "credit", "balance", "amount")
+
+# Header names recognised for every bank, after the profile's own column map.
+DEFAULT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "date": ("Date", "Transaction Date"),
+    "description": ("Description", "Details"),
+    "debit": ("Debit", "Withdrawal", "Withdrawals"),
+    "credit": ("Credit", "Deposit", "Deposits"),
+    "balance": ("Balance",),
+    "amount": ("Amount",),
+}
+
+PLAN_CACHE_SIZE = 256
+
+Header = Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """Header column resolved for each canonical field, or ``None`` if absent."""
+
+    date: Optional[str]
+    description: Optional[str]
+    debit: Optional[str]
+    credit: Optional[str]
+    balance: Optional[str]
+    amount: Optional[str]
+
+    @classmethod
+    def compile(cls, header: Sequence[str], column_map: Mapping[str, str]) -> "ColumnPlan":
+        """Resolve fields against ``header`` using ``column_map`` then the defaults.
+
+        Header names match case-insensitively; the first candidate present in
+        the header wins.
+        """
+
+        present = {name.lower(): name for name in reversed(header)}
+        candidates: Dict[str, list[str]] = {name: [] for name in FIELDS}
+        for column, canonical in column_map.items():
+            if canonical in candidates:
+                candidates[canonical].append(column)
+        for canonical, aliases in DEFAULT_ALIASES.items():
+            candidates[canonical].extend(aliases)
+        resolved = {
+            canonical: next((present[name.lower()] for name in names if name.lower() in present), None)
+            for canonical, names in candidates.items()
+        }
+        return cls(**resolved)
+
+
+_plans: LRUCache[Tuple[Tuple[Tuple[str, str], ...], Header], ColumnPlan] = LRUCache(PLAN_CACHE_SIZE)
+
+
+def column_plan(header: Header, column_map: Mapping[str, str]) -> ColumnPlan:
+    """Return the cached plan for a header layout under a profile's column map."""
+
+    key = (tuple(column_map.items()), header)
+    return _plans.get_or_compute(key, lambda key: ColumnPlan.compile(key[1], dict(key[0])))
+
+
+__all__ = ["ColumnPlan", "DEFAULT_ALIASES", "column_plan"]
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..frame import TransactionFrame
+from .memo import normalize_description
+
+# Persist fingerprints across runs when set; in-memory per batch otherwise.
+DEDUP_DB = os.environ.get("BANKNORM_DEDUP_DB") or None
+# Fingerprints per sqlite ``IN (...)`` lookup; stays under the variable limit.
+LOOKUP_CHUNK = 500
+
+_Key = Tuple[str, int, int, str, Optional[int]]
+
+
+def _base_keys(frame: TransactionFrame, scope: str) -> List[_Key]:
+    return [
+        (f"{bank or ''}:{account or scope}", ordinal, cents, normalize_description(description), balance)
+        for bank, account, ordinal, cents, description, balance in zip(
+            frame.banks, frame.accounts, frame.ordinals, frame.amounts, frame.descriptions, frame.balances
+        )
+    ]
+
+
+def fingerprints(frame: TransactionFrame, scope: Optional[str] = None) -> List[bytes]:
+    """Content fingerprint for every row of ``frame``.
+
+    A fingerprint covers the account, date, amount, normalized description
+    and running balance, so the same transaction printed on two statements
+    hashes identically regardless of page or position. Rows without an
+    account are keyed on ``scope`` (the statement's content hash) instead,
+    so rows from different accounts are never taken for one another.
+    Identical rows within one statement (same day, amount and description,
+    no balance) are told apart by their occurrence number.
+    """
+
+    seen: Counter[_Key] = Counter()
+    result: List[bytes] = []
+    for key in _base_keys(frame, f"#{scope}" if scope else ""):
+        occurrence = seen[key]
+        seen[key] += 1
+        payload = "\x1f".join(str(part) for part in (*key, occurrence))
+        result.append(hashlib.blake2b(payload.encode(), digest_size=12).digest())
+    return result
+
+
+class DedupIndex:
+    """Hash index of transaction fingerprints seen so far.
+
+    :meth:`deduplicate` drops rows already contributed by an earlier
+    statement in O(rows) and reports which statements they overlapped with.
+    Without a ``path`` the index lives in memory for one batch; with one it
+    is kept in SQLite, so statements uploaded in earlier runs are recognised
+    too. A SQLite-backed index can be shared with worker processes: it
+    pickles as its path, and each check-and-record runs in one write
+    transaction, so concurrent statements never both keep the same row.
+    """
+
+    def __init__(self, path: Optional[Path | str] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._seen: Dict[bytes, str] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    fingerprint BLOB PRIMARY KEY,
+                    source TEXT
+                ) WITHOUT ROWID
+                """
+            )
+
+    def __getstate__(self) -> Dict[str, Optional[Path]]:
+        if self.path is None:
+            raise TypeError("only a SQLite-backed DedupIndex can be shared across processes")
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict[str, Optional[Path]]) -> None:
+        self.__init__(state["path"])  # type: ignore[misc]
+
+    def _previous(self, keys: List[bytes]) -> Dict[bytes, str]:
+        if self._conn is None:
+            seen = self._seen
+            return {key: seen[key] for key in keys if key in seen}
+        found: Dict[bytes, str] = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start : start + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cur = self._conn.execute(
+                f"SELECT fingerprint, source FROM fingerprints WHERE fingerprint IN ({placeholders})",  # noqa: S608
+                chunk,
+            )
+            found.update(cur.fetchall())
+        return found
+
+    def _record(self, entries: List[Tuple[bytes, str]]) -> None:
+        if self._conn is None:
+            self._seen.update(entries)
+            return
+        self._conn.executemany("INSERT OR IGNORE INTO fingerprints (fingerprint, source) VALUES (?, ?)", entries)
+
+    def deduplicate(
+        self, frame: TransactionFrame, source: str, scope: Optional[str] = None
+    ) -> Tuple[TransactionFrame, List[str]]:
+        """Return ``frame`` without previously seen rows, plus overlap warnings.
+
+        ``scope`` stands in for the account of rows that have none; see
+        :func:`fingerprints`.
+        """
+
+        keys = fingerprints(frame, scope)
+        keep: List[int] = []
+        overlaps: Counter[str] = Counter()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                previous = self._previous(keys)
+                for index, key in enumerate(keys):
+                    earlier = previous.get(key)
+                    if earlier is None:
+                        keep.append(index)
+                    else:
+                        overlaps[earlier] += 1
+                self._record([(keys[index], source) for index in keep])
+            except BaseException:
+                if self._conn is not None:
+                    self._conn.execute("ROLLBACK")
+                raise
+            if self._conn is not None:
+                self._conn.execute("COMMIT")
+        warnings = [
+            f"{count} transaction(s) overlap with {earlier} and were skipped as duplicates"
+            for earlier, count in overlaps.items()
+        ]
+        if not overlaps:
+            return frame, warnings
+        return frame.take(keep), warnings
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+__all__ = ["DEDUP_DB", "DedupIndex", "fingerprints"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Dict, Generic, Iterable, Iterator, List, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class KeywordAutomaton(Generic[T]):
+    """Aho-Corasick automaton for finding many literal keywords in one scan.
+
+    Each keyword carries a payload that is reported whenever the keyword
+    occurs, including overlapping occurrences. Matching is exact, so callers
+    that want case-insensitive matching upper-case both the keywords and the
+    scanned text.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, T]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[T]] = [[]]
+        for keyword, payload in keywords:
+            if keyword:
+                self._add(keyword, payload)
+        self._link()
+
+    def _add(self, keyword: str, payload: T) -> None:
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(payload)
+
+    def _link(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, T]]:
+        """Yield ``(end_index, payload)`` for every keyword occurrence."""
+
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        state = 0
+        for index, char in enumerate(text):
+            if not state and char not in root:
+                continue
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                for payload in out[state]:
+                    yield index, payload
+
+    def findall(self, text: str) -> Set[T]:
+        return {payload for _index, payload in self.iter_matches(text)}
+
+
+__all__ = ["KeywordAutomaton"]
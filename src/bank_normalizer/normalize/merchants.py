@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+try:  # pragma: no cover - optional dependency
+    from rapidfuzz import fuzz  # type: ignore
+except Exception:
+    from difflib import SequenceMatcher
+
+    class _FallbackFuzz:
+        @staticmethod
+        def partial_ratio(a: str, b: str) -> int:
+            """Best ratio of the shorter string against aligned windows of the longer."""
+
+            if not a or not b:
+                return 0
+            short, long = (a, b) if len(a) <= len(b) else (b, a)
+            best = 0.0
+            for block in SequenceMatcher(None, short, long).get_matching_blocks():
+                start = max(block.b - block.a, 0)
+                window = long[start : start + len(short)]
+                best = max(best, SequenceMatcher(None, short, window).ratio())
+            return int(best * 100)
+
+    fuzz = _FallbackFuzz()
+
+from .matching import KeywordAutomaton
+from .memo import LRUCache, normalize_description
+
+NGRAM = 3
+FUZZY_THRESHOLD = 70
+MAX_CANDIDATES = 8
+# Share of a merchant's n-grams a description must contain to be scored.
+MIN_OVERLAP = 0.5
+# n-grams shared by more merchants than this are too common to block on.
+MAX_POSTING = 512
+
+
+def _ngrams(text: str, size: int = NGRAM) -> List[str]:
+    return [text[index : index + size] for index in range(max(len(text) - size + 1, 1))]
+
+
+class MerchantIndex:
+    """Resolve transaction descriptions to known merchants.
+
+    Lookups go through three tiers: a memo of previous descriptions, an
+    Aho-Corasick pass that finds merchants appearing verbatim, and finally
+    fuzzy scoring restricted to the few merchants sharing enough character
+    n-grams with the description. The cost of the first two tiers does not
+    depend on the size of the merchant list, and the third only scores a
+    bounded number of candidates.
+    """
+
+    def __init__(self, merchants: Iterable[str], memo_size: int = 65536) -> None:
+        self.merchants: List[str] = list(dict.fromkeys(name.upper() for name in merchants if name))
+        self._exact: KeywordAutomaton[int] = KeywordAutomaton(
+            (name, rank) for rank, name in enumerate(self.merchants)
+        )
+        self._postings: Dict[str, List[int]] = {}
+        self._gram_counts: List[int] = []
+        for rank, name in enumerate(self.merchants):
+            grams = set(_ngrams(name))
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(rank)
+        self.cache: LRUCache[str, Optional[str]] = LRUCache(memo_size)
+
+    def __len__(self) -> int:
+        return len(self.merchants)
+
+    def _candidates(self, upper: str) -> List[int]:
+        shared: Counter[int] = Counter()
+        for gram in set(_ngrams(upper)):
+            posting = self._postings.get(gram)
+            if posting and len(posting) <= MAX_POSTING:
+                shared.update(posting)
+        ranked = [
+            rank
+            for rank, count in shared.most_common()
+            if count >= MIN_OVERLAP * self._gram_counts[rank]
+        ]
+        return sorted(ranked[:MAX_CANDIDATES])
+
+    def infer(self, description: str) -> Optional[str]:
+        return self.cache.get_or_compute(normalize_description(description), self._infer)
+
+    def _infer(self, upper: str) -> Optional[str]:
+        exact = self._exact.findall(upper)
+        if exact:
+            return self.merchants[min(exact)]
+        best_score = 0
+        best_match: Optional[str] = None
+        for rank in self._candidates(upper):
+            candidate = self.merchants[rank]
+            score = fuzz.partial_ratio(upper, candidate)
+            if score > best_score:
+                best_score = score
+                best_match = candidate
+        if best_score < FUZZY_THRESHOLD:
+            return None
+        return best_match
+
+
+__all__ = ["MerchantIndex"]
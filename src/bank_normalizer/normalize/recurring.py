@@ -1,57 +1,241 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import re
 from dataclasses import dataclass
-from datetime import datetime
-from statistics import mean
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from ..frame import TransactionFrame
 from ..models import Transaction
 
 
-@dataclass
+@dataclass(slots=True)
 class RecurringSeries:
     merchant: str
     average_amount: float
     average_interval_days: float
     occurrences: int
+    cadence: Optional[str] = None
+    missed_cycles: int = 0
+    outgoing: bool = True
 
 
-TOLERANCE = 4
+@dataclass(frozen=True)
+class Cadence:
+    name: str
+    days: float
+    tolerance: float
 
 
-def _days_between(dates: List[datetime]) -> List[int]:
-    deltas: List[int] = []
-    for idx in range(1, len(dates)):
-        deltas.append((dates[idx] - dates[idx - 1]).days)
-    return deltas
+CADENCES = (
+    Cadence("weekly", 7.0, 1.0),
+    Cadence("fortnightly", 14.0, 2.0),
+    Cadence("four-weekly", 28.0, 2.0),
+    Cadence("monthly", 30.44, 4.0),
+    Cadence("quarterly", 91.31, 8.0),
+    Cadence("annual", 365.25, 12.0),
+)
+
+MIN_OCCURRENCES = 3
+# Consecutive cycles a series may skip and still count as one series.
+MAX_MISSED_IN_A_ROW = 1
+# Share of expected cycles that may be missing over the whole series.
+MAX_MISSED_SHARE = 0.34
+# Description tokens used for clustering when no merchant was inferred.
+SIGNATURE_TOKENS = 2
+
+TOKEN_RE = re.compile(r"[A-Z][A-Z&']+")
+NOISE_TOKENS = frozenset(
+    {
+        "AU", "AUS", "CARD", "COM", "CREDIT", "DD", "DEBIT", "DIRECT", "EFTPOS", "FROM", "INTERNET",
+        "LTD", "PAYMENT", "POS", "PTY", "PURCHASE", "RECURRING", "REF", "TFR", "TO", "TRANSFER", "VISA",
+        "WWW",
+    }
+)
+
+
+def signature(description: str) -> str:
+    """Cluster key for a description: its leading meaningful word tokens.
+
+    Digits, references and generic banking words are dropped, so
+    "NETFLIX 12345" and "Netflix.com 67890" share the signature ``NETFLIX``.
+    """
+
+    upper = description.upper()
+    tokens = [token for token in TOKEN_RE.findall(upper) if token not in NOISE_TOKENS]
+    if not tokens:
+        return " ".join(upper.split())
+    return " ".join(tokens[:SIGNATURE_TOKENS])
+
+
+def cycles_between(delta: int, cadence: Cadence) -> int:
+    """Number of cadence periods ``delta`` spans, or 0 if it fits none."""
+
+    cycles = max(round(delta / cadence.days), 1)
+    if cycles > MAX_MISSED_IN_A_ROW + 1:
+        return 0
+    return cycles if abs(delta - cycles * cadence.days) <= cadence.tolerance * cycles else 0
+
+
+def classify(deltas: Sequence[int]) -> Optional[Tuple[Cadence, int, float]]:
+    """Return ``(cadence, missed cycles, interval per cycle)`` for gaps between dates.
+
+    Every gap must be a whole number of periods (within tolerance) and at
+    most :data:`MAX_MISSED_IN_A_ROW` periods may be skipped at once. The
+    cadence needing the fewest missed cycles wins, so a fortnightly series is
+    not reported as weekly with every other week missed; ties go to the
+    cadence closest to the observed interval.
+    """
+
+    best: Optional[Tuple[Cadence, int, float]] = None
+    best_rank: Tuple[int, float] = (0, 0.0)
+    for cadence in CADENCES:
+        cycles = [cycles_between(delta, cadence) for delta in deltas]
+        if not all(cycles):
+            continue
+        total = sum(cycles)
+        missed = total - len(cycles)
+        if missed > MAX_MISSED_SHARE * total:
+            continue
+        interval = sum(deltas) / total
+        rank = (missed, abs(interval - cadence.days) / cadence.days)
+        if best is None or rank < best_rank:
+            best, best_rank = (cadence, missed, interval), rank
+    return best
+
+
+def segments(dates: Sequence[int], cadence: Cadence) -> List[List[int]]:
+    """Split date-ordered ``dates`` into runs that keep ``cadence``.
+
+    Returns index lists. A date that comes too soon after the last kept one
+    (a second charge in the same cycle) is dropped as an outlier; a gap that
+    fits no whole number of periods ends the run and starts a new one.
+    """
+
+    runs: List[List[int]] = []
+    current = [0]
+    for index in range(1, len(dates)):
+        delta = dates[index] - dates[current[-1]]
+        if cycles_between(delta, cadence):
+            current.append(index)
+        elif delta >= cadence.days - cadence.tolerance:
+            runs.append(current)
+            current = [index]
+    runs.append(current)
+    return runs
+
+
+def find_series(dates: Sequence[int]) -> Optional[Tuple[Cadence, int, float, List[int]]]:
+    """Best cadence run in date-ordered ``dates``, with the indices it keeps.
+
+    Each cadence contributes its latest run of at least
+    :data:`MIN_OCCURRENCES` dates that :func:`classify` accepts; the run
+    keeping the most dates wins, then the one :func:`classify` ranks higher.
+    """
+
+    best: Optional[Tuple[Cadence, int, float, List[int]]] = None
+    best_rank: Tuple[int, int, float] = (0, 0, 0.0)
+    for cadence in CADENCES:
+        for run in reversed(segments(dates, cadence)):
+            if len(run) < MIN_OCCURRENCES:
+                continue
+            days = [dates[index] for index in run]
+            match = classify([later - earlier for earlier, later in zip(days, days[1:])])
+            if match is None:
+                continue
+            found, missed, interval = match
+            rank = (-len(run), missed, abs(interval - found.days) / found.days)
+            if best is None or rank < best_rank:
+                best, best_rank = (found, missed, interval, run), rank
+            break
+    return best
+
+
+def cluster_keys(frame: TransactionFrame) -> List[str]:
+    """Merchant, or description signature, for every row of ``frame``."""
+
+    signatures: Dict[str, str] = {}
+    keys: List[str] = []
+    for merchant, description in zip(frame.merchants, frame.descriptions):
+        if merchant:
+            keys.append(merchant)
+            continue
+        key = signatures.get(description)
+        if key is None:
+            key = signatures[description] = signature(description)
+        keys.append(key)
+    return keys
+
+
+def series_key(key: str, outgoing: bool) -> str:
+    """Result key for a cluster; payments keep the cluster key, receipts are suffixed."""
+
+    return key if outgoing else f"{key} (incoming)"
+
+
+def clusters(frame: TransactionFrame) -> Iterator[Tuple[str, bool, List[int]]]:
+    """Yield ``(key, outgoing, row indices in date order)`` per cluster.
+
+    Rows are sorted once by (cluster, direction, date), so the whole
+    grouping is O(n log n).
+    """
+
+    keys = cluster_keys(frame)
+    ordinals, amounts = frame.ordinals, frame.amounts
+    order = sorted(range(len(frame)), key=lambda index: (keys[index], amounts[index] < 0, ordinals[index]))
+    start = 0
+    while start < len(order):
+        key, outgoing = keys[order[start]], amounts[order[start]] < 0
+        stop = start + 1
+        while stop < len(order) and keys[order[stop]] == key and (amounts[order[stop]] < 0) == outgoing:
+            stop += 1
+        yield key, outgoing, order[start:stop]
+        start = stop
 
 
 def detect_recurring(transactions: Iterable[Transaction]) -> Dict[str, RecurringSeries]:
-    grouped: Dict[str, List[Transaction]] = defaultdict(list)
-    for txn in transactions:
-        key = txn.merchant or txn.description
-        grouped[key].append(txn)
+    """Find recurring payments by merchant, or by description signature.
 
+    Money in and money out are separate series; see :func:`series_key`.
+    Only the cadences in :data:`CADENCES` are reported, so daily spending
+    and irregular repeats (the same shop every few days) are not recurring.
+    Extra charges within a cycle are ignored, and a cluster that stops and
+    restarts is reported by its latest run; see :func:`find_series`.
+    """
+
+    frame = TransactionFrame.from_transactions(transactions)
+    ordinals, amounts = frame.ordinals, frame.amounts
     recurring: Dict[str, RecurringSeries] = {}
-    for key, txns in grouped.items():
-        if len(txns) < 3:
-            continue
-        txns.sort(key=lambda t: t.date)
-        deltas = _days_between([txn.date for txn in txns])
-        if not deltas:
+    for key, outgoing, run in clusters(frame):
+        if len(run) < MIN_OCCURRENCES:
             continue
-        avg_delta = mean(deltas)
-        if min(deltas) < avg_delta - TOLERANCE or max(deltas) > avg_delta + TOLERANCE:
+        match = find_series([ordinals[index] for index in run])
+        if match is None:
             continue
-        avg_amount = mean(abs(txn.amount) for txn in txns)
-        recurring[key] = RecurringSeries(
+        cadence, missed, interval, kept = match
+        rows = [run[position] for position in kept]
+        recurring[series_key(key, outgoing)] = RecurringSeries(
             merchant=key,
-            average_amount=avg_amount,
-            average_interval_days=avg_delta,
-            occurrences=len(txns),
+            average_amount=sum(abs(amounts[index]) for index in rows) / len(rows) / 100,
+            average_interval_days=interval,
+            occurrences=len(rows),
+            cadence=cadence.name,
+            missed_cycles=missed,
+            outgoing=outgoing,
         )
     return recurring
 
 
-__all__ = ["RecurringSeries", "detect_recurring"]
+__all__ = [
+    "CADENCES",
+    "Cadence",
+    "RecurringSeries",
+    "classify",
+    "cluster_keys",
+    "clusters",
+    "cycles_between",
+    "detect_recurring",
+    "find_series",
+    "segments",
+    "series_key",
+    "signature",
+]
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..frame import TransactionFrame
+from ..models import Transaction
+from .recurring import (
+    CADENCES,
+    MAX_MISSED_IN_A_ROW,
+    MIN_OCCURRENCES,
+    RecurringSeries,
+    classify,
+    clusters,
+    cycles_between,
+    series_key,
+)
+
+RECURRING_DB = os.environ.get("BANKNORM_RECURRING_DB") or None
+# Latest dates kept for a series whose cadence is not established yet.
+RECENT_LIMIT = 12
+# Days a candidate is kept after its latest payment: one cycle of the longest cadence.
+CANDIDATE_TTL = math.ceil(CADENCES[-1].days + CADENCES[-1].tolerance)
+
+CADENCE_BY_NAME = {cadence.name: cadence for cadence in CADENCES}
+
+_Point = Tuple[int, int]
+
+
+@dataclass
+class SeriesState:
+    """Persisted progress of one account's payment cluster.
+
+    Until a cadence is established only the latest :data:`RECENT_LIMIT`
+    ``(day, cents)`` points are kept; afterwards the series is summarized
+    by running totals, so the state stays the same size however long the
+    account history grows.
+    """
+
+    key: str
+    outgoing: bool
+    recent: List[_Point] = field(default_factory=list)
+    cadence: Optional[str] = None
+    first: int = 0
+    last: int = 0
+    occurrences: int = 0
+    total_cents: int = 0
+    missed: int = 0
+    cycles: int = 0
+
+    @property
+    def due(self) -> Optional[int]:
+        """Last day the next payment may arrive before the state is dropped.
+
+        An established series is then broken; a candidate whose latest
+        payment is more than :data:`CANDIDATE_TTL` days old is discarded.
+        """
+
+        if self.cadence is None:
+            return self.recent[-1][0] + CANDIDATE_TTL if self.recent else None
+        cadence = CADENCE_BY_NAME[self.cadence]
+        cycles = MAX_MISSED_IN_A_ROW + 1
+        return self.last + math.ceil(cycles * (cadence.days + cadence.tolerance))
+
+    @property
+    def seen(self) -> int:
+        return self.last if self.cadence else (self.recent[-1][0] if self.recent else 0)
+
+    def series(self) -> RecurringSeries:
+        return RecurringSeries(
+            merchant=self.key,
+            average_amount=self.total_cents / self.occurrences / 100,
+            average_interval_days=(self.last - self.first) / max(self.cycles, 1),
+            occurrences=self.occurrences,
+            cadence=self.cadence,
+            missed_cycles=self.missed,
+            outgoing=self.outgoing,
+        )
+
+    def extend(self, day: int, cents: int) -> bool:
+        """Add a payment to an established series; ``False`` if it breaks cadence.
+
+        A payment too soon after the last one is an extra charge within the
+        cycle and is skipped, as in :func:`~.recurring.segments`.
+        """
+
+        cadence = CADENCE_BY_NAME[self.cadence]  # type: ignore[index]
+        cycles = cycles_between(day - self.last, cadence)
+        if not cycles:
+            return day - self.last < cadence.days - cadence.tolerance
+        self.last = day
+        self.occurrences += 1
+        self.total_cents += abs(cents)
+        self.cycles += cycles
+        self.missed += cycles - 1
+        return True
+
+    def observe(self, day: int, cents: int) -> bool:
+        """Add a payment to a candidate; ``True`` once a cadence is established."""
+
+        self.recent.append((day, abs(cents)))
+        del self.recent[:-RECENT_LIMIT]
+        for start in range(len(self.recent) - MIN_OCCURRENCES + 1):
+            points = self.recent[start:]
+            days = [point[0] for point in points]
+            match = classify([later - earlier for earlier, later in zip(days, days[1:])])
+            if match is None:
+                continue
+            cadence, missed, _interval = match
+            self.cadence = cadence.name
+            self.first, self.last = days[0], days[-1]
+            self.occurrences = len(points)
+            self.total_cents = sum(point[1] for point in points)
+            self.missed = missed
+            self.cycles = len(points) - 1 + missed
+            self.recent = []
+            return True
+        return False
+
+
+@dataclass
+class RecurringUpdate:
+    """Series changed by one upload, keyed like :func:`detect_recurring`."""
+
+    new: Dict[str, RecurringSeries] = field(default_factory=dict)
+    extended: Dict[str, RecurringSeries] = field(default_factory=dict)
+    broken: Dict[str, RecurringSeries] = field(default_factory=dict)
+
+
+def _fold(state: SeriesState, points: Iterable[_Point], result: RecurringUpdate) -> SeriesState:
+    """Apply one cluster's payments to its state and record what changed in ``result``."""
+
+    name = series_key(state.key, state.outgoing)
+    for day, cents in points:
+        if day <= state.seen:
+            continue
+        if state.cadence is not None:
+            if state.extend(day, cents):
+                if name not in result.new:
+                    result.extended[name] = state.series()
+                continue
+            result.broken[name] = state.series()
+            result.extended.pop(name, None)
+            state = SeriesState(state.key, state.outgoing)
+        if state.observe(day, cents):
+            result.new[name] = state.series()
+    if name in result.new and state.cadence is not None:
+        result.new[name] = state.series()
+    elif name in result.extended:
+        result.extended[name] = state.series()
+    return state
+
+
+_COLUMNS = "key, outgoing, cadence, first, last, occurrences, total_cents, missed, cycles, recent"
+
+
+class RecurringStore:
+    """Per-account recurring-series state that new statements update in place.
+
+    :meth:`update` only loads the states of clusters present in the new
+    transactions, plus established series whose next payment is now overdue
+    (found through an index on the due day), so an upload costs time in
+    proportion to its own size rather than to the account's history.
+    Transactions dated on or before a series' latest payment are taken as
+    already seen. Without a ``path`` the state lives in memory.
+    """
+
+    def __init__(self, path: Optional[Path | str] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path) if self.path else ":memory:", check_same_thread=False)
+        if self.path is not None:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS recurring_series (
+                    account TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    outgoing INTEGER NOT NULL,
+                    cadence TEXT,
+                    first INTEGER,
+                    last INTEGER,
+                    occurrences INTEGER,
+                    total_cents INTEGER,
+                    missed INTEGER,
+                    cycles INTEGER,
+                    recent TEXT,
+                    due INTEGER,
+                    PRIMARY KEY (account, key, outgoing)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS recurring_due ON recurring_series (account, due)")
+
+    @staticmethod
+    def _state(row: tuple) -> SeriesState:
+        key, outgoing, cadence, first, last, occurrences, total_cents, missed, cycles, recent = row
+        return SeriesState(
+            key=key,
+            outgoing=bool(outgoing),
+            recent=[tuple(point) for point in json.loads(recent)],  # type: ignore[misc]
+            cadence=cadence,
+            first=first,
+            last=last,
+            occurrences=occurrences,
+            total_cents=total_cents,
+            missed=missed,
+            cycles=cycles,
+        )
+
+    def _load(self, account: str, keys: List[str]) -> Dict[Tuple[str, bool], SeriesState]:
+        states: Dict[Tuple[str, bool], SeriesState] = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            cur = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM recurring_series WHERE account = ? AND key IN ({','.join('?' * len(chunk))})",  # noqa: S608
+                [account, *chunk],
+            )
+            for row in cur:
+                state = self._state(row)
+                states[(state.key, state.outgoing)] = state
+        return states
+
+    def _save(self, account: str, state: SeriesState) -> None:
+        self._conn.execute(
+            f"REPLACE INTO recurring_series (account, {_COLUMNS}, due) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",  # noqa: S608
+            (
+                account,
+                state.key,
+                int(state.outgoing),
+                state.cadence,
+                state.first,
+                state.last,
+                state.occurrences,
+                state.total_cents,
+                state.missed,
+                state.cycles,
+                json.dumps(state.recent),
+                state.due,
+            ),
+        )
+
+    def update(self, account: str, transactions: Iterable[Transaction]) -> RecurringUpdate:
+        """Fold new transactions into ``account``'s series and report what changed."""
+
+        frame = TransactionFrame.from_transactions(transactions)
+        result = RecurringUpdate()
+        if not frame:
+            return result
+        groups = list(clusters(frame))
+        ordinals, amounts = frame.ordinals, frame.amounts
+        with self._lock, self._conn:
+            states = self._load(account, sorted({key for key, _outgoing, _run in groups}))
+            for key, outgoing, run in groups:
+                state = states.get((key, outgoing)) or SeriesState(key, outgoing)
+                points = [(ordinals[index], amounts[index]) for index in run]
+                self._save(account, _fold(state, points, result))
+            self._expire(account, max(ordinals), result)
+        return result
+
+    def _expire(self, account: str, today: int, result: RecurringUpdate) -> None:
+        """Drop states overdue by ``today``; established series are reported as broken."""
+
+        cur = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM recurring_series WHERE account = ? AND due < ?",  # noqa: S608
+            (account, today),
+        )
+        for state in map(self._state, cur.fetchall()):
+            if state.cadence is not None:
+                name = series_key(state.key, state.outgoing)
+                result.broken[name] = state.series()
+                result.new.pop(name, None)
+                result.extended.pop(name, None)
+            self._conn.execute(
+                "DELETE FROM recurring_series WHERE account = ? AND key = ? AND outgoing = ?",
+                (account, state.key, int(state.outgoing)),
+            )
+
+    def series(self, account: str) -> Dict[str, RecurringSeries]:
+        """Established series currently tracked for ``account``."""
+
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM recurring_series WHERE account = ? AND cadence IS NOT NULL",  # noqa: S608
+                (account,),
+            )
+            return {series_key(state.key, state.outgoing): state.series() for state in map(self._state, cur.fetchall())}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+__all__ = ["CANDIDATE_TTL", "RECURRING_DB", "RecurringStore", "RecurringUpdate", "SeriesState"]
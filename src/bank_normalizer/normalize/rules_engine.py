@@ -1,35 +1,25 @@
 from __future__ import annotations
 
 import hashlib
-import math
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional
-
-try:  # pragma: no cover - optional dependency
-    from rapidfuzz import fuzz  # type: ignore
-except Exception:
-    from difflib import SequenceMatcher
-
-    class _FallbackFuzz:
-        @staticmethod
-        def partial_ratio(a: str, b: str) -> int:
-            if not a or not b:
-                return 0
-            ratio = SequenceMatcher(None, a, b).ratio()
-            return int(ratio * 100)
-
-    fuzz = _FallbackFuzz()
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from ..frame import KEEP_RAW, TransactionFrame, to_cents
 from ..models import Transaction
-from ..extract.parse_table import ParsedRow, parse_date
+from ..extract.dates import DateParser
+from ..extract.parse_table import ParsedRow
+from ..config.merchants import MERCHANTS
 from .banks import BankProfile
+from .columns import ColumnPlan, Header, column_plan
+from .merchants import MerchantIndex
 
 AMOUNT_CLEAN_RE = re.compile(r"[^0-9.-]")
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedRow:
     date: datetime
     description: str
@@ -62,81 +52,166 @@ def _parse_amount(value: Optional[str]) -> Optional[float]:
     return amount
 
 
-def _infer_merchant(description: str, candidates: Iterable[str]) -> Optional[str]:
-    best_score = 0
-    best_match: Optional[str] = None
-    for candidate in candidates:
-        score = fuzz.partial_ratio(description.upper(), candidate.upper())
-        if score > best_score:
-            best_score = score
-            best_match = candidate
-    if best_score < 70:
-        return None
-    return best_match
-
-
-KNOWN_MERCHANTS = [
-    "WOOLWORTHS",
-    "COLES",
-    "ALDI",
-    "BUNNINGS",
-    "AFTERPAY",
-    "ZIP PAY",
-    "TELSTRA",
-    "OPTUS",
-    "PAYPAL",
-]
-
-
-def normalize_rows(rows: Iterable[ParsedRow], bank: BankProfile, bank_name: str) -> List[NormalizedRow]:
-    normalized: List[NormalizedRow] = []
-    for row in rows:
-        raw = row.raw
-        date_value = None
-        for key in ("Date", "Transaction Date"):
-            if key in raw:
-                date_value = raw[key]
-                break
-        if not date_value:
-            continue
-        parsed = parse_date(date_value)
-        if not parsed:
-            continue
-        description = raw.get("Description") or raw.get("Details") or ""
-        description = bank.clean_description(description)
-        debit = _parse_amount(raw.get("Debit") or raw.get("Withdrawal") or raw.get("Withdrawals"))
-        credit = _parse_amount(raw.get("Credit") or raw.get("Deposit") or raw.get("Deposits"))
-        balance = _parse_amount(raw.get("Balance"))
-        amount = 0.0
-        if debit is not None:
-            amount -= abs(debit)
-        if credit is not None:
-            amount += abs(credit)
-        if amount == 0.0 and raw.get("Amount"):
-            amt = _parse_amount(raw.get("Amount"))
-            if amt is not None:
-                amount = amt
-                if amount < 0:
-                    debit = abs(amount)
-                    credit = None
-                else:
-                    credit = amount
-                    debit = None
-        merchant = _infer_merchant(description, KNOWN_MERCHANTS)
-        normalized.append(
-            NormalizedRow(
-                date=parsed,
-                description=description,
-                merchant=merchant,
-                debit=abs(debit) if debit is not None else None,
-                credit=abs(credit) if credit is not None else None,
-                amount=amount,
-                balance=balance,
-                page=row.page,
-                raw=raw,
-            )
+KNOWN_MERCHANTS = list(MERCHANTS)
+
+_default_merchants: Optional[MerchantIndex] = None
+
+
+def default_merchant_index() -> MerchantIndex:
+    global _default_merchants
+    if _default_merchants is None:
+        _default_merchants = MerchantIndex(KNOWN_MERCHANTS)
+    return _default_merchants
+
+
+# Rows buffered per date-parsing batch; bounds memory on long statements.
+DATE_BATCH = 512
+
+
+class _Planner:
+    """Resolve each row's column plan, recompiling only when the layout changes."""
+
+    def __init__(self, bank: BankProfile) -> None:
+        self.column_map = bank.column_map()
+        self._header: Optional[Header] = None
+        self._plan: Optional[ColumnPlan] = None
+
+    def __call__(self, row: ParsedRow) -> ColumnPlan:
+        header = row.header or tuple(row.raw)
+        if self._plan is None or header != self._header:
+            self._plan = column_plan(header, self.column_map)
+            self._header = header
+        return self._plan
+
+
+_Dated = Tuple[ParsedRow, ColumnPlan, datetime]
+
+
+def _dated_rows(rows: Iterable[ParsedRow], bank: BankProfile, dates: DateParser) -> Iterator[_Dated]:
+    """Yield rows with their column plan and parsed date, skipping undated rows.
+
+    Dates are parsed in batches so the statement-scoped parser pins the
+    statement's date format from the leading rows and reuses it for the rest.
+    """
+
+    planner = _Planner(bank)
+    iterator = iter(rows)
+    while True:
+        batch = [(row, planner(row)) for row in islice(iterator, DATE_BATCH)]
+        if not batch:
+            break
+        parsed_dates = dates.parse_dates([row.raw.get(plan.date) if plan.date else None for row, plan in batch])
+        for (row, plan), parsed in zip(batch, parsed_dates):
+            if parsed:
+                yield row, plan, parsed
+
+
+def normalize_rows(
+    rows: Iterable[ParsedRow],
+    bank: BankProfile,
+    bank_name: str,
+    dates: Optional[DateParser] = None,
+    merchants: Optional[MerchantIndex] = None,
+) -> List[NormalizedRow]:
+    """Normalize parsed rows using one statement-scoped :class:`DateParser`."""
+
+    merchants = merchants or default_merchant_index()
+    return [
+        _normalize_row(row, plan, parsed, bank, merchants)
+        for row, plan, parsed in _dated_rows(rows, bank, dates or DateParser())
+    ]
+
+
+def normalize_frame(
+    rows: Iterable[ParsedRow],
+    bank: BankProfile,
+    bank_name: str,
+    dates: Optional[DateParser] = None,
+    merchants: Optional[MerchantIndex] = None,
+    keep_raw: bool = KEEP_RAW,
+    account: Optional[str] = None,
+) -> TransactionFrame:
+    """Normalize parsed rows straight into a :class:`TransactionFrame`.
+
+    Produces the same transactions as :func:`normalize_rows` followed by
+    :func:`to_transactions`, without building per-row objects. Every row is
+    tagged with the statement's ``account`` when it is known.
+    """
+
+    merchants = merchants or default_merchant_index()
+    frame = TransactionFrame(keep_raw=keep_raw)
+    for row, plan, parsed in _dated_rows(rows, bank, dates or DateParser()):
+        description, debit, credit, amount, balance = _row_values(row.raw, plan, bank)
+        frame.append(
+            parsed.toordinal(),
+            description,
+            to_cents(amount),  # type: ignore[arg-type]
+            debit=to_cents(debit) if amount < 0 else None,
+            credit=to_cents(credit) if amount > 0 else None,
+            balance=to_cents(balance),
+            merchant=merchants.infer(description),
+            account=account,
+            bank=bank_name,
+            page=row.page,
+            raw=row.raw,
         )
-    return normalized
+    return frame
+
+
+_Values = Tuple[str, Optional[float], Optional[float], float, Optional[float]]
+
+
+def _field(raw: Dict[str, str], column: Optional[str]) -> Optional[str]:
+    return raw.get(column) if column else None
+
+
+def _row_values(raw: Dict[str, str], plan: ColumnPlan, bank: BankProfile) -> _Values:
+    """Return ``(description, debit, credit, amount, balance)`` for a raw row."""
+
+    description = bank.clean_description(_field(raw, plan.description) or "")
+    debit = _parse_amount(_field(raw, plan.debit))
+    credit = _parse_amount(_field(raw, plan.credit))
+    balance = _parse_amount(_field(raw, plan.balance))
+    amount = 0.0
+    if debit is not None:
+        amount -= abs(debit)
+    if credit is not None:
+        amount += abs(credit)
+    raw_amount = _field(raw, plan.amount)
+    if amount == 0.0 and raw_amount:
+        amt = _parse_amount(raw_amount)
+        if amt is not None:
+            amount = amt
+            if amount < 0:
+                debit = abs(amount)
+                credit = None
+            else:
+                credit = amount
+                debit = None
+    return (
+        description,
+        abs(debit) if debit is not None else None,
+        abs(credit) if credit is not None else None,
+        amount,
+        balance,
+    )
+
+
+def _normalize_row(
+    row: ParsedRow, plan: ColumnPlan, parsed: datetime, bank: BankProfile, merchants: MerchantIndex
+) -> NormalizedRow:
+    description, debit, credit, amount, balance = _row_values(row.raw, plan, bank)
+    return NormalizedRow(
+        date=parsed,
+        description=description,
+        merchant=merchants.infer(description),
+        debit=debit,
+        credit=credit,
+        amount=amount,
+        balance=balance,
+        page=row.page,
+        raw=row.raw,
+    )
 
 
 def to_transactions(rows: Iterable[NormalizedRow], bank_name: str) -> List[Transaction]:
@@ -147,7 +222,7 @@ def to_transactions(rows: Iterable[NormalizedRow], bank_name: str) -> List[Trans
         debit = row.debit if row.amount < 0 else None
         credit = row.credit if row.amount > 0 else None
         transactions.append(
-            Transaction(
+            Transaction.from_trusted(
                 id=identifier,
                 date=row.date,
                 description=row.description,
@@ -166,4 +241,4 @@ def to_transactions(rows: Iterable[NormalizedRow], bank_name: str) -> List[Trans
     return transactions
 
 
-__all__ = ["NormalizedRow", "normalize_rows", "to_transactions"]
+__all__ = ["NormalizedRow", "normalize_frame", "normalize_rows", "to_transactions"]
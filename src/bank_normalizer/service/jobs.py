@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from ..api import normalize_pdfs
+from ..export import export_csv, export_xlsx
+from ..extract import StatementCache
+from ..normalize.dedup import DEDUP_DB, DedupIndex
+from . import workers
+from .workers import CancelledError, Task, WorkerPool
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = os.environ.get("BANKNORM_JOBS_DB") or None
+# Seconds a job and its outputs are kept after the last update or download.
+JOB_TTL = float(os.environ.get("BANKNORM_JOB_TTL", str(24 * 3600)))
+SWEEP_INTERVAL = float(os.environ.get("BANKNORM_SWEEP_INTERVAL", "300"))
+# Bytes of job outputs kept before least recently used jobs are evicted; 0 disables.
+OUTPUT_QUOTA = int(os.environ.get("BANKNORM_OUTPUT_QUOTA_MB", "1024")) * 1024 * 1024
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+@dataclass
+class FileProgress:
+    name: str
+    state: str = QUEUED
+    transactions: int = 0
+    error: Optional[str] = None
+    task: Optional[Task] = field(default=None, repr=False, compare=False)
+
+    @property
+    def current_state(self) -> str:
+        if self.state == QUEUED and self.task is not None and self.task.running():
+            return RUNNING
+        return self.state
+
+
+@dataclass
+class Job:
+    """One ``/extract`` request: its uploaded files, progress and outputs."""
+
+    id: str
+    files: List[FileProgress]
+    state: str = QUEUED
+    error: Optional[str] = None
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    outputs: Dict[str, Path] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+    updated: float = field(default_factory=time.time)
+    accessed: float = field(default_factory=time.time)
+    upload_dir: Optional[Path] = None
+    bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        files = [
+            {"name": item.name, "state": item.current_state, "transactions": item.transactions, "error": item.error}
+            for item in self.files
+        ]
+        state = self.state
+        if state == QUEUED and any(item["state"] != QUEUED for item in files):
+            state = RUNNING
+        return {
+            "job_id": self.id,
+            "state": state,
+            "error": self.error,
+            "files": files,
+            "completed": sum(item["state"] in FINISHED for item in files),
+            "total": len(files),
+            "results": self.results,
+        }
+
+
+_COLUMNS = "id, state, error, created, updated, accessed, upload_dir, bytes, files, results, outputs"
+_FILE_FIELDS = ("name", "state", "transactions", "error")
+
+
+class JobStore:
+    """SQLite-backed job records shared by every service process.
+
+    Jobs and their outputs expire :data:`JOB_TTL` seconds after they were
+    last updated or downloaded; :meth:`sweep` deletes expired jobs together
+    with their output and upload directories, then evicts the least recently
+    downloaded finished jobs while ``output_dir`` is over ``quota`` bytes.
+    Worker task handles are only known to the process that submitted them,
+    so only that process reports files as running or can cancel them.
+    Without a ``path`` the records live in memory.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path | str] = None,
+        output_dir: Optional[Path] = None,
+        *,
+        ttl: float = JOB_TTL,
+        quota: int = OUTPUT_QUOTA,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.output_dir = output_dir
+        self.ttl = ttl
+        self.quota = quota
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, List[Optional[Task]]] = {}
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:", check_same_thread=False, isolation_level=None, timeout=30
+        )
+        if self.path is not None:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                accessed REAL NOT NULL,
+                upload_dir TEXT,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                files TEXT NOT NULL,
+                results TEXT NOT NULL,
+                outputs TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_accessed ON jobs (accessed)")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Serialize read-modify-write cycles across threads and processes."""
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _job(self, row: tuple) -> Job:
+        job_id, state, error, created, updated, accessed, upload_dir, size, files, results, outputs = row
+        tasks = self._tasks.get(job_id) or []
+        progress = [FileProgress(**item) for item in json.loads(files)]
+        for item, task in zip(progress, tasks):
+            item.task = task
+        return Job(
+            id=job_id,
+            files=progress,
+            state=state,
+            error=error,
+            results=json.loads(results),
+            outputs={name: Path(value) for name, value in json.loads(outputs).items()},
+            created=created,
+            updated=updated,
+            accessed=accessed,
+            upload_dir=Path(upload_dir) if upload_dir else None,
+            bytes=size,
+        )
+
+    def _save(self, conn: sqlite3.Connection, job: Job) -> None:
+        conn.execute(
+            f"REPLACE INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",  # noqa: S608
+            (
+                job.id,
+                job.state,
+                job.error,
+                job.created,
+                job.updated,
+                job.accessed,
+                str(job.upload_dir) if job.upload_dir else None,
+                job.bytes,
+                json.dumps([{name: getattr(item, name) for name in _FILE_FIELDS} for item in job.files]),
+                json.dumps(job.results, default=str),
+                json.dumps({name: str(path) for name, path in job.outputs.items()}),
+            ),
+        )
+
+    def _load(self, conn: sqlite3.Connection, job_id: str) -> Optional[Job]:
+        row = conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()  # noqa: S608
+        return self._job(row) if row else None
+
+    def create(self, names: List[str], upload_dir: Optional[Path] = None) -> Job:
+        job = Job(id=uuid.uuid4().hex, files=[FileProgress(name) for name in names], upload_dir=upload_dir)
+        with self._transaction() as conn:
+            self._save(conn, job)
+        return job
+
+    def get(self, job_id: str, *, touch: bool = False) -> Optional[Job]:
+        """Load a job; ``touch`` marks it as recently used for expiry and the quota."""
+
+        if not touch:
+            with self._lock:
+                return self._load(self._conn, job_id)
+        with self._transaction() as conn:
+            conn.execute("UPDATE jobs SET accessed = ? WHERE id = ?", (time.time(), job_id))
+            return self._load(conn, job_id)
+
+    def recent(self, limit: int = 5) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs ORDER BY created DESC LIMIT ?", (limit,)  # noqa: S608
+            ).fetchall()
+            return [self._job(row) for row in reversed(rows)]
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.get(job_id)
+        return job.to_dict() if job is not None else None
+
+    def attach(self, job_id: str, tasks: List[Task]) -> None:
+        """Remember this process's worker tasks for a job's files."""
+
+        with self._lock:
+            self._tasks[job_id] = list(tasks)
+
+    def update(self, job_id: str, index: Optional[int] = None, **changes: Any) -> Optional[Job]:
+        """Apply ``changes`` to file ``index`` if given, else to the job itself."""
+
+        with self._transaction() as conn:
+            job = self._load(conn, job_id)
+            if job is None:
+                return None
+            target = job.files[index] if index is not None else job
+            for name, value in changes.items():
+                setattr(target, name, value)
+            job.updated = time.time()
+            self._save(conn, job)
+        if job.state in FINISHED:
+            with self._lock:
+                self._tasks.pop(job_id, None)
+        return job
+
+    def add_result(self, job_id: str, result: Dict[str, Any], outputs: List[Path]) -> None:
+        with self._transaction() as conn:
+            job = self._load(conn, job_id)
+            if job is None:
+                return
+            job.results.append(result)
+            for path in outputs:
+                job.outputs[path.name] = path
+                job.bytes += path.stat().st_size if path.exists() else 0
+            job.updated = time.time()
+            self._save(conn, job)
+
+    def release_uploads(self, job: Job) -> None:
+        """Delete a job's spooled uploads once they are no longer needed."""
+
+        if job.upload_dir is not None:
+            shutil.rmtree(job.upload_dir, ignore_errors=True)
+
+    def _job_dir(self, job_id: str) -> Optional[Path]:
+        return self.output_dir / job_id if self.output_dir is not None else None
+
+    def _remove(self, conn: sqlite3.Connection, job: Job) -> None:
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+        self._tasks.pop(job.id, None)
+        self.release_uploads(job)
+        job_dir = self._job_dir(job.id)
+        if job_dir is not None:
+            shutil.rmtree(job_dir, ignore_errors=True)
+        for path in job.outputs.values():
+            path.unlink(missing_ok=True)
+
+    def discard(self, job_id: str) -> None:
+        with self._transaction() as conn:
+            job = self._load(conn, job_id)
+            if job is not None:
+                self._remove(conn, job)
+
+    def sweep(self, now: Optional[float] = None) -> List[str]:
+        """Delete expired jobs, then least recently used ones over the quota.
+
+        Returns the ids of the removed jobs. Only finished jobs count toward
+        quota eviction; a job still in progress is removed only when it has
+        not been updated within the TTL, such as one orphaned by a crash.
+        """
+
+        now = time.time() if now is None else now
+        cutoff = now - self.ttl
+        removed: List[str] = []
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE updated < ? AND accessed < ?", (cutoff, cutoff)  # noqa: S608
+            ).fetchall()
+            for job in map(self._job, rows):
+                self._remove(conn, job)
+                removed.append(job.id)
+            if self.quota:
+                (total,) = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM jobs").fetchone()
+                if total > self.quota:
+                    placeholders = ",".join("?" * len(FINISHED))
+                    rows = conn.execute(
+                        f"SELECT {_COLUMNS} FROM jobs WHERE state IN ({placeholders}) ORDER BY accessed",  # noqa: S608
+                        FINISHED,
+                    ).fetchall()
+                    for job in map(self._job, rows):
+                        if total <= self.quota:
+                            break
+                        self._remove(conn, job)
+                        removed.append(job.id)
+                        total -= job.bytes
+        return removed
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class Sweeper(threading.Thread):
+    """Daemon thread running :meth:`JobStore.sweep` every ``interval`` seconds.
+
+    Upload directories under ``upload_root`` that are older than the store's
+    TTL and belong to no job, such as those left by a rejected request or a
+    crash, are removed as well.
+    """
+
+    def __init__(self, store: JobStore, interval: float = SWEEP_INTERVAL, upload_root: Optional[Path] = None) -> None:
+        super().__init__(name="banknorm-job-sweeper", daemon=True)
+        self.store = store
+        self.interval = interval
+        self.upload_root = upload_root
+        self._stop_event = threading.Event()
+
+    def sweep(self) -> List[str]:
+        removed = self.store.sweep()
+        if self.upload_root is not None and self.upload_root.is_dir():
+            cutoff = time.time() - self.store.ttl
+            for entry in self.upload_root.iterdir():
+                try:
+                    stale = entry.stat().st_mtime < cutoff
+                except FileNotFoundError:
+                    continue
+                if stale:
+                    shutil.rmtree(entry, ignore_errors=True)
+        return removed
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception:  # noqa: BLE001 - keep sweeping on the next tick
+                logger.exception("job sweep failed")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def process_file(
+    path: Path,
+    job_dir: Path,
+    index: int,
+    cache: Optional[StatementCache] = None,
+    digest: Optional[str] = None,
+    dedup: Optional[DedupIndex] = None,
+) -> Dict[str, Any]:
+    """Normalize one uploaded statement and write its CSV and XLSX exports.
+
+    Runs on a worker, possibly in another process, so it takes and returns
+    only picklable values. ``digest`` is the upload's SHA-256, if known;
+    ``dedup`` is the index shared by every file of the job.
+    """
+
+    (bundle,) = normalize_pdfs([path], cache=cache, digests={path: digest} if digest else None, dedup=dedup)
+    csv_path = export_csv(bundle.transactions, job_dir / f"bundle_{index}.csv")
+    xlsx_path = export_xlsx(bundle.transactions, job_dir / f"bundle_{index}.xlsx", summary=bundle.summary)
+    return {
+        "meta": bundle.meta.model_dump(mode="json"),
+        "summary": bundle.summary,
+        "name": path.name,
+        "transactions": len(bundle.transactions),
+        "outputs": [csv_path, xlsx_path],
+    }
+
+
+def _file_finished(
+    store: JobStore, job_id: str, index: int, task: Task, dedup: Optional[DedupIndex] = None
+) -> None:
+    try:
+        outcome = task.result()
+    except CancelledError:
+        job = store.update(job_id, index, state=CANCELLED)
+    except Exception as exc:  # noqa: BLE001 - reported through the job status
+        job = store.update(job_id, index, state=FAILED, error=str(exc) or type(exc).__name__)
+    else:
+        csv_path, xlsx_path = outcome["outputs"]
+        result = {
+            "job_id": job_id,
+            "file": outcome["name"],
+            "meta": outcome["meta"],
+            "summary": outcome["summary"],
+            "csv": f"/download/{job_id}/{csv_path.name}",
+            "xlsx": f"/download/{job_id}/{xlsx_path.name}",
+        }
+        store.add_result(job_id, result, outcome["outputs"])
+        job = store.update(job_id, index, state=DONE, transactions=outcome["transactions"])
+    if job is None:
+        return
+    states = [item.state for item in job.files]
+    if all(state in FINISHED for state in states):
+        if DONE in states:
+            store.update(job_id, state=DONE)
+        elif CANCELLED in states:
+            store.update(job_id, state=CANCELLED)
+        else:
+            store.update(job_id, state=FAILED, error=next(item.error for item in job.files if item.error))
+        store.release_uploads(job)
+        if dedup is not None:
+            dedup.close()
+
+
+def start_job(
+    store: JobStore,
+    job: Job,
+    paths: List[Path],
+    output_dir: Path,
+    cache: Optional[StatementCache] = None,
+    pool: Optional[WorkerPool] = None,
+    digests: Optional[Mapping[Path, str]] = None,
+) -> Job:
+    """Queue one :func:`process_file` task per file of ``job``.
+
+    Files are submitted together so a saturated pool rejects the whole job
+    with :class:`QueueFull`; progress and results are recorded in ``store``
+    as each task settles. All files share one SQLite-backed dedup index
+    (:data:`DEDUP_DB`, or one in the job's directory), so overlapping
+    statements in a request are deduplicated even on process workers.
+    """
+
+    job_dir = output_dir / job.id
+    job_dir.mkdir(parents=True, exist_ok=True)
+    pool = pool or workers.pool()
+    digests = digests or {}
+    dedup = DedupIndex(DEDUP_DB or job_dir / "dedup.db")
+    calls = [
+        (process_file, (path, job_dir, index, cache, digests.get(path), dedup)) for index, path in enumerate(paths)
+    ]
+    try:
+        tasks = pool.submit_many(calls)
+    except workers.QueueFull:
+        dedup.close()
+        raise
+    store.attach(job.id, tasks)
+    for index, (progress, task) in enumerate(zip(job.files, tasks)):
+        progress.task = task
+        task.add_done_callback(partial(_file_finished, store, job.id, index, dedup=dedup))
+    return job
+
+
+def cancel_job(job: Job) -> int:
+    """Cancel the files of ``job`` that have not started; returns how many were cancelled.
+
+    Only effective in the process that submitted the job.
+    """
+
+    return sum(item.task.cancel() for item in job.files if item.task is not None)
+
+
+__all__ = [
+    "CANCELLED",
+    "DONE",
+    "FAILED",
+    "FileProgress",
+    "Job",
+    "JOBS_DB",
+    "JobStore",
+    "QUEUED",
+    "RUNNING",
+    "Sweeper",
+    "cancel_job",
+    "process_file",
+    "start_job",
+]
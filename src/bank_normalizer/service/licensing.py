@@ -3,12 +3,21 @@ from __future__ import annotations
 import hmac
 import os
 import sqlite3
+import threading
+import time
+import weakref
 from dataclasses import dataclass
 from hashlib import sha256
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 DEFAULT_DB = Path(os.environ.get("BANKNORM_DB", "./licenses.db"))
+# Seconds a license lookup is trusted before the database is asked again.
+CACHE_TTL = float(os.environ.get("BANKNORM_LICENSE_TTL", "60"))
+CACHE_SIZE = 4096
+
+_SELECT_ACTIVE = "SELECT active FROM licenses WHERE license_id = ?"
+_UPSERT = "REPLACE INTO licenses (license_id, customer_email, active) VALUES (?, ?, ?)"
 
 
 @dataclass
@@ -19,13 +28,49 @@ class LicenseRecord:
 
 
 class LicenseStore:
-    def __init__(self, path: Path = DEFAULT_DB) -> None:
+    """License table with one long-lived connection per thread.
+
+    The schema is created once, each thread reuses its own WAL-mode
+    connection (and with it sqlite's prepared-statement cache), connections
+    of threads that have exited are closed when the next one is opened, and
+    :meth:`is_active` answers from an in-memory cache for ``ttl`` seconds.
+    :meth:`upsert` invalidates the cached entry, so changes made through this
+    store apply immediately; changes made by other processes show up once
+    the entry expires.
+    """
+
+    def __init__(self, path: Path = DEFAULT_DB, ttl: float = CACHE_TTL) -> None:
         self.path = path
+        self.ttl = ttl
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: "weakref.WeakKeyDictionary[threading.Thread, sqlite3.Connection]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._cache: Dict[str, Tuple[bool, float]] = {}
         self._ensure_schema()
 
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._prune()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def _prune(self) -> None:
+        for thread, conn in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[thread]
+                conn.close()
+
     def _ensure_schema(self) -> None:
-        with sqlite3.connect(self.path) as conn:
+        with self._connection() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS licenses (
@@ -36,21 +81,55 @@ class LicenseStore:
                 """
             )
 
+    def invalidate(self, license_id: Optional[str] = None) -> None:
+        """Forget the cached status of ``license_id``, or of every license."""
+
+        with self._lock:
+            if license_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(license_id, None)
+
     def upsert(self, record: LicenseRecord) -> None:
-        with sqlite3.connect(self.path) as conn:
-            conn.execute(
-                "REPLACE INTO licenses (license_id, customer_email, active) VALUES (?, ?, ?)",
-                (record.license_id, record.customer_email, int(record.active)),
-            )
+        with self._connection() as conn:
+            conn.execute(_UPSERT, (record.license_id, record.customer_email, int(record.active)))
+        self.invalidate(record.license_id)
 
     def is_active(self, license_id: str) -> bool:
-        with sqlite3.connect(self.path) as conn:
-            cur = conn.execute(
-                "SELECT active FROM licenses WHERE license_id = ?",
-                (license_id,),
-            )
-            row = cur.fetchone()
-            return bool(row and row[0])
+        now = time.monotonic()
+        cached = self._cache.get(license_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        row = self._connection().execute(_SELECT_ACTIVE, (license_id,)).fetchone()
+        active = bool(row and row[0])
+        with self._lock:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            self._cache[license_id] = (active, now + self.ttl)
+        return active
+
+    def close(self) -> None:
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+_default: Optional[LicenseStore] = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> LicenseStore:
+    """Process-wide store for :data:`DEFAULT_DB`, created on first use."""
+
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = LicenseStore()
+    return _default
 
 
 def _secret() -> bytes:
@@ -76,8 +155,8 @@ def verify_license(token: Optional[str], store: Optional[LicenseStore] = None) -
     if not hmac.compare_digest(expected, signature):
         return False
     if store is None:
-        store = LicenseStore()
+        store = default_store()
     return store.is_active(license_id)
 
 
-__all__ = ["LicenseStore", "LicenseRecord", "sign_license", "verify_license"]
+__all__ = ["LicenseStore", "LicenseRecord", "default_store", "sign_license", "verify_license"]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+from fastapi import UploadFile
+
+MAX_FILE_BYTES = int(os.environ.get("BANKNORM_MAX_UPLOAD_MB", "50")) * 1024 * 1024
+MAX_REQUEST_BYTES = int(os.environ.get("BANKNORM_MAX_REQUEST_MB", "200")) * 1024 * 1024
+UPLOAD_CHUNK = 1 << 20
+MAX_NAME_LENGTH = 120
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class UploadTooLarge(ValueError):
+    """An upload, or the request as a whole, exceeded its size limit."""
+
+
+@dataclass(frozen=True)
+class SavedUpload:
+    filename: str
+    path: Path
+    size: int
+    sha256: str
+
+
+def safe_filename(name: Optional[str], index: int, taken: Set[str]) -> str:
+    """Reduce a client-supplied name to a unique, path-free file name.
+
+    Directory parts are dropped and anything outside ``[A-Za-z0-9._-]`` is
+    replaced, so the result can never leave the upload directory.
+    """
+
+    base = (name or "").replace("\\", "/").rsplit("/", 1)[-1]
+    base = _UNSAFE_CHARS.sub("_", base).strip("._")[-MAX_NAME_LENGTH:] or f"upload_{index}.pdf"
+    stem, dot, suffix = base.rpartition(".")
+    candidate, counter = base, 1
+    while candidate.lower() in taken:
+        counter += 1
+        candidate = f"{stem}_{counter}.{suffix}" if dot and stem else f"{base}_{counter}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+async def spool_upload(upload: UploadFile, dest: Path, limit: int, chunk_size: int = UPLOAD_CHUNK) -> SavedUpload:
+    """Copy ``upload`` to ``dest`` chunk by chunk, hashing it on the way.
+
+    At most ``limit`` bytes are accepted; past that the partial file is
+    removed and :class:`UploadTooLarge` is raised.
+    """
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with dest.open("wb") as fh:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLarge(f"{upload.filename or dest.name} exceeds the {limit // (1024 * 1024)} MB upload limit")
+                digest.update(chunk)
+                fh.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return SavedUpload(filename=dest.name, path=dest, size=size, sha256=digest.hexdigest())
+
+
+async def spool_uploads(
+    uploads: Sequence[UploadFile],
+    directory: Path,
+    *,
+    max_file_bytes: Optional[int] = None,
+    max_request_bytes: Optional[int] = None,
+) -> List[SavedUpload]:
+    """Spool every upload into ``directory`` under sanitized names.
+
+    Each file is limited to ``max_file_bytes`` and all files together to
+    ``max_request_bytes`` (:data:`MAX_FILE_BYTES` and :data:`MAX_REQUEST_BYTES`
+    by default). Files whose content hash matches an earlier file
+    in the same request are dropped, since they would only produce duplicate
+    results.
+    """
+
+    max_file_bytes = max_file_bytes or MAX_FILE_BYTES
+    max_request_bytes = max_request_bytes or MAX_REQUEST_BYTES
+    saved: List[SavedUpload] = []
+    seen: Dict[str, SavedUpload] = {}
+    taken: Set[str] = set()
+    remaining = max_request_bytes
+    for index, upload in enumerate(uploads):
+        dest = directory / safe_filename(upload.filename, index, taken)
+        try:
+            item = await spool_upload(upload, dest, min(max_file_bytes, remaining))
+        except UploadTooLarge:
+            if remaining < max_file_bytes:
+                raise UploadTooLarge(f"request exceeds the {max_request_bytes // (1024 * 1024)} MB upload limit") from None
+            raise
+        remaining -= item.size
+        if item.sha256 in seen:
+            item.path.unlink(missing_ok=True)
+            continue
+        seen[item.sha256] = item
+        saved.append(item)
+    return saved
+
+
+__all__ = ["MAX_FILE_BYTES", "MAX_REQUEST_BYTES", "SavedUpload", "UploadTooLarge", "safe_filename", "spool_upload", "spool_uploads"]
@@ -1,31 +1,37 @@
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
-import uuid
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from ..api import normalize_pdfs
-from ..export import export_csv, export_xlsx
-from ..models import ResultBundle
+from ..extract import StatementCache
+from . import workers
+from .jobs import JOBS_DB, JobStore, Sweeper, cancel_job, start_job
 from .licensing import verify_license
+from .uploads import MAX_REQUEST_BYTES, UploadTooLarge, spool_uploads
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 WEB_DIR = BASE_DIR / "web"
 OUTPUT_DIR = Path(os.environ.get("BANKNORM_OUTPUT", tempfile.gettempdir())) / "banknorm"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+UPLOAD_DIR = OUTPUT_DIR / "uploads"
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 app = FastAPI(title="Bank Normalizer")
 app.mount("/static", StaticFiles(directory=WEB_DIR / "static"), name="static")
 templates = Jinja2Templates(directory=str(WEB_DIR / "templates"))
 
-JOBS: Dict[str, Dict[str, Path]] = {}
+JOBS = JobStore(JOBS_DB or OUTPUT_DIR / "jobs.db", OUTPUT_DIR)
+SWEEPER = Sweeper(JOBS, upload_root=UPLOAD_DIR)
+SWEEPER.start()
+STATEMENT_CACHE = StatementCache()
 
 
 def license_dependency(request: Request) -> None:
@@ -36,10 +42,7 @@ def license_dependency(request: Request) -> None:
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request) -> HTMLResponse:
-    recent = [
-        {"job_id": job_id, "files": list(outputs.keys())}
-        for job_id, outputs in list(JOBS.items())[-5:]
-    ]
+    recent = [{"job_id": job.id, "files": list(job.outputs.keys())} for job in JOBS.recent()]
     return templates.TemplateResponse("index.html", {"request": request, "recent": recent})
 
 
@@ -51,44 +54,53 @@ async def extract_endpoint(
 ) -> JSONResponse:
     if not files:
         raise HTTPException(status_code=400, detail="No files uploaded")
-    temp_dir = Path(tempfile.mkdtemp(prefix="banknorm_"))
-    saved_paths: List[Path] = []
-    for upload in files:
-        dest = temp_dir / upload.filename
-        dest.write_bytes(await upload.read())
-        saved_paths.append(dest)
-    bundles = normalize_pdfs(saved_paths)
-    job_id = uuid.uuid4().hex
-    job_dir = OUTPUT_DIR / job_id
-    job_dir.mkdir(parents=True, exist_ok=True)
-    outputs: Dict[str, Path] = {}
-    response_payload: List[dict] = []
-    for index, bundle in enumerate(bundles):
-        csv_path = job_dir / f"bundle_{index}.csv"
-        export_csv(bundle.transactions, csv_path)
-        outputs[f"bundle_{index}.csv"] = csv_path
-        xlsx_path = job_dir / f"bundle_{index}.xlsx"
-        export_xlsx(bundle.transactions, xlsx_path)
-        outputs[f"bundle_{index}.xlsx"] = xlsx_path
-        response_payload.append(
-            {
-                "job_id": job_id,
-                "meta": bundle.meta.model_dump(),
-                "summary": bundle.summary,
-                "csv": f"/download/{job_id}/bundle_{index}.csv",
-                "xlsx": f"/download/{job_id}/bundle_{index}.xlsx",
-            }
-        )
-    JOBS[job_id] = outputs
-    return JSONResponse(response_payload)
+    declared = int(request.headers.get("content-length") or 0)
+    if declared > MAX_REQUEST_BYTES:
+        raise HTTPException(status_code=413, detail="Upload exceeds the request size limit")
+    temp_dir = Path(tempfile.mkdtemp(prefix="banknorm_", dir=UPLOAD_DIR))
+    try:
+        saved = await spool_uploads(files, temp_dir)
+    except UploadTooLarge as exc:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    saved_paths = [item.path for item in saved]
+    job = JOBS.create([item.filename for item in saved], upload_dir=temp_dir)
+    try:
+        start_job(JOBS, job, saved_paths, OUTPUT_DIR, STATEMENT_CACHE, digests={item.path: item.sha256 for item in saved})
+    except workers.QueueFull as exc:
+        JOBS.discard(job.id)
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    return JSONResponse({"job_id": job.id, "state": job.state, "status": f"/jobs/{job.id}"}, status_code=202)
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str, _license: None = Depends(license_dependency)) -> JSONResponse:
+    status = JOBS.snapshot(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JSONResponse(status)
+
+
+@app.post("/jobs/{job_id}/cancel")
+async def job_cancel(job_id: str, _license: None = Depends(license_dependency)) -> JSONResponse:
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    cancel_job(job)
+    return JSONResponse(JOBS.snapshot(job_id))
+
+
+@app.get("/workers")
+async def worker_metrics(_license: None = Depends(license_dependency)) -> JSONResponse:
+    return JSONResponse(workers.pool().metrics())
 
 
 @app.get("/download/{job_id}/{filename}")
 async def download(job_id: str, filename: str, _license: None = Depends(license_dependency)) -> FileResponse:
-    job_outputs = JOBS.get(job_id)
-    if not job_outputs:
+    job = JOBS.get(job_id, touch=True)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    path = job_outputs.get(filename)
+    path = job.outputs.get(filename)
     if not path or not path.exists():
         raise HTTPException(status_code=404, detail="File not found")
     return FileResponse(path)
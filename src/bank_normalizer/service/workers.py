@@ -1,19 +1,278 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Callable, Iterable, TypeVar
+import os
+import sys
+import threading
+import time
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 T = TypeVar("T")
 
-_executor = ThreadPoolExecutor(max_workers=4)
+WORKER_BACKEND = os.environ.get("BANKNORM_WORKER_BACKEND", "thread")
+WORKER_COUNT = int(os.environ.get("BANKNORM_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# Tasks accepted beyond those already running before submissions are rejected.
+QUEUE_LIMIT = int(os.environ.get("BANKNORM_WORKER_QUEUE", "64"))
+TASK_TIMEOUT = float(os.environ.get("BANKNORM_TASK_TIMEOUT", "0")) or None
+# Tasks a worker runs before it is replaced; 0 keeps workers for the pool's lifetime.
+MAX_TASKS_PER_WORKER = int(os.environ.get("BANKNORM_WORKER_MAX_TASKS", "0")) or None
 
+BACKENDS = ("thread", "process")
 
-def submit(fn: Callable[..., T], *args, **kwargs) -> Future[T]:
-    return _executor.submit(fn, *args, **kwargs)
+Call = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+class QueueFull(RuntimeError):
+    """Raised when a submission would exceed the pool's queue limit."""
+
+
+class TaskTimeout(TimeoutError):
+    """Raised by :meth:`Task.result` for a task that exceeded its timeout."""
+
+
+class Task:
+    """Handle for work submitted to a :class:`WorkerPool`.
+
+    A task settles once: when its future finishes, or when its timeout
+    expires first. Timing out cancels the task if it has not started; a
+    task that is already running cannot be interrupted, so it keeps its
+    worker until it returns but its result is discarded.
+    """
+
+    def __init__(self, future: Future) -> None:
+        self.future = future
+        self.submitted = time.monotonic()
+        self.timed_out = False
+        self._lock = threading.Lock()
+        self._settled = False
+        self._callbacks: List[Callable[["Task"], None]] = []
+        self._timer: Optional[threading.Timer] = None
+
+    def _start_timer(self, timeout: float, on_timeout: Callable[["Task"], None]) -> None:
+        def expire() -> None:
+            if self.future.done():
+                return
+            self.timed_out = True
+            on_timeout(self)
+            if not self.future.cancel():
+                self._settle()
+
+        self._timer = threading.Timer(timeout, expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _settle(self) -> None:
+        with self._lock:
+            if self._settled:
+                return
+            self._settled = True
+            callbacks, self._callbacks = self._callbacks, []
+        if self._timer is not None:
+            self._timer.cancel()
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback: Callable[["Task"], None]) -> None:
+        with self._lock:
+            if not self._settled:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def running(self) -> bool:
+        return self.future.running()
+
+    def done(self) -> bool:
+        return self._settled
+
+    def cancelled(self) -> bool:
+        return self.future.cancelled() and not self.timed_out
+
+    def cancel(self) -> bool:
+        """Cancel the task if it has not started running yet."""
+
+        return self.future.cancel()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if self.timed_out:
+            raise TaskTimeout("task exceeded its time limit")
+        return self.future.result(timeout)
+
+
+class WorkerPool:
+    """Executor with a bounded queue, per-task timeouts and worker recycling.
+
+    ``backend`` is ``"thread"`` or ``"process"``; process workers sidestep
+    the GIL for CPU-bound normalization but need picklable callables and
+    arguments. At most ``workers + queue_limit`` tasks are outstanding at
+    once; further submissions raise :class:`QueueFull`. With
+    ``max_tasks_per_worker`` process workers are replaced after that many
+    tasks, and a thread pool is swapped for a fresh one once it has run that
+    many tasks per thread.
+    """
+
+    def __init__(
+        self,
+        backend: str = WORKER_BACKEND,
+        workers: int = WORKER_COUNT,
+        *,
+        queue_limit: int = QUEUE_LIMIT,
+        timeout: Optional[float] = TASK_TIMEOUT,
+        max_tasks_per_worker: Optional[int] = MAX_TASKS_PER_WORKER,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown worker backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+        self.backend = backend
+        self.workers = max(workers, 1)
+        self.queue_limit = max(queue_limit, 0)
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._lock = threading.Lock()
+        self._active: Set[Task] = set()
+        self._executor_tasks = 0
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "timed_out": 0, "rejected": 0}
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> Executor:
+        if self.backend == "process":
+            kwargs: Dict[str, Any] = {}
+            if self.max_tasks_per_worker and sys.version_info >= (3, 11):
+                kwargs["max_tasks_per_child"] = self.max_tasks_per_worker
+            return ProcessPoolExecutor(max_workers=self.workers, **kwargs)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="banknorm-worker")
+
+    def _recycle(self) -> None:
+        """Swap in a fresh thread pool once the current one has run its quota."""
+
+        if self.backend == "process" and sys.version_info >= (3, 11):
+            return
+        if not self.max_tasks_per_worker or self._executor_tasks < self.max_tasks_per_worker * self.workers:
+            return
+        retired, self._executor = self._executor, self._new_executor()
+        self._executor_tasks = 0
+        retired.shutdown(wait=False)
+
+    def _finished(self, task: Task, future: Future) -> None:
+        with self._lock:
+            self._active.discard(task)
+            if future.cancelled():
+                if not task.timed_out:
+                    self._counts["cancelled"] += 1
+            elif future.exception() is not None:
+                self._counts["failed"] += 1
+            else:
+                self._counts["completed"] += 1
+        task._settle()
+
+    def _timed_out(self, _task: Task) -> None:
+        with self._lock:
+            self._counts["timed_out"] += 1
+
+    def submit_many(self, calls: Sequence[Call], timeout: Optional[float] = None) -> List[Task]:
+        """Submit ``(fn, args)`` calls together, or none of them if the queue is full."""
+
+        timeout = timeout if timeout is not None else self.timeout
+        with self._lock:
+            if len(self._active) + len(calls) > self.workers + self.queue_limit:
+                self._counts["rejected"] += len(calls)
+                raise QueueFull(
+                    f"worker queue is full ({len(self._active)} tasks outstanding, limit {self.workers + self.queue_limit})"
+                )
+            tasks = []
+            for fn, args in calls:
+                self._recycle()
+                task = Task(self._executor.submit(fn, *args))
+                self._executor_tasks += 1
+                self._active.add(task)
+                tasks.append(task)
+            self._counts["submitted"] += len(calls)
+        for task in tasks:
+            task.future.add_done_callback(partial(self._finished, task))
+            if timeout:
+                task._start_timer(timeout, self._timed_out)
+        return tasks
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> Task:
+        return self.submit_many([(fn, args)])[0]
+
+    def map(self, fn: Callable[[Any], T], items: Iterable[Any]) -> Iterator[T]:
+        """Apply ``fn`` to ``items`` in order, keeping at most ``workers`` tasks in flight."""
+
+        window: List[Task] = []
+        for item in items:
+            if len(window) >= self.workers:
+                yield window.pop(0).result()
+            window.append(self.submit(fn, item))
+        for task in window:
+            yield task.result()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            active = list(self._active)
+            counts = dict(self._counts)
+        running = sum(task.running() for task in active)
+        return {
+            "backend": self.backend,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "queued": len(active) - running,
+            "running": running,
+            "utilisation": running / self.workers,
+            **counts,
+        }
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def pool() -> WorkerPool:
+    """Process-wide pool configured from the ``BANKNORM_WORKER*`` settings."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+        return _pool
+
+
+def submit(fn: Callable[..., T], *args: Any) -> Task:
+    return pool().submit(fn, *args)
 
 
 def map_tasks(fn: Callable[[T], T], items: Iterable[T]) -> Iterable[T]:
-    return _executor.map(fn, items)
+    return pool().map(fn, items)
 
 
-__all__ = ["submit", "map_tasks"]
+__all__ = [
+    "CancelledError",
+    "QueueFull",
+    "Task",
+    "TaskTimeout",
+    "WorkerPool",
+    "map_tasks",
+    "pool",
+    "submit",
+]
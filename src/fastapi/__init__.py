@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import inspect
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
@@ -33,10 +34,13 @@ class Request:
 class UploadFile:
     def __init__(self, filename: str, data: bytes) -> None:
         self.filename = filename
-        self._data = data
+        self.file = io.BytesIO(data)
 
-    async def read(self) -> bytes:
-        return self._data
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    async def close(self) -> None:
+        self.file.close()
 
 
 @dataclass
@@ -10,10 +10,20 @@ class FieldInfo:
     default_factory: Optional[Callable[[], Any]] = None
 
 
-def Field(*, default: Any = None, default_factory: Optional[Callable[[], Any]] = None) -> FieldInfo:
+def Field(*, default: Any = None, default_factory: Optional[Callable[[], Any]] = None) -> Any:
     return FieldInfo(default=default, default_factory=default_factory)
 
 
+@dataclass
+class ModelPrivateAttr:
+    default: Any = None
+    default_factory: Optional[Callable[[], Any]] = None
+
+
+def PrivateAttr(default: Any = None, *, default_factory: Optional[Callable[[], Any]] = None) -> Any:
+    return ModelPrivateAttr(default=default, default_factory=default_factory)
+
+
 class BaseModel:
     model_config: Dict[str, Any] = {}
 
@@ -24,7 +34,7 @@ class BaseModel:
                 value = data[name]
             else:
                 attr = getattr(self.__class__, name, None)
-                if isinstance(attr, FieldInfo):
+                if isinstance(attr, (FieldInfo, ModelPrivateAttr)):
                     if attr.default_factory is not None:
                         value = attr.default_factory()
                     else:
@@ -35,7 +45,10 @@ class BaseModel:
 
     def model_dump(self, mode: str | None = None) -> Dict[str, Any]:
         annotations = getattr(self, "__annotations__", {})
-        return {name: getattr(self, name) for name in annotations}
+        data = {name: getattr(self, name) for name in annotations if not name.startswith("_")}
+        return {
+            name: value.model_dump(mode) if isinstance(value, BaseModel) else value for name, value in data.items()
+        }
 
 
-__all__ = ["BaseModel", "Field"]
+__all__ = ["BaseModel", "Field", "PrivateAttr"]
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
 from bank_normalizer.api import normalize_pdfs
+from bank_normalizer.config import banks as banks_config
+from bank_normalizer.extract.parse_table import ParsedRow
+from bank_normalizer.extract.pdf_reader import PDFPage, PDFStatement
+from bank_normalizer.normalize import normalize_rows
+from bank_normalizer.normalize.banks import BankDetector, load_bank_profiles
+from bank_normalizer.normalize.columns import ColumnPlan, column_plan
 
 from .utils_pdf import build_bank_pdf
 
-
 BANKS = ["ANZ", "CBA", "NAB", "Westpac"]
 
 
@@ -16,3 +22,42 @@ def test_bank_detection(tmp_path: Path) -> None:
         bundle = normalize_pdfs([pdf])[0]
         assert bank in bundle.meta.bank
         assert bundle.meta.pages >= 1
+
+
+def test_bank_detector_scores_all_profiles_in_one_scan() -> None:
+    detector = BankDetector.from_config(banks_config.BANKS)
+    text = "Commonwealth Bank of Australia\nCBA statement\n" + "filler line\n" * 5000 + "WESTPAC"
+    statement = PDFStatement(path=Path("cba.pdf"), pages=[PDFPage(number=1, text=text)])
+    scores = dict(zip((profile.name for profile in detector.profiles), detector.scores(text)))
+    assert scores["CBA"] == 1.0
+    assert scores["Westpac"] == 0.0
+    assert detector.select(statement).name == "CBA"
+
+
+def test_column_plan_comes_from_profile_and_config() -> None:
+    entry = dict(banks_config.BANKS[0], columns={"Narrative": "description", "Paid Out": "debit"})
+    profile = load_bank_profiles([entry])[0]
+    header = ("Txn Date", "Narrative", "Paid Out", "balance")
+    plan = column_plan(header, profile.column_map())
+    assert plan == ColumnPlan(date=None, description="Narrative", debit="Paid Out", credit=None, balance="balance", amount=None)
+    assert column_plan(header, profile.column_map()) is plan
+
+    header = ("Date", "Narrative", "Paid Out", "Balance")
+    rows = [ParsedRow(page=1, raw=dict(zip(header, ["03/01/2023", "RENT", "1,200.00", "50.00"])), header=header)]
+    (row,) = normalize_rows(rows, profile, profile.name)
+    assert (row.description, row.amount, row.balance) == ("RENT", -1200.0, 50.0)
+
+    with pytest.raises(ValueError, match="mapping"):
+        load_bank_profiles([dict(banks_config.BANKS[0], columns=["Narrative"])])
+
+
+def test_bank_detector_ties_go_to_the_first_profile() -> None:
+    class Profile:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+    detector = BankDetector([Profile("first"), Profile("second")], [["ALPHA"], ["BETA"]])  # type: ignore[list-item]
+    text = "beta statement\n" + "filler line\n" * 50 + "alpha"
+    statement = PDFStatement(path=Path("tie.pdf"), pages=[PDFPage(number=1, text=text)])
+    assert detector.scores(text) == [1.0, 1.0]
+    assert detector.select(statement).name == "first"
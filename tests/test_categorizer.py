@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from bank_normalizer.normalize import Categorizer
+
+
+def test_categorizer_keeps_category_precedence(tmp_path: Path) -> None:
+    config = tmp_path / "categories.yaml"
+    config.write_text(
+        '{"categories": {"RENT": ["RENT"], "LOANS": ["LOAN\\\\s+REPAY", "MORTGAGE"],'
+        ' "FEES": ["FEE"], "TRANSFER": ["TRANSFER", "^TFR\\\\b"]}}',
+        encoding="utf-8",
+    )
+    categorizer = Categorizer(config)
+    assert categorizer.categorize_many(
+        ["transfer rent", "Monthly fee loan  repay", "TFR to savings", "groceries"]
+    ) == ["RENT", "LOANS", "TRANSFER", None]
+    assert categorizer.categorize("account fee") == "FEES"
+
+
+def test_categorizer_cache_is_shared_and_reset_on_config_change(tmp_path: Path) -> None:
+    config = tmp_path / "categories.yaml"
+    config.write_text('{"categories": {"GROCERIES": ["WOOLWORTHS"]}}', encoding="utf-8")
+    first = Categorizer(config)
+    assert first.categorize("WOOLWORTHS 1234 SYDNEY") == "GROCERIES"
+    second = Categorizer(config)
+    assert second.categorize("woolworths  1234 sydney") == "GROCERIES"
+    stats = second.cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    config.write_text('{"categories": {"SUPERMARKET": ["WOOLWORTHS"]}}', encoding="utf-8")
+    os.utime(config, ns=(0, 0))
+    assert second.refresh(force=True)
+    assert second.categorize("WOOLWORTHS 1234 SYDNEY") == "SUPERMARKET"
+    assert first.cache is not second.cache and len(first.cache) == 1
+
+    # A categorizer still on the old rules must not leak them into the new cache.
+    assert first.categorize("WOOLWORTHS METRO") == "GROCERIES"
+    assert Categorizer(config).categorize("WOOLWORTHS METRO") == "SUPERMARKET"
+
+
+def test_categorizer_matches_backreference_rules_on_their_own(tmp_path: Path) -> None:
+    config = tmp_path / "categories.yaml"
+    config.write_text(
+        '{"categories": {"FEES": ["FEE"], "DUPLICATE": ["\\\\b(\\\\w+) \\\\1\\\\b"], "TRANSFER": ["TF+R"]}}',
+        encoding="utf-8",
+    )
+    categorizer = Categorizer(config)
+    assert categorizer.categorize_many(["fee fee", "tfr tfr", "tfr savings", "pay rent"]) == [
+        "FEES",
+        "DUPLICATE",
+        "TRANSFER",
+        None,
+    ]
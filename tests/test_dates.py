@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from bank_normalizer.extract import dates
+from bank_normalizer.extract.dates import DateParser, infer_period, parse_dates
+
+
+def test_dates_pin_format_and_infer_year_from_period() -> None:
+    period = infer_period("Statement period 20/12/2022 to 19/01/2023")
+    assert period == (date(2022, 12, 20), date(2023, 1, 19))
+    parser = DateParser(period=period)
+    parsed = parser.parse_dates(["28-Dec", "31 Dec", "05-Jan", "05-Jan", "bogus"])
+    assert parsed[:4] == [
+        datetime(2022, 12, 28),
+        datetime(2022, 12, 31),
+        datetime(2023, 1, 5),
+        datetime(2023, 1, 5),
+    ]
+    assert parsed[4] is None
+    assert parser.pinned is not None and parser.pinned.name == "dd mon"
+
+
+def test_dates_numeric_formats() -> None:
+    assert parse_dates(["01/02/2023", "2023-02-03", "04.02.23"]) == [
+        datetime(2023, 2, 1),
+        datetime(2023, 2, 3),
+        datetime(2023, 2, 4),
+    ]
+
+
+def test_parse_date_only_memoizes_values_with_a_year() -> None:
+    assert dates.parse_date("15/03/2023") == datetime(2023, 3, 15)
+    assert dates.parse_date("15 Mar") is not None
+    assert "15/03/2023" in dates._PARSED and "15 Mar" not in dates._PARSED
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from bank_normalizer.engine import Normalizer
+from bank_normalizer.normalize import DedupIndex
+
+from .utils_pdf import TEMPLATE, build_bank_pdf
+
+
+def _write_statement(path: Path, rows: list[str], account: str = "012-345 678901") -> Path:
+    text = TEMPLATE.format(bank="ANZ", rows="\n".join(rows))
+    path.write_text(f"Account Number: {account}\n{text}" if account else text, encoding="utf-8")
+    return path
+
+
+def test_overlapping_statements_are_deduplicated(tmp_path: Path) -> None:
+    january = _write_statement(
+        tmp_path / "jan.pdf",
+        [
+            "28/01/2023  WOOLWORTHS 1234  20.00  0.00  980.00",
+            "30/01/2023  COFFEE  4.50  0.00  975.50",
+            "30/01/2023  COFFEE  4.50  0.00  971.00",
+        ],
+    )
+    february = _write_statement(
+        tmp_path / "feb.pdf",
+        [
+            "30/01/2023  COFFEE  4.50  0.00  971.00",
+            "01/02/2023  SALARY  0.00  2500.00  3471.00",
+        ],
+    )
+    first, second = Normalizer().normalize([january, february])
+    assert len(first.transactions) == 3
+    assert [txn.description for txn in second.transactions] == ["SALARY"]
+    assert second.meta.warnings == ["1 transaction(s) overlap with jan.pdf and were skipped as duplicates"]
+    assert second.summary["totals"] == {"2023-02": 2500.0}
+    assert first.meta.account_last4 == "8901"
+
+
+def test_rows_from_different_accounts_are_not_duplicates(tmp_path: Path) -> None:
+    rows = ["30/01/2023  COFFEE  4.50  0.00", "31/01/2023  SALARY  0.00  2500.00"]
+    index = DedupIndex(tmp_path / "dedup.db")
+    everyday = _write_statement(tmp_path / "everyday.pdf", rows, account="111111111")
+    savings = _write_statement(tmp_path / "savings.pdf", rows, account="222222222")
+    first, second = Normalizer(dedup=index).normalize([everyday, savings])
+    assert len(first.transactions) == len(second.transactions) == 2
+    assert not second.meta.warnings
+    assert {txn.account for txn in second.transactions} == {"222222222"}
+
+    # Without an account number only a re-upload of the same file overlaps.
+    plain_a = _write_statement(tmp_path / "a.pdf", rows, account="")
+    plain_b = _write_statement(tmp_path / "b.pdf", rows + ["01/02/2023  RENT  1200.00  0.00"], account="")
+    a, b, again = Normalizer(dedup=index).normalize([plain_a, plain_b, plain_a])
+    assert (len(a.transactions), len(b.transactions), len(again.transactions)) == (2, 3, 0)
+
+
+def test_persisted_index_spans_runs(tmp_path: Path) -> None:
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    index = DedupIndex(tmp_path / "dedup.db")
+    bundle = Normalizer(dedup=index).normalize([pdf])[0]
+    assert bundle.transactions and not bundle.meta.warnings
+    index.close()
+
+    again = Normalizer().normalize([pdf], dedup=DedupIndex(tmp_path / "dedup.db"))[0]
+    assert not again.transactions
+    assert again.meta.period_start == bundle.meta.period_start
+    assert "overlap with anz.pdf" in again.meta.warnings[0]
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import csv
-import csv
+import gzip
 import zipfile
+from datetime import date
 from pathlib import Path
 
 from bank_normalizer.api import normalize_pdfs
 from bank_normalizer.export import export_csv, export_xlsx
 from bank_normalizer.export.lender_profiles import load_lender_profiles
+from bank_normalizer.export.summary import SummaryRow, build_summary, default_accumulators
 from bank_normalizer.config import lenders as lenders_config
 
 from .utils_pdf import build_bank_pdf
@@ -30,6 +32,41 @@ def test_csv_and_xlsx_exports(tmp_path: Path) -> None:
         assert b"WOOLWORTHS" in sheet
 
 
+def test_csv_streams_iterators_with_gzip_and_append(tmp_path: Path) -> None:
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    frame = normalize_pdfs([pdf])[0].transactions
+    path = tmp_path / "out.csv.gz"
+    export_csv(frame, path)
+    export_csv((txn for txn in frame), path, append=True, chunk_bytes=64)
+    with gzip.open(path, "rt", newline="") as fh:
+        header, *rows = list(csv.reader(fh))
+    assert header[0] == "date"
+    assert len(rows) == 2 * len(frame)
+    assert rows[: len(frame)] == rows[len(frame) :]
+
+    plain = export_csv(iter(frame), tmp_path / "plain.csv")
+    with plain.open(newline="") as fh:
+        assert list(csv.reader(fh))[1:] == rows[: len(frame)]
+
+
+def test_xlsx_typed_cells_shared_strings_and_summary(tmp_path: Path) -> None:
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    bundle = normalize_pdfs([pdf])[0]
+    path = export_xlsx(iter(bundle.transactions), tmp_path / "out.xlsx", summary=bundle.summary)
+    first = bundle.transactions[0]
+    with zipfile.ZipFile(path) as zf:
+        sheet = zf.read("xl/worksheets/sheet1.xml").decode()
+        shared = zf.read("xl/sharedStrings.xml").decode()
+        assert "Summary" in zf.read("xl/workbook.xml").decode()
+        assert "totals" in shared
+        assert zf.read("xl/worksheets/sheet2.xml")
+    serial = first.date.toordinal() - date(1899, 12, 30).toordinal()
+    assert f"<c s='1'><v>{serial}</v></c>" in sheet
+    assert f"<c s='2'><v>{first.amount:.2f}</v></c>" in sheet
+    assert f"<t xml:space='preserve'>{first.bank}</t>" in shared
+    assert f">{first.bank}<" not in sheet
+
+
 def test_lender_profile_transform(tmp_path: Path) -> None:
     pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
     bundle = normalize_pdfs([pdf])[0]
@@ -38,3 +75,29 @@ def test_lender_profile_transform(tmp_path: Path) -> None:
     rows = [profile.transform(txn) for txn in bundle.transactions]
     profile.validate(rows)
     assert rows
+
+
+def test_summary_single_pass_with_custom_accumulator(tmp_path: Path) -> None:
+    class LargestDebit:
+        name = "largest_debit"
+        keywords = {"rent": ["RENT"]}
+
+        def __init__(self) -> None:
+            self.cents = 0
+            self.rent_rows = 0
+
+        def add(self, row: SummaryRow) -> None:
+            self.cents = min(self.cents, row.cents)
+            self.rent_rows += "rent" in row.matches
+
+        def result(self) -> dict:
+            return {"amount": self.cents / 100, "rent_rows": self.rent_rows}
+
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    bundle = normalize_pdfs([pdf])[0]
+    transactions = list(bundle.transactions)
+    summary = build_summary(transactions, {}, accumulators=[*default_accumulators(), LargestDebit()])
+    assert summary["totals"] == bundle.summary["totals"] == {"2023-01": -141.0, "2023-02": 1300.0}
+    assert summary["liabilities"]["rent"] == 1200.0
+    assert summary["fees"] == {}
+    assert summary["largest_debit"] == {"amount": -1200.0, "rent_rows": 1}
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bank_normalizer import engine
+from bank_normalizer.extract import (
+    StatementCache,
+    iter_pdf_pages,
+    iter_statement_rows,
+    ocr_fallback,
+    parse_statement_rows,
+    pdf_reader,
+    read_pdf,
+)
+from bank_normalizer.extract.parse_table import HeaderLayout
+from bank_normalizer.extract.pdf_reader import PDFPage
+
+from .utils_pdf import build_bank_pdf
+
+
+def test_streaming_rows_carry_header_across_pages(tmp_path: Path) -> None:
+    path = tmp_path / "multi.txt"
+    path.write_text(
+        "ANZ STATEMENT\nDate  Description  Debit  Credit  Balance\n"
+        "01/01/2023  WOOLWORTHS  10.00  0.00  90.00\n"
+        "\f"
+        "02/01/2023  COLES  5.00  0.00  85.00\n"
+        "SUPERMARKET CONTINUED\n",
+        encoding="utf-8",
+    )
+    pages = list(iter_pdf_pages(path))
+    assert [page.number for page in pages] == [1, 2]
+    rows = list(iter_statement_rows(iter_pdf_pages(path)))
+    assert [row.page for row in rows] == [1, 2]
+    assert rows[1].raw["Description"] == "COLES SUPERMARKET CONTINUED"
+    assert [row.raw for row in parse_statement_rows(read_pdf(path))] == [row.raw for row in rows]
+
+
+def test_statement_cache_replays_without_parsing(tmp_path: Path, monkeypatch) -> None:
+    cache = StatementCache(tmp_path / "cache")
+    assert not cache.directory.exists()
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    first = engine.Normalizer().normalize([pdf], cache=cache)[0]
+    resubmitted = build_bank_pdf("ANZ", tmp_path / "resubmitted.pdf")
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("statement was re-extracted")
+
+    monkeypatch.setattr(engine, "iter_pdf_pages", _fail)
+    second = engine.Normalizer().normalize([resubmitted], cache=cache)[0]
+    assert second.meta.bank == first.meta.bank
+    assert second.meta.pages == first.meta.pages
+    assert [txn.id for txn in second.transactions] == [txn.id for txn in first.transactions]
+
+
+def test_fixed_width_rows_keep_blank_cells_aligned(tmp_path: Path) -> None:
+    widths = (12, 24, 10, 10, 10)
+    lines = [
+        ("Date", "Description", "Debit", "Credit", "Balance"),
+        ("01/01/2023", "WOOLWORTHS", "10.00", "", "90.00"),
+        ("02/01/2023", "SALARY", "", "2500.00", "2590.00"),
+    ]
+    text = "\n".join("".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines)
+    path = tmp_path / "aligned.txt"
+    path.write_text(f"NAB STATEMENT\n{text}\n", encoding="utf-8")
+    rows = list(iter_statement_rows(iter_pdf_pages(path)))
+    assert rows[0].raw["Debit"] == "10.00" and rows[0].raw["Credit"] == ""
+    assert rows[1].raw["Debit"] == "" and rows[1].raw["Credit"] == "2500.00"
+    assert rows[1].raw["Balance"] == "2590.00"
+
+
+def test_fixed_width_falls_back_when_row_does_not_fit_header() -> None:
+    layout = HeaderLayout.from_line("Date        Description              Debit    Credit   Balance")
+    line = "01/01/2023  COFFEE  4.50  0.00  975.50"
+    assert layout.slice(line) is None
+    page = PDFPage(number=1, text=f"Date        Description              Debit    Credit   Balance\n{line}\n")
+    (row,) = iter_statement_rows([page])
+    assert row.raw == {
+        "Date": "01/01/2023",
+        "Description": "COFFEE",
+        "Debit": "4.50",
+        "Credit": "0.00",
+        "Balance": "975.50",
+    }
+
+
+def test_parallel_extraction_keeps_page_order_and_threshold(monkeypatch) -> None:
+    calls = []
+
+    def fake_range(path: str, start: int, stop: int):
+        calls.append((start, stop))
+        time.sleep(0.002 * (8 - start // pdf_reader.PAGES_PER_TASK % 8))  # early ranges finish last
+        return [(index + 1, f"page {index + 1}", 0.0) for index in range(start, stop)]
+
+    def fake_serial(path: Path):
+        yield PDFPage(number=1, text="serial")
+
+    page_count = pdf_reader.PARALLEL_MIN_PAGES * 2 + 3
+    monkeypatch.setattr(pdf_reader, "_extract_page_range", fake_range)
+    monkeypatch.setattr(pdf_reader, "_executor", lambda workers: ThreadPoolExecutor(max_workers=workers))
+    monkeypatch.setattr(pdf_reader, "_iter_serial", fake_serial)
+
+    monkeypatch.setattr(pdf_reader, "_page_count", lambda path: page_count)
+    pages = list(pdf_reader._iter_pdfplumber_pages(Path("big.pdf"), workers=4))
+    assert [page.number for page in pages] == list(range(1, page_count + 1))
+    assert [page.text for page in pages][-1] == f"page {page_count}"
+    assert sorted(calls)[0] == (0, pdf_reader.PAGES_PER_TASK) and sorted(calls)[-1][1] == page_count
+
+    calls.clear()
+    assert [page.text for page in pdf_reader._iter_pdfplumber_pages(Path("big.pdf"), workers=1)] == ["serial"]
+    monkeypatch.setattr(pdf_reader, "_page_count", lambda path: pdf_reader.PARALLEL_MIN_PAGES - 1)
+    assert [page.text for page in pdf_reader._iter_pdfplumber_pages(Path("small.pdf"), workers=4)] == ["serial"]
+    assert not calls
+
+
+def test_ocr_only_fills_blank_pages_in_order_and_reuses_cache(tmp_path: Path, monkeypatch) -> None:
+    rendered, ocred = [], []
+
+    class FakeImage:
+        def __init__(self, number: int) -> None:
+            self.number = number
+
+        def tobytes(self) -> bytes:
+            return f"scan {self.number}".encode()
+
+    def fake_render(path: str, number: int, dpi: int = ocr_fallback.OCR_DPI) -> FakeImage:
+        rendered.append((Path(path).name, number))
+        return FakeImage(number)
+
+    def fake_ocr(image: FakeImage) -> str:
+        ocred.append(image.number)
+        time.sleep(0.01 if image.number == 1 else 0)  # the first blank page finishes last
+        return f"ocr {image.number}"
+
+    def pages():
+        return [PDFPage(1, ""), PDFPage(2, "digital 2"), PDFPage(3, "  \n"), PDFPage(4, "digital 4")]
+
+    monkeypatch.setattr(ocr_fallback, "render_page", fake_render)
+    monkeypatch.setattr(ocr_fallback, "ocr_image", fake_ocr)
+    monkeypatch.setattr(ocr_fallback, "_executor", lambda workers: ThreadPoolExecutor(max_workers=workers))
+    cache_dir = tmp_path / "ocr"
+
+    def run(name: str, digest: str) -> list:
+        return list(ocr_fallback.ocr_blank_pages(tmp_path / name, pages(), digest=digest, workers=2, cache_dir=cache_dir))
+
+    first = run("scan.pdf", "aaa")
+    assert [(page.number, page.text) for page in first] == [
+        (1, "ocr 1"),
+        (2, "digital 2"),
+        (3, "ocr 3"),
+        (4, "digital 4"),
+    ]
+    assert sorted(ocred) == [1, 3] and sorted(rendered) == [("scan.pdf", 1), ("scan.pdf", 3)]
+
+    # The same file again is served without rasterising; the same scans in
+    # another file are rasterised but not OCRed.
+    rendered.clear()
+    ocred.clear()
+    assert [page.text for page in run("scan.pdf", "aaa")] == [page.text for page in first]
+    assert [page.text for page in run("copy.pdf", "bbb")] == [page.text for page in first]
+    assert ocred == [] and sorted(rendered) == [("copy.pdf", 1), ("copy.pdf", 3)]
+
+    ocr_fallback.evict_ocr_cache(cache_dir, max_bytes=0)
+    assert not [path for path in cache_dir.rglob("*") if path.is_file()]
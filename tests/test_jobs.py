@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from bank_normalizer.service.jobs import DONE, JobStore, Sweeper
+
+
+def _finished_job(store: JobStore, output_dir: Path, size: int) -> str:
+    upload_dir = output_dir / "uploads" / "tmp"
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    job = store.create(["a.pdf"], upload_dir=upload_dir)
+    (output_dir / job.id).mkdir()
+    artifact = output_dir / job.id / "bundle_0.csv"
+    artifact.write_bytes(b"x" * size)
+    store.add_result(job.id, {"file": "a.pdf"}, [artifact])
+    store.update(job.id, 0, state=DONE, transactions=3)
+    store.update(job.id, state=DONE)
+    return job.id
+
+
+def test_job_store_persists_across_instances(tmp_path: Path) -> None:
+    db = tmp_path / "jobs.db"
+    job_id = _finished_job(JobStore(db, tmp_path), tmp_path, 10)
+    status = JobStore(db, tmp_path).snapshot(job_id)
+    assert status is not None
+    assert (status["state"], status["completed"], status["results"]) == (DONE, 1, [{"file": "a.pdf"}])
+    assert status["files"][0]["transactions"] == 3
+
+
+def test_sweep_expires_jobs_and_enforces_quota(tmp_path: Path) -> None:
+    store = JobStore(tmp_path / "jobs.db", tmp_path, ttl=60, quota=250)
+    oldest, middle, newest = (_finished_job(store, tmp_path, 100) for _ in range(3))
+    assert store.get(oldest, touch=True) is not None
+    assert store.sweep() == [middle]
+    assert not (tmp_path / middle).exists()
+    assert store.get(oldest) is not None
+
+    removed = store.sweep(now=time.time() + 120)
+    assert sorted(removed) == sorted([oldest, newest])
+    assert store.get(newest) is None and not (tmp_path / newest).exists()
+
+    stale = tmp_path / "uploads" / "orphan"
+    stale.mkdir(parents=True)
+    Sweeper(JobStore(tmp_path / "jobs.db", tmp_path, ttl=-1), upload_root=tmp_path / "uploads").sweep()
+    assert not stale.exists()
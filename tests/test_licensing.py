@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+from bank_normalizer.service.licensing import (
+    LicenseRecord,
+    LicenseStore,
+    sign_license,
+    verify_license,
+)
+
+
+def test_license_lookups_are_cached_and_invalidated(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("LICENSE_BYPASS", raising=False)
+    store = LicenseStore(tmp_path / "licenses.db", ttl=3600)
+    other = LicenseStore(tmp_path / "licenses.db")
+    token = sign_license("lic-1")
+    try:
+        assert not verify_license(token, store)
+        store.upsert(LicenseRecord("lic-1", "a@example.com"))
+        assert verify_license(token, store)
+        assert not verify_license(token + "0", store)
+
+        # A change made elsewhere is served from the cache until invalidated.
+        other.upsert(LicenseRecord("lic-1", "a@example.com", active=False))
+        assert verify_license(token, store)
+        store.invalidate("lic-1")
+        assert not verify_license(token, store)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(other.is_active("lic-1"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [False] * 4
+        finished = [conn for thread, conn in other._connections.items() if thread is not threading.main_thread()]
+        assert finished
+
+        # Opening a connection on a new thread closes those of exited threads.
+        extra = threading.Thread(target=other._connection)
+        extra.start()
+        extra.join()
+        assert set(other._connections) == {threading.main_thread(), extra}
+        for conn in finished:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+    finally:
+        store.close()
+        other.close()
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from bank_normalizer.normalize.merchants import MerchantIndex
+
+
+def test_merchant_index_exact_and_fuzzy_with_large_dictionary() -> None:
+    synthetic = [f"MERCHANT{index:05d} PTY" for index in range(10_000)]
+    index = MerchantIndex(["WOOLWORTHS", "ZIP PAY", "BUNNINGS", *synthetic])
+    assert len(index) == 10_003
+    assert index.infer("woolworths 1234 sydney") == "WOOLWORTHS"
+    assert index.infer("EFTPOS BUNNING WAREHOUSE") == "BUNNINGS"
+    assert index.infer("MERCHANT04321 PTY LTD") == "MERCHANT04321 PTY"
+    assert index.infer("SALARY") is None
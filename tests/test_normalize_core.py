@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import json
+import os
+import shutil
+from datetime import datetime
 from pathlib import Path
 
 from bank_normalizer.api import normalize_pdfs
-from bank_normalizer.models import ResultBundle
+from bank_normalizer.engine import CONFIG_DIR, Normalizer
+from bank_normalizer.extract import parse_statement_rows, read_pdf
+from bank_normalizer.frame import TransactionFrame
+from bank_normalizer.normalize import normalize_frame, normalize_rows
+from bank_normalizer.normalize.rules_engine import to_transactions
+from bank_normalizer.models import ResultBundle, StatementMeta, Transaction
 
 from .utils_pdf import build_bank_pdf
 
@@ -20,3 +29,67 @@ def test_normalization_basic(tmp_path: Path) -> None:
     amounts = [txn.amount for txn in bundle.transactions]
     assert any(amount < 0 for amount in amounts)
     assert any(txn.category == "GROCERIES" for txn in bundle.transactions)
+    assert all(txn.raw.get("Description") for txn in bundle.transactions)
+
+
+def test_normalizer_reloads_changed_config(tmp_path: Path) -> None:
+    config_dir = tmp_path / "config"
+    shutil.copytree(CONFIG_DIR, config_dir, ignore=shutil.ignore_patterns("*.py", "__pycache__"))
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    normalizer = Normalizer(config_dir, reload_interval=3600)
+    state = normalizer.state
+    assert not normalizer.reload()
+    assert normalizer.state is state
+
+    categories = config_dir / "categories.yaml"
+    categories.write_text('{"categories": {"SUPERMARKET": ["WOOLWORTHS"]}}', encoding="utf-8")
+    os.utime(categories, ns=(0, 0))
+    assert normalizer.reload()
+    assert normalizer.state is not state
+    bundle = normalizer.normalize([pdf])[0]
+    assert any(txn.category == "SUPERMARKET" for txn in bundle.transactions)
+    assert not any(txn.category == "GROCERIES" for txn in bundle.transactions)
+
+
+def test_frame_matches_row_pipeline(tmp_path: Path) -> None:
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    statement = read_pdf(pdf)
+    profile = Normalizer().state.detector.select(statement)
+    rows = parse_statement_rows(statement)
+    expected = to_transactions(normalize_rows(rows, profile, profile.name), profile.name)
+    frame = normalize_frame(rows, profile, profile.name, keep_raw=True)
+    assert len(frame) == len(expected)
+    for txn, lazy in zip(expected, frame):
+        assert lazy.model_dump() == txn.model_dump()
+    assert frame[-1].id == expected[-1].id
+    assert len(frame.banks.values) == 2
+    assert TransactionFrame.from_transactions(expected).id(0) == expected[0].id
+
+
+def test_trusted_construction_matches_model_init() -> None:
+    columns = {
+        "id": ["a", "b"],
+        "date": [datetime(2024, 1, 2), datetime(2024, 1, 3)],
+        "description": ["RENT", "PAY"],
+        "amount": [-100.0, 50.0],
+        "bank": ["ANZ", "ANZ"],
+        "credit": [None, 50.0],
+    }
+    built = Transaction.build_many(columns)
+    expected = [Transaction(**dict(zip(columns, values))) for values in zip(*columns.values())]
+    assert [txn.model_dump() for txn in built] == [txn.model_dump() for txn in expected]
+
+
+def test_result_bundle_keeps_frame_and_dumps_transactions(tmp_path: Path) -> None:
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    frame = normalize_pdfs([pdf])[0].frame
+    meta = StatementMeta(bank="ANZ", pages=1)
+    bundle = ResultBundle(meta=meta, transactions=frame, liabilities={}, summary={})
+    assert bundle.transactions is frame and bundle.frame is frame
+    dumped = bundle.model_dump(mode="json")
+    assert set(dumped) == {"meta", "transactions", "liabilities", "summary"}
+    assert dumped["transactions"] == [txn.model_dump(mode="json") for txn in frame]
+    assert [txn["id"] for txn in json.loads(bundle.to_json())["transactions"]] == [txn.id for txn in frame]
+
+    listed = ResultBundle(meta=meta, transactions=list(frame), liabilities={}, summary={})
+    assert isinstance(listed.frame, TransactionFrame) and listed.frame.id(0) == frame.id(0)
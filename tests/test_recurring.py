@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from pathlib import Path
 
 from bank_normalizer.models import Transaction
 from bank_normalizer.normalize.recurring import detect_recurring
+from bank_normalizer.normalize.recurring_state import RecurringStore
 
 
 def test_recurring_detection() -> None:
@@ -32,3 +34,74 @@ def test_recurring_detection() -> None:
     series = next(iter(recurring.values()))
     assert series.occurrences == 4
     assert 25 < series.average_interval_days < 35
+
+
+def _txn(index: int, day: datetime, description: str, amount: float) -> Transaction:
+    return Transaction(id=str(index), date=day, description=description, amount=amount, bank="ANZ")
+
+
+def test_recurring_clusters_descriptions_and_tolerates_missed_cycles() -> None:
+    base = datetime(2023, 1, 3)
+    txns = [
+        _txn(i, base + timedelta(days=30 * month), f"NETFLIX.COM {10000 + i}", -15.99)
+        for i, month in enumerate([0, 1, 2, 4, 5])
+    ]
+    txns += [_txn(10 + i, base + timedelta(days=14 * i), "GYM DIRECT DEBIT", -30.0) for i in range(6)]
+    txns += [_txn(20 + i, base + timedelta(days=9 * i * i), "CAFE", -4.5) for i in range(5)]
+    recurring = detect_recurring(txns)
+    assert set(recurring) == {"NETFLIX", "GYM"}
+    netflix = recurring["NETFLIX"]
+    assert (netflix.cadence, netflix.occurrences, netflix.missed_cycles) == ("monthly", 5, 1)
+    assert abs(netflix.average_amount - 15.99) < 1e-9
+    assert recurring["GYM"].cadence == "fortnightly"
+
+
+def test_recurring_keeps_incoming_and_outgoing_series_of_one_merchant() -> None:
+    base = datetime(2023, 1, 2)
+    txns = [_txn(i, base + timedelta(days=14 * i), "ACME PAYROLL", 2500.0) for i in range(4)]
+    txns += [_txn(10 + i, base + timedelta(days=30 * i + 5), "ACME PAYROLL", -40.0) for i in range(4)]
+    recurring = detect_recurring(txns)
+    assert set(recurring) == {"ACME PAYROLL", "ACME PAYROLL (incoming)"}
+    paid, received = recurring["ACME PAYROLL"], recurring["ACME PAYROLL (incoming)"]
+    assert (paid.outgoing, paid.cadence, paid.average_amount) == (True, "monthly", 40.0)
+    assert (received.outgoing, received.cadence, received.average_amount) == (False, "fortnightly", 2500.0)
+
+
+def test_recurring_store_updates_series_incrementally(tmp_path: Path) -> None:
+    base = datetime(2023, 1, 1)
+
+    def upload(store: RecurringStore, *days: int):
+        txns = [_txn(day, base + timedelta(days=day), "RENT PAYMENT 0041", -1200.0) for day in days]
+        txns.append(_txn(999, base + timedelta(days=max(days)), f"CAFE {max(days)}", -4.5))
+        return store.update("acct-1", txns)
+
+    store = RecurringStore(tmp_path / "recurring.db")
+    assert not any(vars(upload(store, 0, 30)).values())
+    first = upload(store, 60)
+    assert first.new["RENT"].occurrences == 3 and first.new["RENT"].cadence == "monthly"
+    assert not upload(store, 45, 60).extended  # already-seen dates are ignored
+    store.close()
+
+    store = RecurringStore(tmp_path / "recurring.db")
+    second = upload(store, 121)
+    assert (second.extended["RENT"].occurrences, second.extended["RENT"].missed_cycles) == (4, 1)
+    assert upload(store, 400).broken["RENT"].occurrences == 4
+    assert "RENT" not in store.series("acct-1")
+
+    # One-off candidates are dropped once they are older than the longest cadence.
+    store.update("acct-2", [_txn(1, base, "FLORIST 11", -80.0)])
+    assert not store.update("acct-2", [_txn(2, base + timedelta(days=400), "BAKERY 12", -6.0)]).broken
+    keys = store._conn.execute("SELECT key FROM recurring_series WHERE account = 'acct-2'").fetchall()
+    assert keys == [("BAKERY",)]
+
+
+def test_recurring_skips_extra_charges_and_reports_latest_run() -> None:
+    base = datetime(2022, 1, 10)
+    months = [0, 1, 2, 8, 9, 10, 11]
+    txns = [_txn(i, base + timedelta(days=round(30.44 * month)), "SPOTIFY P0123", -11.99) for i, month in enumerate(months)]
+    txns.append(_txn(50, base + timedelta(days=round(30.44 * 9)), "SPOTIFY P0456", -11.99))
+    txns += [_txn(60 + i, base + timedelta(days=i), "WOOLWORTHS 1234", -20.0) for i in range(6)]
+    recurring = detect_recurring(txns)
+    assert set(recurring) == {"SPOTIFY"}
+    spotify = recurring["SPOTIFY"]
+    assert (spotify.cadence, spotify.occurrences, spotify.missed_cycles) == ("monthly", 4, 0)
@@ -1,25 +1,106 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import threading
+import time
 from pathlib import Path
 
+from fastapi import UploadFile
 from fastapi.testclient import TestClient
 
 os.environ["LICENSE_BYPASS"] = "1"
 
+from bank_normalizer.service import uploads, workers
 from bank_normalizer.service.web import app
 
 from .utils_pdf import build_bank_pdf
 
 
+def _wait_for(client: TestClient, status_url: str) -> dict:
+    deadline = time.monotonic() + 30
+    while True:
+        status = client.get(status_url).json()
+        if status["state"] in ("done", "failed", "cancelled") or time.monotonic() > deadline:
+            return status
+        time.sleep(0.05)
+
+
 def test_extract_endpoint(tmp_path: Path) -> None:
     client = TestClient(app)
     pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
     with pdf.open("rb") as fh:
         response = client.post("/extract", files={"files": ("anz.pdf", fh, "application/pdf")})
-    assert response.status_code == 200
-    payload = response.json()
+    assert response.status_code == 202
+    status = _wait_for(client, response.json()["status"])
+    assert status["state"] == "done"
+    (progress,) = status["files"]
+    assert (progress["name"], progress["state"]) == ("anz.pdf", "done")
+    assert progress["transactions"] > 0
+    payload = status["results"]
     assert payload and "summary" in payload[0]
     csv_url = payload[0]["csv"]
     download = client.get(csv_url)
     assert download.status_code == 200
+
+
+def test_unknown_job_is_404() -> None:
+    assert TestClient(app).get("/jobs/missing").status_code == 404
+
+
+def test_extract_rejected_when_worker_queue_full(tmp_path: Path, monkeypatch) -> None:
+    release = threading.Event()
+    pool = workers.WorkerPool("thread", 1, queue_limit=0)
+    monkeypatch.setattr(workers, "_pool", pool)
+    try:
+        pool.submit(release.wait)
+        pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+        with pdf.open("rb") as fh:
+            response = TestClient(app).post("/extract", files={"files": ("anz.pdf", fh, "application/pdf")})
+        assert response.status_code == 503
+        assert TestClient(app).get("/workers").json()["rejected"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_uploads_are_spooled_hashed_and_limited(tmp_path: Path, monkeypatch) -> None:
+    taken: set = set()
+    assert uploads.safe_filename("../../etc/passwd", 0, taken) == "passwd"
+    assert uploads.safe_filename("..\\PASSWD", 1, taken) == "PASSWD_2"
+    assert uploads.safe_filename("", 2, taken) == "upload_2.pdf"
+
+    data = b"%PDF" + b"x" * 5000
+    files = [UploadFile("a b.pdf", data), UploadFile("copy.pdf", data)]
+    saved = asyncio.run(uploads.spool_uploads(files, tmp_path, max_file_bytes=10_000))
+    assert [(item.filename, item.size) for item in saved] == [("a_b.pdf", len(data))]
+    assert saved[0].sha256 == hashlib.sha256(data).hexdigest()
+    assert not (tmp_path / "copy.pdf").exists()
+
+    monkeypatch.setattr(uploads, "MAX_FILE_BYTES", 16)
+    pdf = build_bank_pdf("ANZ", tmp_path / "anz.pdf")
+    with pdf.open("rb") as fh:
+        response = TestClient(app).post("/extract", files={"files": ("anz.pdf", fh, "application/pdf")})
+    assert response.status_code == 413
+
+
+def test_overlapping_uploads_in_one_job_are_deduplicated(tmp_path: Path) -> None:
+    header = "Account Number: 123456789\nANZ STATEMENT\nDate  Description  Debit  Credit  Balance\n"
+    january = tmp_path / "jan.pdf"
+    january.write_text(header + "30/01/2023  COFFEE  4.50  0.00  975.50\n31/01/2023  RENT  500.00  0.00  475.50\n")
+    february = tmp_path / "feb.pdf"
+    february.write_text(header + "31/01/2023  RENT  500.00  0.00  475.50\n01/02/2023  SALARY  0.00  2500.00  2975.50\n")
+    client = TestClient(app)
+    with january.open("rb") as first, february.open("rb") as second:
+        response = client.post(
+            "/extract",
+            files={"a": ("jan.pdf", first, "application/pdf"), "b": ("feb.pdf", second, "application/pdf")},
+        )
+    assert response.status_code == 202
+    status = _wait_for(client, response.json()["status"])
+    assert status["state"] == "done"
+    counts = sorted(item["transactions"] for item in status["files"])
+    assert counts == [1, 2]
+    warnings = [warning for result in status["results"] for warning in result["meta"]["warnings"]]
+    assert len(warnings) == 1 and "overlap with" in warnings[0]
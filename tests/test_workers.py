@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+
+import pytest
+from bank_normalizer.service.workers import QueueFull, TaskTimeout, WorkerPool
+
+
+def test_bounded_queue_rejects_and_reports_metrics() -> None:
+    release = threading.Event()
+    pool = WorkerPool("thread", 1, queue_limit=1)
+    try:
+        first = pool.submit(release.wait)
+        second = pool.submit(release.wait)
+        with pytest.raises(QueueFull):
+            pool.submit(release.wait)
+        deadline = time.monotonic() + 5
+        while not first.running() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        metrics = pool.metrics()
+        assert (metrics["running"], metrics["queued"], metrics["rejected"]) == (1, 1, 1)
+        assert metrics["utilisation"] == 1.0
+        assert second.cancel()
+        release.set()
+        assert first.result(5) is True
+        assert pool.metrics()["completed"] == 1
+        assert pool.metrics()["cancelled"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_timeout_settles_task_and_recycling_keeps_results() -> None:
+    release = threading.Event()
+    pool = WorkerPool("thread", 1, queue_limit=4, max_tasks_per_worker=2)
+    try:
+        slow = pool.submit_many([(release.wait, ())], timeout=0.05)[0]
+        settled = threading.Event()
+        slow.add_done_callback(lambda _task: settled.set())
+        assert settled.wait(5)
+        with pytest.raises(TaskTimeout):
+            slow.result()
+        release.set()
+        assert list(pool.map(abs, range(-5, 0))) == [5, 4, 3, 2, 1]
+        assert pool.metrics()["timed_out"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_process_backend_runs_picklable_tasks() -> None:
+    pool = WorkerPool("process", 2, max_tasks_per_worker=1)
+    try:
+        assert list(pool.map(math.factorial, range(6))) == [1, 1, 2, 6, 24, 120]
+    finally:
+        pool.shutdown()